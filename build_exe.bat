@@ -16,7 +16,7 @@ REM exe'nin ikonunu "klima.ico" olarak belirtiyoruz
 ".\.venv\Scripts\python.exe" -m PyInstaller --onefile --windowed --name "Klima_TuketimRaporu" ^
     --icon "klima.ico" ^
     --distpath . --workpath build --specpath . ^
-    --add-data "klima_final.py:." --add-data "daire_sirasi.txt:." klima_gui_v3.py
+    --add-data "klima_final.py:." --add-data "daire_sirasi.txt:." --add-data "site_profili.ini:." klima_gui_v3.py
 
 echo.
 echo BITTI! EXE dosyasi olusturuldu: Klima_TuketimRaporu.exe
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Klima Aylık Tüketim Raporu - Sayaç Arıza ve Anomali Taraması
+Folkart Blu Çeşme Yönetimi İçin
+
+Saatlik PPD matrisinde (`PPDHourly`) her birim (DAIRE 12B, LOBI, ...)
+için faturaya sessizce giren sayaç sorunlarını işaretler:
+
+* Eksik değer: boş veya sayı olmayan, okuma sırasında 0 kabul edilen
+  hücre (saatlerin en az `missing_ratio` kadarı eksikse)
+* Negatif değer: sayaç geri sarmış ya da hatalı okuma
+* Sıfır serisi: en az `zero_hours` saat kesintisiz 0 (sayaç/iletişim kopuk)
+* Sabit seri: en az `flat_hours` saat aynı sıfırdan farklı değer (takılı sayaç)
+* Sıçrama: önceki `window` saatin ortalamasından `z_threshold` standart
+  sapma yukarıdaki ve birimin dönem içi %99'luk değerini aşan okuma
+  (kayan z-skoru; ikinci koşul uzun bir sıfır serisinden sonra normal
+  tüketime dönüşün sıçrama sayılmasını önler)
+
+Tüm hesaplar NumPy ile sütun blokları üzerinde yapılır; Python döngüsü
+yalnızca bloklar arasındadır. 1 yıllık saatlik veri (tüm birimler)
+saniyenin çok altında taranır.
+
+Kullanım:
+    python klima_anomaly.py PPD_01012026_31012026.csv
+    python klima_anomaly.py arsiv/PPD_2025.ppdc --zero-hours 168
+"""
+
+import argparse
+import os
+import sys
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Varsayılan eşikler
+DEFAULT_FLAT_HOURS = 24
+DEFAULT_ZERO_HOURS = 72
+DEFAULT_WINDOW = 168  # 1 hafta
+DEFAULT_Z_THRESHOLD = 6.0
+DEFAULT_MISSING_RATIO = 0.01
+# Sıçrama sayılması için okumanın aşması gereken birim yüzdeliği
+_SPIKE_QUANTILE = 0.99
+
+# Aynı anda taranan birim sayısı; kayan pencere ara matrislerinin belleğini sınırlar
+_BLOCK_UNITS = 64
+
+# Sonuç tablosunun sütunları (Excel sayfası da bu sırayla yazılır)
+COLUMNS = [
+    'BİRİM', 'DAİRE_ADI', 'TİP', 'EKSİK_DEĞER', 'NEGATİF_DEĞER',
+    'EN_UZUN_SIFIR_SAAT', 'SIFIR_SERİSİ', 'EN_UZUN_SABİT_SAAT', 'SABİT_SERİ',
+    'SIÇRAMA', 'MAKS_Z', 'BULGULAR',
+]
+
+
+def _run_lengths(mask: np.ndarray) -> np.ndarray:
+    """Her hücre için o hücrede biten kesintisiz True serisinin uzunluğu."""
+    counts = np.cumsum(mask, axis=0, dtype=np.int32)
+    resets = np.where(mask, 0, counts)
+    np.maximum.accumulate(resets, axis=0, out=resets)
+    return counts - resets
+
+
+def _runs(mask: np.ndarray, min_length: int) -> Dict[str, np.ndarray]:
+    """Sütun başına en uzun seri, bittiği satır ve `min_length` üstü seri sayısı."""
+    lengths = _run_lengths(mask)
+    # seri sonları: bu satır True, sonraki False (veya son satır)
+    ends = mask.copy()
+    ends[:-1] &= ~mask[1:]
+    longest_end = lengths.argmax(axis=0)
+    longest = lengths[longest_end, np.arange(mask.shape[1])]
+    return {
+        'longest': longest,
+        'end': longest_end,
+        'count': ((lengths >= max(min_length, 1)) & ends).sum(axis=0),
+    }
+
+
+def _rolling_z(values: np.ndarray, window: int) -> np.ndarray:
+    """Her okumanın önceki `window` saate göre z-skoru (ilk pencere ve sabit pencereler NaN)."""
+    hours, width = values.shape
+    z = np.full((hours, width), np.nan)
+    if hours <= window:
+        return z
+    data = values.astype(np.float64)
+    c1 = np.zeros((hours + 1, width))
+    c2 = np.zeros((hours + 1, width))
+    np.cumsum(data, axis=0, out=c1[1:])
+    np.cumsum(data * data, axis=0, out=c2[1:])
+    # t >= window için [t - window, t) penceresi
+    s1 = c1[window:hours] - c1[:hours - window]
+    s2 = c2[window:hours] - c2[:hours - window]
+    mean = s1 / window
+    var = np.maximum(s2 / window - mean * mean, 0.0)
+    std = np.sqrt(var)
+    # kümülatif toplam yuvarlama hatası sabit pencereyi küçük bir std'ye çevirebilir
+    varies = std > 1e-6 * np.maximum(np.abs(mean), 1.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z[window:] = np.where(varies, (data[window:] - mean) / std, np.nan)
+    return z
+
+
+def _stamp(timestamps: Optional[pd.DatetimeIndex], row: int) -> str:
+    if timestamps is not None and row < len(timestamps) and not pd.isna(timestamps[row]):
+        return timestamps[row].strftime('%d.%m.%Y %H:%M')
+    return f"{row + 1}. saat"
+
+
+def detect_anomalies(hourly: Any, flat_hours: int = DEFAULT_FLAT_HOURS,
+                     zero_hours: int = DEFAULT_ZERO_HOURS, window: int = DEFAULT_WINDOW,
+                     z_threshold: float = DEFAULT_Z_THRESHOLD,
+                     missing_ratio: float = DEFAULT_MISSING_RATIO) -> pd.DataFrame:
+    """`PPDHourly` matrisini tarar; birim başına bir satırlık tablo döndürür.
+
+    Satırlar dairelere göre (`_group_units` sırası) dizilir. `BULGULAR`
+    boş olmayan satırlar işaretlenmiş birimlerdir (`flagged`). Sayı
+    sütunları eşiklerden bağımsız olarak her birim için doldurulur;
+    `MAKS_Z` sıçrama sayılan okumaların en yüksek z-skorudur.
+    """
+    values = hourly.values
+    hours, width = values.shape
+    stats: Dict[str, np.ndarray] = {
+        'negative': np.zeros(width, dtype=np.int64),
+        'zero_longest': np.zeros(width, dtype=np.int64),
+        'zero_end': np.zeros(width, dtype=np.int64),
+        'zero_count': np.zeros(width, dtype=np.int64),
+        'flat_longest': np.zeros(width, dtype=np.int64),
+        'flat_end': np.zeros(width, dtype=np.int64),
+        'flat_count': np.zeros(width, dtype=np.int64),
+        'spikes': np.zeros(width, dtype=np.int64),
+        'max_z': np.full(width, np.nan),
+        'max_z_row': np.zeros(width, dtype=np.int64),
+    }
+    if hours:
+        for start in range(0, width, _BLOCK_UNITS):
+            cols = slice(start, min(start + _BLOCK_UNITS, width))
+            block = np.asarray(values[:, cols])
+            stats['negative'][cols] = (block < 0).sum(axis=0)
+
+            zeros = _runs(block == 0, zero_hours)
+            stats['zero_longest'][cols] = zeros['longest']
+            stats['zero_end'][cols] = zeros['end']
+            stats['zero_count'][cols] = zeros['count']
+
+            # k uzunluğunda "önceki saatle aynı" serisi k + 1 saatlik sabit değerdir
+            same = np.zeros(block.shape, dtype=bool)
+            same[1:] = (block[1:] == block[:-1]) & (block[1:] != 0)
+            flat = _runs(same, flat_hours - 1)
+            flat_longest = np.where(flat['longest'] > 0, flat['longest'] + 1, 0)
+            stats['flat_longest'][cols] = flat_longest
+            stats['flat_end'][cols] = flat['end']
+            stats['flat_count'][cols] = flat['count']
+
+            z = _rolling_z(block, window)
+            with np.errstate(invalid='ignore'):
+                spike = (z >= z_threshold) & (block > np.quantile(block, _SPIKE_QUANTILE, axis=0))
+            stats['spikes'][cols] = spike.sum(axis=0)
+            scored = np.where(spike, z, -np.inf)
+            best = scored.argmax(axis=0)
+            best_z = scored[best, np.arange(block.shape[1])]
+            stats['max_z'][cols] = np.where(np.isfinite(best_z), best_z, np.nan)
+            stats['max_z_row'][cols] = best
+
+    missing = (hourly.missing if hourly.missing is not None
+               else np.zeros(width, dtype=np.int64))
+    group = hourly.indicator.argmax(axis=1) if width else np.zeros(0, dtype=np.int64)
+    rows: List[Dict[str, Any]] = []
+    for idx in np.argsort(group, kind='stable'):
+        findings = []
+        if missing[idx] and missing[idx] >= missing_ratio * hours:
+            findings.append(f"{missing[idx]} eksik değer")
+        if stats['negative'][idx]:
+            findings.append(f"{stats['negative'][idx]} negatif değer")
+        if stats['zero_count'][idx]:
+            start = stats['zero_end'][idx] - stats['zero_longest'][idx] + 1
+            findings.append(f"{stats['zero_longest'][idx]} saat sıfır "
+                            f"({_stamp(hourly.timestamps, start)} itibarıyla)")
+        if stats['flat_count'][idx]:
+            start = stats['flat_end'][idx] - stats['flat_longest'][idx] + 1
+            findings.append(f"{stats['flat_longest'][idx]} saat sabit değer "
+                            f"({_stamp(hourly.timestamps, start)} itibarıyla)")
+        if stats['spikes'][idx]:
+            findings.append(f"{stats['spikes'][idx]} sıçrama (en yüksek z="
+                            f"{stats['max_z'][idx]:.1f}, "
+                            f"{_stamp(hourly.timestamps, stats['max_z_row'][idx])})")
+        g = group[idx]
+        rows.append({
+            'BİRİM': hourly.units[idx],
+            'DAİRE_ADI': hourly.group_names[g],
+            'TİP': hourly.group_types[g],
+            'EKSİK_DEĞER': int(missing[idx]),
+            'NEGATİF_DEĞER': int(stats['negative'][idx]),
+            'EN_UZUN_SIFIR_SAAT': int(stats['zero_longest'][idx]),
+            'SIFIR_SERİSİ': int(stats['zero_count'][idx]),
+            'EN_UZUN_SABİT_SAAT': int(stats['flat_longest'][idx]),
+            'SABİT_SERİ': int(stats['flat_count'][idx]),
+            'SIÇRAMA': int(stats['spikes'][idx]),
+            'MAKS_Z': None if np.isnan(stats['max_z'][idx]) else round(float(stats['max_z'][idx]), 2),
+            'BULGULAR': "; ".join(findings),
+        })
+    return pd.DataFrame(rows, columns=COLUMNS)
+
+
+def flagged(anomalies: pd.DataFrame) -> pd.DataFrame:
+    """Yalnızca bulgu olan birimler."""
+    return anomalies[anomalies['BULGULAR'] != ''].reset_index(drop=True)
+
+
+def summary_lines(anomalies: pd.DataFrame, limit: int = 20) -> List[str]:
+    """Günlük için kısa döküm: bulgu türü sayıları ve ilk `limit` birim."""
+    found = flagged(anomalies)
+    if found.empty:
+        return [f"   • {len(anomalies)} birim tarandı, bulgu yok"]
+    lines = [
+        f"   • {len(found)}/{len(anomalies)} birimde bulgu "
+        f"({found['DAİRE_ADI'].nunique()} daire)",
+        f"   • Eksik değer: {found['BULGULAR'].str.contains('eksik değer').sum()}, "
+        f"negatif: {(found['NEGATİF_DEĞER'] > 0).sum()}, "
+        f"sıfır serisi: {(found['SIFIR_SERİSİ'] > 0).sum()}, "
+        f"sabit seri: {(found['SABİT_SERİ'] > 0).sum()}, "
+        f"sıçrama: {(found['SIÇRAMA'] > 0).sum()} birim",
+    ]
+    for birim, bulgular in zip(found['BİRİM'][:limit], found['BULGULAR'][:limit]):
+        lines.append(f"     - {birim}: {bulgular}")
+    if len(found) > limit:
+        lines.append(f"     ... ve {len(found) - limit} birim daha")
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from klima_final import PPDRawParser
+
+    arg_parser = argparse.ArgumentParser(
+        description="PPD saatlik verisinde sayaç arızası/anomali taraması yapar.")
+    arg_parser.add_argument('file', help="PPD CSV veya kolonsal (.ppdc) dosya")
+    arg_parser.add_argument('--flat-hours', type=int, default=DEFAULT_FLAT_HOURS,
+                            help=f"Sabit seri için en az saat (varsayılan: {DEFAULT_FLAT_HOURS})")
+    arg_parser.add_argument('--zero-hours', type=int, default=DEFAULT_ZERO_HOURS,
+                            help=f"Sıfır serisi için en az saat (varsayılan: {DEFAULT_ZERO_HOURS})")
+    arg_parser.add_argument('--window', type=int, default=DEFAULT_WINDOW,
+                            help=f"Z-skoru penceresi, saat (varsayılan: {DEFAULT_WINDOW})")
+    arg_parser.add_argument('--z', type=float, default=DEFAULT_Z_THRESHOLD,
+                            help=f"Sıçrama z-skoru eşiği (varsayılan: {DEFAULT_Z_THRESHOLD:g})")
+    arg_parser.add_argument('--missing-ratio', type=float, default=DEFAULT_MISSING_RATIO,
+                            help="Eksik değer bulgusu için en az eksik saat oranı "
+                                 f"(varsayılan: {DEFAULT_MISSING_RATIO:g})")
+    arg_parser.add_argument('-o', '--output', default=None,
+                            help="Bulguların yazılacağı CSV dosyası")
+    args = arg_parser.parse_args(argv)
+
+    hourly = PPDRawParser().parse_ppd_hourly(args.file)
+    anomalies = detect_anomalies(hourly, args.flat_hours, args.zero_hours,
+                                 args.window, args.z, args.missing_ratio)
+    print("\n🔎 ANOMALİ TARAMASI:")
+    for line in summary_lines(anomalies, limit=len(anomalies)):
+        print(line)
+    if args.output:
+        flagged(anomalies).to_csv(args.output, sep=';', index=False, encoding='utf-8-sig')
+        print(f"\n✓ Bulgular kaydedildi: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Klima Aylık Tüketim Raporu - Toplu İşlem (Komut Satırı)
+Folkart Blu Çeşme Yönetimi İçin
+
+Bir dizindeki (veya glob desenine uyan) tüm PPD dosyalarını işlem
+havuzunda paralel olarak raporlar. Her dosyanın raporu çıkış dizininde
+dosya adıyla açılan alt klasöre kaydedilir; farklı dizinlerde aynı adlı
+dosyalar varsa klasör adının başına üst dizinin adı eklenir.
+
+`--merge` ile dosyalar ayrı ayrı raporlanmaz: örtüşen dışa aktarımlar tek
+zaman çizelgesinde birleştirilir (örtüşen saatlerde en son dosya
+geçerli) ve istenen tarih aralığı için tek rapor çıkış dizinine yazılır.
+
+Kullanım:
+    python klima_batch.py ARSIV_DIZINI -o raporlar -j 4
+    python klima_batch.py "arsiv/PPD_*2025*.csv" --period 12_2025
+    python klima_batch.py arsiv --merge --start 2026-02-01 --end 2026-03-01 -o subat
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from klima_final import REPORT_STANDARD, PPDRawParser
+from klima_metrics import METRICS_FILE_NAME, StageMetrics
+
+# Dizin verildiğinde aranacak dosya deseni
+DEFAULT_PATTERN = "PPD_*.csv"
+
+# Her işçi sürecinde bir kez oluşturulan parser (daire sırası tekrar okunmaz)
+_WORKER_PARSER: Optional[PPDRawParser] = None
+
+
+def collect_files(inputs: List[str], pattern: str = DEFAULT_PATTERN) -> List[Path]:
+    """Dizin veya glob girdilerini sıralı, tekrarsız dosya listesine çevirir."""
+    files: Dict[Path, None] = {}
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            matches = sorted(path.glob(pattern))
+        else:
+            matches = sorted(Path(p) for p in glob.glob(item))
+        for match in matches:
+            if match.is_file():
+                files[match.resolve()] = None
+    return list(files)
+
+
+def output_names(files: List[Path]) -> Dict[Path, str]:
+    """Her dosya için benzersiz rapor klasörü adı.
+
+    Ad normalde dosya adıdır (uzantısız); aynı adı taşıyan dosyalarda üst
+    dizinin adı eklenir (`2025_PPD_...`), yine çakışırsa sıra numarası.
+    Adı tekil olan dosyalar her zaman kendi adını alır. Büyük/küçük harf
+    farkı da çakışma sayılır (Windows).
+    """
+    counts: Dict[str, int] = {}
+    for path in files:
+        counts[path.stem.lower()] = counts.get(path.stem.lower(), 0) + 1
+    names = {path: path.stem for path in files if counts[path.stem.lower()] == 1}
+    used = {name.lower(): None for name in names.values()}
+    for path in files:
+        if path in names:
+            continue
+        name = f"{path.parent.name}_{path.stem}" if path.parent.name else path.stem
+        candidate, n = name, 2
+        while candidate.lower() in used:
+            candidate = f"{name}_{n}"
+            n += 1
+        used[candidate.lower()] = None
+        names[path] = candidate
+    return {path: names[path] for path in files}
+
+
+def _init_worker(quiet: bool) -> None:
+    """İşçi sürecini hazırlar: parser'ı bir kez oluşturur."""
+    global _WORKER_PARSER
+    _WORKER_PARSER = PPDRawParser(quiet=quiet)
+
+
+def process_one(file_path: Path, output_root: Path, period: Optional[str],
+                quiet: bool = True, use_cache: bool = True,
+                parser: Optional[PPDRawParser] = None,
+                output_name: Optional[str] = None) -> Dict[str, Any]:
+    """Tek bir PPD dosyasını parse eder, özetler ve raporunu kaydeder.
+
+    Hatalar yakalanır ve sonuç sözlüğünde `error` olarak döner; böylece
+    bozuk bir dosya tüm toplu işlemi durdurmaz. `parser` verilmezse işçi
+    sürecinin parser'ı (veya `quiet` ile yenisi) kullanılır; parser'ın
+    çıktısı kendi `quiet` bayrağına göre yazılır. Rapor
+    `output_root/<output_name>` klasörüne yazılır (varsayılan: dosya adı).
+    """
+    parser = parser or _WORKER_PARSER or PPDRawParser(quiet=quiet)
+    result: Dict[str, Any] = {
+        'file': str(file_path),
+        'bytes': file_path.stat().st_size,
+        'error': None,
+    }
+    start = time.perf_counter()
+    parser.metrics = metrics = StageMetrics(file=str(file_path))
+    try:
+        month_year = period or parser.detect_month_year(file_path)
+        report = parser.parse_ppd_file(file_path, use_cache=use_cache)
+        parsed = time.perf_counter()
+        output_dir = output_root / (output_name or file_path.stem)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        summary = parser.create_summary(report)
+        csv_file, xlsx_file = parser.export_results(report, summary, month_year,
+                                                    output_dir=output_dir)
+        metrics.close()
+        metrics.save(output_dir / METRICS_FILE_NAME)
+        result.update({
+            'month_year': month_year,
+            'records': len(report),
+            'parse_s': parsed - start,
+            'export_s': time.perf_counter() - parsed,
+            'outputs': [csv_file, xlsx_file],
+        })
+    except Exception as e:
+        result['error'] = str(e)
+    finally:
+        parser.metrics = None
+        metrics.close()
+    result['total_s'] = time.perf_counter() - start
+    return result
+
+
+def merge_files(files: List[Path], output_dir: Path, period: Optional[str],
+                start: Optional[str] = None, end: Optional[str] = None,
+                quiet: bool = True) -> Dict[str, Any]:
+    """Dosyaları tek zaman çizelgesinde birleştirip [start, end) için tek rapor yazar."""
+    parser = PPDRawParser(quiet=quiet)
+    parser.metrics = metrics = StageMetrics(file=", ".join(f.name for f in files))
+    begin = time.perf_counter()
+    try:
+        run = parser.run_reports(files, [REPORT_STANDARD], output_dir=output_dir,
+                                 month_year=period, start=start, end=end, force_hourly=True)
+        metrics.close()
+        metrics.save(output_dir / METRICS_FILE_NAME)
+    finally:
+        parser.metrics = None
+        metrics.close()
+    hourly = run['hourly']
+    # tek dosyada zamanı çözülemeyen satırlar matriste kalır (NaT); aralık onlarsız
+    stamps = hourly.timestamps
+    return {
+        'month_year': run['month_year'],
+        'records': len(run['result']),
+        'hours': hourly.hours,
+        'first': stamps.min() if stamps is not None else None,
+        'last': stamps.max() if stamps is not None else None,
+        'outputs': run['outputs'][REPORT_STANDARD],
+        'total_s': time.perf_counter() - begin,
+    }
+
+
+def print_summary(results: List[Dict[str, Any]], wall_s: float, workers: int) -> None:
+    """Tüm dosyalar için tek bir süre/verim özeti basar."""
+    ok = [r for r in results if not r['error']]
+    failed = [r for r in results if r['error']]
+    total_mb = sum(r['bytes'] for r in ok) / (1024 * 1024)
+    busy_s = sum(r['total_s'] for r in results)
+
+    print("\n📈 TOPLU İŞLEM ÖZETİ")
+    print(f"   • Dosya: {len(results)} (başarılı {len(ok)}, hatalı {len(failed)})")
+    print(f"   • İşçi sayısı: {workers}")
+    print(f"   • Toplam süre: {wall_s:.2f} sn (işçi süresi toplamı {busy_s:.2f} sn)")
+    if ok:
+        print(f"   • Parse toplamı: {sum(r['parse_s'] for r in ok):.2f} sn, "
+              f"export toplamı: {sum(r['export_s'] for r in ok):.2f} sn")
+    if wall_s > 0:
+        print(f"   • Verim: {len(ok) / wall_s:.2f} dosya/sn, {total_mb / wall_s:.2f} MB/sn "
+              f"({total_mb:.1f} MB)")
+    for r in failed:
+        print(f"   ⚠ {Path(r['file']).name}: {r['error']}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    arg_parser = argparse.ArgumentParser(
+        description="Bir dizindeki PPD dosyalarını paralel olarak raporlar.")
+    arg_parser.add_argument('inputs', nargs='+',
+                            help="PPD dosyalarının bulunduğu dizin(ler) veya glob deseni")
+    arg_parser.add_argument('-o', '--output', default='.',
+                            help="Raporların kaydedileceği kök dizin (varsayılan: çalışma dizini)")
+    arg_parser.add_argument('-j', '--workers', type=int, default=os.cpu_count() or 1,
+                            help="Paralel işçi süreci sayısı (varsayılan: CPU sayısı)")
+    arg_parser.add_argument('--pattern', default=DEFAULT_PATTERN,
+                            help=f"Dizin girdilerinde aranacak desen (varsayılan: {DEFAULT_PATTERN})")
+    arg_parser.add_argument('--period', default=None,
+                            help="Tüm dosyalar için sabit dönem etiketi (örn. 1_2026); "
+                                 "verilmezse her dosyanın adından çıkarılır")
+    arg_parser.add_argument('--no-cache', action='store_true',
+                            help="PPD dosyalarının yanındaki parse önbelleğini kullanma")
+    arg_parser.add_argument('--merge', action='store_true',
+                            help="Dosyaları tek zaman çizelgesinde birleştirip tek rapor üret "
+                                 "(örtüşen saatlerde en son dosya geçerli)")
+    arg_parser.add_argument('--start', default=None,
+                            help="--merge ile rapor başlangıcı (dahil), örn. 2026-02-01")
+    arg_parser.add_argument('--end', default=None,
+                            help="--merge ile rapor bitişi (hariç), örn. 2026-03-01")
+    arg_parser.add_argument('-v', '--verbose', action='store_true',
+                            help="Parser çıktısını da göster")
+    args = arg_parser.parse_args(argv)
+    if (args.start or args.end) and not args.merge:
+        arg_parser.error("--start/--end yalnızca --merge ile kullanılabilir")
+
+    files = collect_files(args.inputs, args.pattern)
+    if not files:
+        print("⚠ İşlenecek PPD dosyası bulunamadı")
+        return 1
+
+    output_root = Path(args.output)
+    output_root.mkdir(parents=True, exist_ok=True)
+    if args.merge:
+        print(f"{len(files)} PPD dosyası birleştiriliyor...")
+        try:
+            r = merge_files(files, output_root, args.period, args.start, args.end,
+                            quiet=not args.verbose)
+        except Exception as e:
+            print(f"[ERROR] Birleştirme başarısız: {e}")
+            return 2
+        span = (f"{r['first']:%d.%m.%Y %H:%M} – {r['last']:%d.%m.%Y %H:%M}"
+                if r['first'] is not None else "zaman damgası yok")
+        print(f"[OK] {span} → {r['month_year']} "
+              f"({r['hours']} saat, {r['records']} kayıt, {r['total_s']:.2f} sn)")
+        for path in r['outputs']:
+            print(f"   • {path}")
+        return 0
+
+    workers = max(1, min(args.workers, len(files)))
+    quiet = not args.verbose
+    print(f"{len(files)} PPD dosyası {workers} işçi ile işleniyor...")
+
+    results: List[Dict[str, Any]] = []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(quiet,)) as pool:
+        names = output_names(files)
+        futures = [pool.submit(process_one, f, output_root, args.period, quiet,
+                               not args.no_cache, None, names[f]) for f in files]
+        for future in as_completed(futures):
+            r = future.result()
+            results.append(r)
+            name = Path(r['file']).name
+            if r['error']:
+                print(f"[ERROR] {name}: {r['error']}")
+            else:
+                print(f"[OK] {name} → {r['month_year']} ({r['records']} kayıt, {r['total_s']:.2f} sn)")
+
+    print_summary(results, time.perf_counter() - start, workers)
+    return 0 if all(not r['error'] for r in results) else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
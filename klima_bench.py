@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Klima Aylık Tüketim Raporu - Performans Ölçümü (Benchmark)
+Folkart Blu Çeşme Yönetimi İçin
+
+Sentetik PPD dosyaları üzerinde `PPDRawParser` aşamalarının süresini ve
+en yüksek bellek kullanımını ölçer; sonuçları JSON dosyasına yazar.
+Önceki bir sonuç dosyası verilirse aşama aşama karşılaştırma basar,
+böylece sürümler arasındaki yavaşlamalar görülebilir.
+
+`--startup` ile bunun yerine açılış süreleri ölçülür: modüllerin yeni bir
+yorumlayıcıda içe aktarılması, arayüz penceresinin görünmesi ve veri
+işleme modüllerinin hazır olması (kaynak koddan ve `--exe` verilirse
+PyInstaller ile derlenmiş programdan).
+
+Kullanım:
+    python klima_bench.py -o bench_yeni.json
+    python klima_bench.py --sizes 1ay,1yil --repeat 5 --compare bench_eski.json
+    python klima_bench.py --startup --exe Klima_TuketimRaporu.exe -o acilis.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from klima_final import PPDRawParser
+from klima_metrics import STARTUP_PROBE_ENV
+from klima_synth import generate_ppd, generate_sayac_workbook
+
+_HERE = Path(__file__).resolve().parent
+
+# Ölçülen boyutlar: ad -> saat sayısı (1 ay ... 5 yıl)
+SIZES: Dict[str, int] = {
+    '1ay': 730,
+    '3ay': 2190,
+    '1yil': 8760,
+    '5yil': 43800,
+}
+
+# Sonuçların %kaçlık yavaşlamada "gerileme" sayılacağı
+REGRESSION_THRESHOLD = 0.10
+
+# Açılış ölçümünde içe aktarma süresi ölçülen modüller ve program başına zaman aşımı (sn)
+STARTUP_MODULES = ('klima_gui_v3', 'klima_final')
+_STARTUP_TIMEOUT = 120
+
+
+@contextlib.contextmanager
+def _in_directory(path: Path) -> Iterator[None]:
+    """`export_sayac_format` çalışma dizinine yazdığı için geçici dizine geçer."""
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def _measure(func: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    """`func`'ı `repeat` kez zamanlar, ardından bir kez bellek izleyerek çalıştırır.
+
+    tracemalloc ölçümü yavaşlattığı için süreler izleme kapalıyken alınır.
+    """
+    times: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        'seconds_min': min(times),
+        'seconds_median': statistics.median(times),
+        'peak_mb': peak / (1024 * 1024),
+    }
+
+
+def run_size(workdir: Path, label: str, hours: int, units: int, sparsity: float,
+             repeat: int) -> List[Dict[str, Any]]:
+    """Tek bir dosya boyutu için tüm aşamaları ölçer."""
+    ppd_file = generate_ppd(workdir / f"PPD_{label}.csv", hours=hours, units=units,
+                            sparsity=sparsity)
+    sayac_file = generate_sayac_workbook(workdir / "sayac.xlsx")
+    output_dir = workdir / label
+    output_dir.mkdir(exist_ok=True)
+
+    parser = PPDRawParser()
+    report = parser.parse_ppd_file(ppd_file)
+    summary = parser.create_summary(report)
+    sayac_data = parser.load_subat_sayac_data(sayac_file)
+
+    stages: Dict[str, Callable[[], Any]] = {
+        'parse_ppd_file': lambda: parser.parse_ppd_file(ppd_file),
+        'create_summary': lambda: parser.create_summary(report),
+        'export_results': lambda: parser.export_results(report, summary, "1_2026",
+                                                        output_dir=output_dir),
+        'load_subat_sayac_data': lambda: parser.load_subat_sayac_data(sayac_file),
+        'export_sayac_format': lambda: parser.export_sayac_format(report, sayac_data, "1 / 2026"),
+    }
+
+    results = []
+    base = {
+        'size': label,
+        'hours': hours,
+        'units': units,
+        'sparsity': sparsity,
+        'file_mb': ppd_file.stat().st_size / (1024 * 1024),
+    }
+    with _in_directory(output_dir):
+        for stage, func in stages.items():
+            results.append({**base, 'stage': stage, **_measure(func, repeat)})
+    return results
+
+
+def _import_seconds(module: str) -> float:
+    """`module`'ün yeni bir yorumlayıcıda içe aktarılma süresi."""
+    code = (f"import time; start = time.perf_counter(); import {module}; "
+            f"print(time.perf_counter() - start)")
+    done = subprocess.run([sys.executable, '-c', code], cwd=_HERE, capture_output=True,
+                          text=True, check=True, timeout=_STARTUP_TIMEOUT)
+    return float(done.stdout.split()[-1])
+
+
+def _gui_seconds(command: Sequence[str]) -> Optional[Tuple[float, float]]:
+    """Arayüzü başlatır; (pencere görünene, modüller hazır olana) kadar geçen süre.
+
+    Arayüz `STARTUP_PROBE_ENV` dosyasına zamanları yazıp kendini kapatır.
+    Açılamazsa (ekran yok vb.) `None` döner.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        probe = Path(tmp) / "acilis.json"
+        env = dict(os.environ, **{STARTUP_PROBE_ENV: str(probe)})
+        start = time.time()
+        done = subprocess.run(list(command), cwd=_HERE, env=env, capture_output=True,
+                              text=True, timeout=_STARTUP_TIMEOUT)
+        if not probe.exists():
+            detail = (done.stderr or done.stdout).strip().splitlines()
+            print(f"   ⚠ Arayüz açılamadı: {detail[-1] if detail else done.returncode}")
+            return None
+        with open(probe, 'r', encoding='utf-8') as f:
+            marks = json.load(f)
+    return marks['window'] - start, marks['backend'] - start
+
+
+def _startup_result(stage: str, times: List[float]) -> Dict[str, Any]:
+    return {'size': 'acilis', 'stage': stage, 'seconds_min': min(times),
+            'seconds_median': statistics.median(times)}
+
+
+def run_startup(repeat: int, exe: Optional[Path] = None) -> List[Dict[str, Any]]:
+    """Açılış sürelerini ölçer (her ölçüm yeni bir süreçte)."""
+    results = []
+    for module in STARTUP_MODULES:
+        times = [_import_seconds(module) for _ in range(repeat)]
+        results.append(_startup_result(f"import {module}", times))
+
+    programs = [('kaynak', [sys.executable, str(_HERE / "klima_gui_v3.py")])]
+    if exe is not None:
+        programs.append(('exe', [str(exe)]))
+    for name, command in programs:
+        runs = []
+        for _ in range(repeat):
+            marks = _gui_seconds(command)
+            if marks is None:
+                break
+            runs.append(marks)
+        if runs:
+            results.append(_startup_result(f"{name} pencere", [w for w, _ in runs]))
+            results.append(_startup_result(f"{name} hazır", [b for _, b in runs]))
+    return results
+
+
+def _environment() -> Dict[str, Any]:
+    """Karşılaştırma için sürüm bilgileri."""
+    import numpy
+    import openpyxl
+    import pandas
+
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'pandas': pandas.__version__,
+        'numpy': numpy.__version__,
+        'openpyxl': openpyxl.__version__,
+    }
+
+
+def compare(current: List[Dict[str, Any]], previous_file: Path,
+            threshold: float = REGRESSION_THRESHOLD) -> int:
+    """Önceki sonuçlarla karşılaştırır; gerileme sayısını döndürür."""
+    with open(previous_file, 'r', encoding='utf-8') as f:
+        previous = {(r['size'], r['stage']): r for r in json.load(f)['results']}
+
+    regressions = 0
+    print(f"\n📊 KARŞILAŞTIRMA ({previous_file})")
+    for r in current:
+        old = previous.get((r['size'], r['stage']))
+        if not old or old['seconds_min'] <= 0:
+            continue
+        ratio = r['seconds_min'] / old['seconds_min']
+        mark = ""
+        if ratio > 1 + threshold:
+            mark = "  ⚠ YAVAŞLAMA"
+            regressions += 1
+        # açılış ölçümlerinde bellek yok
+        memory = (f", {old['peak_mb']:7.1f} → {r['peak_mb']:7.1f} MB"
+                  if 'peak_mb' in r and 'peak_mb' in old else "")
+        print(f"   • {r['size']:>5} {r['stage']:<22} {old['seconds_min']:8.3f} → "
+              f"{r['seconds_min']:8.3f} sn (x{ratio:.2f}){memory}{mark}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    arg_parser = argparse.ArgumentParser(description="PPDRawParser performans ölçümü.")
+    arg_parser.add_argument('--sizes', default=','.join(SIZES),
+                            help=f"Ölçülecek boyutlar (virgülle): {', '.join(SIZES)}")
+    arg_parser.add_argument('--units', type=int, default=192, help="Daire birimi sütun sayısı")
+    arg_parser.add_argument('--sparsity', type=float, default=0.02, help="Boş hücre oranı (0-1)")
+    arg_parser.add_argument('--repeat', type=int, default=3, help="Her aşamanın tekrar sayısı")
+    arg_parser.add_argument('-o', '--output', default='bench_sonuc.json',
+                            help="Sonuçların yazılacağı JSON dosyası")
+    arg_parser.add_argument('--compare', default=None,
+                            help="Karşılaştırılacak önceki sonuç dosyası")
+    arg_parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                            help="Yavaşlama sayılacak oran (varsayılan: 0.10 = %%10)")
+    arg_parser.add_argument('--workdir', default=None,
+                            help="Sentetik dosyaların yazılacağı dizin (varsayılan: geçici dizin)")
+    arg_parser.add_argument('--startup', action='store_true',
+                            help="Aşamalar yerine açılış sürelerini ölç")
+    arg_parser.add_argument('--exe', default=None,
+                            help="Açılış ölçümüne eklenecek derlenmiş program (Klima_TuketimRaporu.exe)")
+    args = arg_parser.parse_args(argv)
+
+    labels = [s.strip() for s in args.sizes.split(',') if s.strip()]
+    unknown = [s for s in labels if s not in SIZES]
+    if unknown:
+        arg_parser.error(f"Bilinmeyen boyut: {', '.join(unknown)}")
+
+    results: List[Dict[str, Any]] = []
+    if args.startup:
+        print(f"[*] Açılış süreleri ölçülüyor ({max(1, args.repeat)} tekrar)...")
+        results = run_startup(max(1, args.repeat), Path(args.exe) if args.exe else None)
+        for r in results:
+            print(f"   • {r['stage']:<22} {r['seconds_min']:8.3f} sn")
+        labels = []
+    with contextlib.ExitStack() as stack:
+        if args.workdir:
+            workdir = Path(args.workdir)
+            workdir.mkdir(parents=True, exist_ok=True)
+        else:
+            workdir = Path(stack.enter_context(tempfile.TemporaryDirectory()))
+        for label in labels:
+            print(f"[*] {label} ({SIZES[label]} saat × {args.units} birim) ölçülüyor...")
+            with contextlib.redirect_stdout(io.StringIO()):
+                size_results = run_size(workdir, label, SIZES[label], args.units,
+                                        args.sparsity, max(1, args.repeat))
+            for r in size_results:
+                print(f"   • {r['stage']:<22} {r['seconds_min']:8.3f} sn  {r['peak_mb']:7.1f} MB")
+            results.extend(size_results)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({'environment': _environment(), 'results': results}, f,
+                  ensure_ascii=False, indent=2)
+    print(f"\n✓ Sonuçlar kaydedildi: {args.output}")
+
+    if args.compare:
+        return 1 if compare(results, Path(args.compare), args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
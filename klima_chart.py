@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Klima Aylık Tüketim Raporu - Saatlik Profil Grafiği
+Folkart Blu Çeşme Yönetimi İçin
+
+Arayüzdeki "Saatlik Profil" sekmesinin grafiği: tüm daireler, tip
+(SÜİT/ORTAK) ya da tek bir daire için saatlik Wh eğrisi. 1 yıllık veri
+8760 noktadır; hepsi Canvas'a çizilmez:
+
+* Seri, grafik genişliğindeki her piksel sütunu için bir kovaya bölünür;
+  her kovanın en küçük ve en büyük noktası tutulur (min/max seyreltme).
+  Sivri tepeler (yüksek faturayı açıklayan saatler) kaybolmaz.
+* Yakınlaştırma düzeyleri ikinin kuvvetleridir (pencere = tüm süre / 2^k).
+  Her düzeyin seyreltilmiş indeksleri tüm seri için bir kez hesaplanıp
+  saklanır; kaydırma yalnızca bu dizinin ilgili dilimini çizer.
+"""
+
+import math
+import tkinter as tk
+from tkinter import ttk
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Tek profil seçimleri (daire adlarından önce listelenir)
+ALL_DAIRES = "Tüm daireler"
+
+# En yakın görünümde pencere uzunluğu (saat)
+_MIN_WINDOW_HOURS = 48
+
+# Çizim alanı kenar boşlukları (px): sol, üst, sağ, alt
+_MARGINS = (60, 15, 15, 30)
+_X_TICKS = 6
+_AXIS_FONT = ("Segoe UI", 8)
+_WHEEL_ZOOM_STEP = 1
+
+
+def minmax_indices(values: np.ndarray, bucket: int) -> np.ndarray:
+    """`bucket` uzunluğundaki ardışık kovaların en küçük ve en büyük
+    noktalarının indeksleri (zaman sırasında, kova başına en fazla 2).
+
+    Son kova eksikse NaN ile doldurulur; tüm işlem tek bir yeniden
+    şekillendirme üzerinde yapılır.
+    """
+    n = len(values)
+    if bucket <= 1 or n <= 2:
+        return np.arange(n, dtype=np.int64)
+    buckets = math.ceil(n / bucket)
+    padded = np.full(buckets * bucket, np.nan)
+    padded[:n] = values
+    grid = padded.reshape(buckets, bucket)
+    low = np.nanargmin(grid, axis=1)
+    high = np.nanargmax(grid, axis=1)
+    pairs = np.sort(np.stack([low, high], axis=1), axis=1)
+    indices = (pairs + (np.arange(buckets) * bucket)[:, None]).reshape(-1)
+    # düz kovalarda min ve max aynı noktadır
+    keep = np.ones(len(indices), dtype=bool)
+    keep[1::2] = pairs[:, 0] != pairs[:, 1]
+    return indices[keep].astype(np.int64)
+
+
+class ProfileSeries:
+    """Tek bir saatlik profil ve yakınlaştırma düzeyi başına seyreltme önbelleği."""
+
+    def __init__(self, label: str, values: np.ndarray, timestamps: Any = None) -> None:
+        self.label = label
+        self.values = np.asarray(values, dtype=np.float64)
+        self.timestamps = timestamps
+        self._cache: Dict[int, np.ndarray] = {}  # düzey -> indeksler
+        self._cache_width = 0
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @property
+    def max_level(self) -> int:
+        """Pencerenin `_MIN_WINDOW_HOURS`'a indiği en yakın düzey."""
+        if len(self) <= _MIN_WINDOW_HOURS:
+            return 0
+        return math.ceil(math.log2(len(self) / _MIN_WINDOW_HOURS))
+
+    def window(self, level: int) -> int:
+        """`level` düzeyinde görünen saat sayısı."""
+        return max(min(len(self), _MIN_WINDOW_HOURS), math.ceil(len(self) / 2 ** level))
+
+    def points(self, level: int, start: int, width: int) -> np.ndarray:
+        """[start, start + window) penceresinde çizilecek nokta indeksleri.
+
+        Düzeyin indeksleri `width` piksel için bir kez hesaplanır; pencere
+        kenarlarındaki birer komşu nokta da eklenir (çizgi kenara kadar uzanır).
+        """
+        if width != self._cache_width:
+            self._cache.clear()
+            self._cache_width = width
+        indices = self._cache.get(level)
+        if indices is None:
+            bucket = max(1, math.ceil(self.window(level) / max(1, width)))
+            indices = minmax_indices(self.values, bucket)
+            self._cache[level] = indices
+        end = start + self.window(level)
+        first = max(0, int(np.searchsorted(indices, start)) - 1)
+        last = min(len(indices), int(np.searchsorted(indices, end)) + 1)
+        return indices[first:last]
+
+    def hour_label(self, hour: int, detailed: bool = True) -> str:
+        """Saatin etiketi: `detailed` ise gün ve saat, değilse yalnızca gün."""
+        if self.timestamps is None:
+            return f"#{hour + 1}"
+        stamp = self.timestamps[min(max(hour, 0), len(self) - 1)]
+        return stamp.strftime('%d.%m %H:00' if detailed else '%d.%m')
+
+
+class ProfileSource:
+    """Saatlik matristen (`PPDHourly`) profil serileri; seriler seçildikçe
+    hesaplanır ve seyreltme önbellekleriyle birlikte saklanır."""
+
+    def __init__(self, hourly: Any) -> None:
+        self.grouped = np.asarray(hourly.grouped_values())
+        self.names = list(hourly.group_names)
+        self.types = list(hourly.group_types)
+        self.timestamps = hourly.timestamps
+        self._series: Dict[str, ProfileSeries] = {}
+
+    def choices(self) -> List[str]:
+        """Seçim listesi: tüm daireler, tipler, sonra daire adları."""
+        return [ALL_DAIRES] + sorted(set(self.types)) + self.names
+
+    def series(self, choice: str) -> ProfileSeries:
+        cached = self._series.get(choice)
+        if cached is not None:
+            return cached
+        if choice == ALL_DAIRES:
+            values = self.grouped.sum(axis=1, dtype=np.float64)
+        elif choice in self.types:
+            columns = [i for i, t in enumerate(self.types) if t == choice]
+            values = self.grouped[:, columns].sum(axis=1, dtype=np.float64)
+        elif choice in self.names:
+            values = self.grouped[:, self.names.index(choice)]
+        else:
+            raise KeyError(f"Bilinmeyen profil: {choice}")
+        series = ProfileSeries(choice, values, self.timestamps)
+        self._series[choice] = series
+        return series
+
+
+class ProfileChart(ttk.Frame):
+    """Seyreltilmiş saatlik profil grafiği.
+
+    Fare tekerleği imlecin altındaki saati sabit tutarak yakınlaştırır,
+    sürükleme pencereyi kaydırır. `on_view` her çizimden sonra görünümün
+    kısa açıklamasıyla çağrılır.
+    """
+
+    def __init__(self, master: tk.Misc, on_view: Optional[Callable[[str], None]] = None,
+                 **kwargs: Any) -> None:
+        super().__init__(master, **kwargs)
+        self.series: Optional[ProfileSeries] = None
+        self.level = 0
+        self.start = 0
+        self._on_view = on_view
+        self._drag: Optional[Tuple[int, int]] = None  # (x, start)
+
+        self.canvas = tk.Canvas(self, bg="#ffffff", highlightthickness=0)
+        self.canvas.pack(fill="both", expand=True)
+        self.canvas.bind('<Configure>', lambda _: self.redraw())
+        self.canvas.bind('<MouseWheel>', self._on_wheel)
+        self.canvas.bind('<Button-4>', self._on_wheel)
+        self.canvas.bind('<Button-5>', self._on_wheel)
+        self.canvas.bind('<ButtonPress-1>', self._on_press)
+        self.canvas.bind('<B1-Motion>', self._on_drag)
+        self.canvas.bind('<ButtonRelease-1>', lambda _: setattr(self, '_drag', None))
+
+    def set_series(self, series: ProfileSeries) -> None:
+        """`series`'i tüm süre görünümünde çizer."""
+        self.series = series
+        self.reset()
+
+    def reset(self) -> None:
+        self.level = 0
+        self.start = 0
+        self.redraw()
+
+    def zoom(self, step: int, anchor: float = 0.5) -> None:
+        """`step` düzey yakınlaştırır (eksi: uzaklaştırır); pencerenin
+        `anchor` oranındaki saat yerinde kalır."""
+        if self.series is None:
+            return
+        level = min(max(self.level + step, 0), self.series.max_level)
+        if level == self.level:
+            return
+        hour = self.start + anchor * self.series.window(self.level)
+        self.level = level
+        self._move_to(int(round(hour - anchor * self.series.window(level))))
+
+    def pan(self, hours: int) -> None:
+        self._move_to(self.start + hours)
+
+    def _move_to(self, start: int) -> None:
+        if self.series is None:
+            return
+        self.start = min(max(start, 0), len(self.series) - self.series.window(self.level))
+        self.redraw()
+
+    def _plot_box(self) -> Tuple[int, int, int, int]:
+        left, top, right, bottom = _MARGINS
+        return (left, top, max(left + 1, self.canvas.winfo_width() - right),
+                max(top + 1, self.canvas.winfo_height() - bottom))
+
+    def redraw(self) -> None:
+        canvas = self.canvas
+        canvas.delete("all")
+        series = self.series
+        x0, y0, x1, y1 = self._plot_box()
+        if series is None or not len(series):
+            canvas.create_rectangle(x0, y0, x1, y1, outline="#cccccc")
+            return
+        window = series.window(self.level)
+        indices = series.points(self.level, self.start, x1 - x0)
+        values = series.values[indices]
+        top_value = float(values.max()) if len(values) else 0.0
+        top_value = top_value if top_value > 0 else 1.0
+        x_scale = (x1 - x0) / max(1, window - 1)
+        y_scale = (y1 - y0) / top_value
+
+        for fraction in (0.5, 1.0):
+            y = y1 - fraction * (y1 - y0)
+            canvas.create_line(x0, y, x1, y, fill="#eeeeee")
+        if len(indices) > 1:
+            xs = x0 + (indices - self.start) * x_scale
+            ys = y1 - np.clip(values, 0.0, None) * y_scale
+            canvas.create_line(*np.column_stack([xs, ys]).ravel().tolist(), fill="#000000")
+        # pencere dışındaki kenar noktalarının çizgisini örten şeritler
+        width, height = canvas.winfo_width(), canvas.winfo_height()
+        canvas.create_rectangle(0, 0, x0, height, fill="#ffffff", outline="")
+        canvas.create_rectangle(x1, 0, width, height, fill="#ffffff", outline="")
+        canvas.create_rectangle(x0, y0, x1, y1, outline="#cccccc")
+
+        # eksenler: dikeyde Wh, yatayda tarih/saat
+        for fraction in (0.0, 0.5, 1.0):
+            canvas.create_text(x0 - 5, y1 - fraction * (y1 - y0),
+                               text=f"{fraction * top_value:.0f}", anchor="e", font=_AXIS_FONT)
+        canvas.create_text(x0 - 5, y0, text="Wh", anchor="se", font=_AXIS_FONT)
+        detailed = window <= 7 * 24
+        for tick in range(_X_TICKS):
+            hour = self.start + round(tick * (window - 1) / (_X_TICKS - 1))
+            x = x0 + (hour - self.start) * x_scale
+            canvas.create_line(x, y1, x, y1 + 4, fill="#999999")
+            canvas.create_text(x, y1 + 6, text=series.hour_label(hour, detailed), anchor="n",
+                               font=_AXIS_FONT)
+
+        if self._on_view is not None:
+            last = self.start + window - 1
+            self._on_view(f"{series.label}: {series.hour_label(self.start, True)} – "
+                          f"{series.hour_label(last, True)} | "
+                          f"{window:,} saat, {len(indices):,} nokta".replace(",", "."))
+
+    def _on_wheel(self, event: tk.Event) -> str:
+        if event.num == 4 or (event.num != 5 and event.delta > 0):
+            step = _WHEEL_ZOOM_STEP
+        else:
+            step = -_WHEEL_ZOOM_STEP
+        x0, _, x1, _ = self._plot_box()
+        anchor = min(max((event.x - x0) / max(1, x1 - x0), 0.0), 1.0)
+        self.zoom(step, anchor)
+        return 'break'
+
+    def _on_press(self, event: tk.Event) -> None:
+        self._drag = (event.x, self.start)
+
+    def _on_drag(self, event: tk.Event) -> None:
+        if self._drag is None or self.series is None:
+            return
+        x0, _, x1, _ = self._plot_box()
+        hours_per_px = self.series.window(self.level) / max(1, x1 - x0)
+        self._move_to(self._drag[1] - int(round((event.x - self._drag[0]) * hours_per_px)))
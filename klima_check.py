@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Klima Aylık Tüketim Raporu - Tutarlılık Kontrolü
+Folkart Blu Çeşme Yönetimi İçin
+
+Aynı rapor tablosunu üretmesi gereken okuma yollarını sentetik PPD
+dosyaları üzerinde birbiriyle karşılaştırır. Dosyalar tam sayı ve kesirli
+Wh değerleriyle, bir tanesi de son satırı satır sonu olmadan biten şekilde
+`klima_synth` ile üretilir. Her dosyada:
+
+* `parse_ppd_file` (varsayılan parça boyu) ↔ tek parça ve küçük parça
+* `parse_ppd_file` önbellekli: ilk okuma, önbellekten okuma ve dosya
+  büyüdükten sonraki artımlı okuma
+* `parse_ppd_hourly` + `frame_from_hourly`
+* `merge_hourly`: örtüşen iki parçaya bölünmüş dosya ↔ dosyanın tamamı
+  (örtüşen saatlerde eski parçaya farklı değerler yazılır; son okuması
+  en geç olan parçanın değerleri kalmalıdır)
+* `run_reports`: saatlik yol (anomali + küp açık) ↔ düz yol; CSV raporu
+  bayt bayt aynı olmalıdır
+
+Ayrıca bir satırının tarihi bozuk (çözülemeyen) dosyada `run_reports`
+dönemsel küple çalışmalı; rapor düz okumayla aynı kalmalı, küp yalnızca
+zamanı çözülen saatleri içermeli ve atlanan saat sayısını bildirmelidir.
+
+Aynı parçalarla toplayan yollar birebir aynı olmalıdır. Kesirli verilerde
+parça sınırları farklı olan yollar (tek parça, küçük parça, büyüyen dosya,
+birleştirme) toplama sırası değiştiği için son basamakta ayrılabilir;
+bunlarda göreli fark `_SUM_ORDER_RTOL`'dan küçük olmalıdır. Bir fark
+bulunursa çıkış kodu 1'dir.
+
+Kullanım:
+    python klima_check.py
+    python klima_check.py --hours 8760 --units 192 --workdir kontrol
+"""
+
+import argparse
+import contextlib
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from klima_final import REPORT_STANDARD, PPDRawParser, PPDResult
+from klima_rollup import LEVELS
+from klima_synth import generate_ppd
+
+# Küçük parça boyu: asal sayı, parça sınırları gün sınırlarına denk gelmesin
+_SMALL_CHUNK = 97
+
+# PPD ön bilgisi ve başlık satırı (`generate_ppd`: 6 satır + başlık)
+_HEAD_LINES = 7
+
+# Kesirli verilerde parça sınırları farklı yollar arasında izin verilen göreli fark
+_SUM_ORDER_RTOL = 1e-12
+
+# Kontrol edilen dosyalar: ad, ondalık basamak, son satırda satır sonu var mı
+CASES: List[Tuple[str, int, bool]] = [
+    ('tam', 0, True),
+    ('kesirli', 3, True),
+    ('satir_sonu_yok', 0, False),
+]
+
+# Bozuk tarihli dosya: tarih sütunu çözülemeyen satırın değeri
+BAD_DATE_CASE = 'bozuk_tarih'
+_BAD_DATE = '99/99/2026'
+
+# (kontrol adı, fark açıklaması; fark yoksa `None`)
+Check = Tuple[str, Optional[str]]
+
+
+def difference(a: PPDResult, b: PPDResult, rtol: float = 0.0) -> Optional[str]:
+    """İki rapor tablosu arasındaki ilk farkın açıklaması; aynıysa `None`.
+
+    `rtol` 0 ise Wh toplamları tipleriyle birlikte birebir aynı olmalıdır.
+    """
+    if a.names != b.names or list(a.keys) != list(b.keys) or a.types != b.types:
+        return f"satırlar farklı ({len(a)} / {len(b)})"
+    if rtol:
+        diff = np.flatnonzero(~np.isclose(a.wh, b.wh, rtol=rtol, atol=0.0))
+    else:
+        if a.wh.dtype != b.wh.dtype:
+            return f"Wh tipi farklı ({a.wh.dtype} / {b.wh.dtype})"
+        diff = np.flatnonzero(a.wh != b.wh)
+    if not len(diff):
+        return None
+    first = diff[0]
+    return (f"{len(diff)} satır farklı, ilki {a.names[first]}: "
+            f"{a.wh[first]!r} / {b.wh[first]!r}")
+
+
+def _split(path: Path) -> Tuple[List[str], List[str], bool]:
+    """Dosyayı (başlık satırları, veri satırları, son satır sonu var mı) olarak böler."""
+    text = path.read_text(encoding='utf-8-sig')
+    lines = text.split('\n')
+    trailing = lines[-1] == ''
+    if trailing:
+        lines.pop()
+    return lines[:_HEAD_LINES], lines[_HEAD_LINES:], trailing
+
+
+def _write(path: Path, head: List[str], rows: List[str], trailing: bool = True) -> Path:
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        f.write('\n'.join(head + rows) + ('\n' if trailing else ''))
+    return path
+
+
+def make_case(workdir: Path, name: str, hours: int, units: int, sparsity: float,
+              decimals: int, trailing: bool, seed: int = 0) -> Path:
+    """Kontrol dosyasını üretir; `trailing` değilse son satır sonu silinir."""
+    path = generate_ppd(workdir / f"PPD_{name}.csv", hours=hours, units=units,
+                        sparsity=sparsity, seed=seed, decimals=decimals)
+    if not trailing:
+        head, rows, _ = _split(path)
+        _write(path, head, rows, trailing=False)
+    return path
+
+
+def make_bad_date_case(workdir: Path, hours: int, units: int, sparsity: float) -> Path:
+    """Ortadaki bir satırın tarihi çözülemeyen kontrol dosyasını üretir."""
+    path = generate_ppd(workdir / f"PPD_{BAD_DATE_CASE}.csv", hours=hours, units=units,
+                        sparsity=sparsity)
+    head, rows, trailing = _split(path)
+    middle = len(rows) // 2
+    rows[middle] = _BAD_DATE + rows[middle][rows[middle].index(';'):]
+    return _write(path, head, rows, trailing)
+
+
+def check_bad_dates(parser: PPDRawParser, path: Path, workdir: Path) -> List[Check]:
+    """Zamanı çözülemeyen satırlı dosyada rapor ve dönemsel küpü kontrol eder."""
+    plain = parser.parse_ppd_file(path, use_cache=False)
+    output_dir = workdir / f"rapor_kup_{path.stem}"
+    output_dir.mkdir(exist_ok=True)
+    name = "run_reports dönemsel küp ↔ düz yol"
+    try:
+        run = parser.run_reports(path, [REPORT_STANDARD], output_dir, use_cache=False,
+                                 rollup=True)
+    except Exception as e:
+        return [(name, f"hata: {e}")]
+    checks: List[Check] = [(name, difference(plain, run['result']))]
+
+    hourly, cube = run['hourly'], run['cube']
+    valid = ~np.asarray(hourly.timestamps.isna())
+    expected = hourly.values[valid].sum(axis=0, dtype=np.float64) @ hourly.indicator / 1000
+    detail = None
+    if cube.skipped != int((~valid).sum()):
+        detail = f"{cube.skipped} saat atlandı, beklenen {int((~valid).sum())}"
+    for level in LEVELS:
+        if detail is not None:
+            break
+        if cube.hours[level].sum() != valid.sum():
+            detail = f"{level}: {cube.hours[level].sum()} saat, beklenen {int(valid.sum())}"
+        elif not np.allclose(cube.kwh[level].sum(axis=0), expected, rtol=_SUM_ORDER_RTOL,
+                             atol=0.0):
+            detail = f"{level}: dönem toplamları geçerli saatlerin toplamından farklı"
+    checks.append(("küp: zamanı çözülemeyen saatler atlandı", detail))
+    return checks
+
+
+def check_file(parser: PPDRawParser, path: Path, workdir: Path, decimals: int,
+               sparsity: float) -> List[Check]:
+    """`path` üzerinde tüm okuma yollarını önbelleksiz `parse_ppd_file` ile karşılaştırır."""
+    plain = parser.parse_ppd_file(path, use_cache=False)
+    head, rows, trailing = _split(path)
+    checks: List[Check] = []
+    # parça sınırları farklı yollarda kesirli toplamlar son basamakta ayrılabilir
+    order_rtol = _SUM_ORDER_RTOL if decimals else 0.0
+
+    def check(name: str, produce: Callable[[], PPDResult], rtol: float = 0.0) -> None:
+        try:
+            checks.append((name, difference(plain, produce(), rtol)))
+        except Exception as e:
+            checks.append((name, f"hata: {e}"))
+
+    check("tek parça", lambda: parser.parse_ppd_file(path, chunksize=None, use_cache=False),
+          order_rtol)
+    check(f"parça {_SMALL_CHUNK}",
+          lambda: parser.parse_ppd_file(path, chunksize=_SMALL_CHUNK, use_cache=False),
+          order_rtol)
+
+    cached = workdir / f"onbellek_{path.name}"
+    shutil.copyfile(path, cached)
+    check("önbellek (ilk okuma)", lambda: parser.parse_ppd_file(cached, use_cache=True))
+    check("önbellek (önbellekten)", lambda: parser.parse_ppd_file(cached, use_cache=True))
+
+    growing = _write(workdir / f"buyuyen_{path.name}", head, rows[:len(rows) * 2 // 3])
+    parser.parse_ppd_file(growing, use_cache=True)
+    with open(growing, 'a', encoding='utf-8', newline='') as f:
+        f.write('\n'.join(rows[len(rows) * 2 // 3:]) + ('\n' if trailing else ''))
+    check("önbellek (dosya büyüdükten sonra)",
+          lambda: parser.parse_ppd_file(growing, use_cache=True), order_rtol)
+
+    check("saatlik matris", lambda: parser.frame_from_hourly(parser.parse_ppd_hourly(path)))
+
+    # eski parça örtüşen saatlerde başka değerler taşır; yeni parça kazanmalı
+    _, other_rows, _ = _split(generate_ppd(
+        workdir / f"_farkli_{path.name}", hours=len(rows), units=_unit_count(head),
+        sparsity=sparsity, seed=100, decimals=decimals))
+    third = len(rows) // 3
+    older = _write(workdir / f"eski_{path.name}", head,
+                   rows[:third] + other_rows[third:2 * third])
+    newer = _write(workdir / f"yeni_{path.name}", head, rows[third:], trailing)
+    check("birleştirme (örtüşen parçalar)",
+          lambda: parser.frame_from_hourly(parser.merge_hourly([newer, older])), order_rtol)
+
+    plain_dir = workdir / f"rapor_duz_{path.stem}"
+    hourly_dir = workdir / f"rapor_saatlik_{path.stem}"
+    plain_dir.mkdir(exist_ok=True)
+    hourly_dir.mkdir(exist_ok=True)
+    try:
+        plain_run = parser.run_reports(path, [REPORT_STANDARD], plain_dir, use_cache=False)
+        hourly_run = parser.run_reports(path, [REPORT_STANDARD], hourly_dir, use_cache=False,
+                                        anomalies=True, rollup=True)
+        detail = difference(plain_run['result'], hourly_run['result'])
+        if detail is None:
+            plain_csv, hourly_csv = (Path(run['outputs'][REPORT_STANDARD][0]).read_bytes()
+                                     for run in (plain_run, hourly_run))
+            detail = None if plain_csv == hourly_csv else "CSV raporları farklı"
+        checks.append(("run_reports saatlik yol ↔ düz yol", detail))
+    except Exception as e:
+        checks.append(("run_reports saatlik yol ↔ düz yol", f"hata: {e}"))
+    return checks
+
+
+def _unit_count(head: List[str]) -> int:
+    """Başlıktaki `DAIRE` birim sütunu sayısı (`generate_ppd`'nin `units`'i)."""
+    return sum(1 for column in head[-1].split(';') if column.startswith('DAIRE '))
+
+
+def _print_checks(checks: List[Check]) -> int:
+    """Kontrol sonuçlarını basar; başarısız kontrol sayısını döndürür."""
+    failures = 0
+    for check, detail in checks:
+        if detail is None:
+            print(f"   ✓ {check}")
+        else:
+            failures += 1
+            print(f"   ✗ {check}: {detail}")
+    return failures
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    arg_parser = argparse.ArgumentParser(
+        description="PPD okuma yollarının aynı raporu verdiğini kontrol eder.")
+    arg_parser.add_argument('--hours', type=int, default=730, help="Saat (satır) sayısı")
+    arg_parser.add_argument('--units', type=int, default=192, help="Daire birimi sütun sayısı")
+    arg_parser.add_argument('--sparsity', type=float, default=0.02, help="Boş hücre oranı (0-1)")
+    arg_parser.add_argument('--workdir', default=None,
+                            help="Sentetik dosyaların yazılacağı dizin (varsayılan: geçici dizin)")
+    args = arg_parser.parse_args(argv)
+    if args.hours < 3:
+        arg_parser.error("--hours en az 3 olmalı (dosya örtüşen parçalara bölünür)")
+
+    parser = PPDRawParser(quiet=True)
+    failures = 0
+    with contextlib.ExitStack() as stack:
+        if args.workdir:
+            workdir = Path(args.workdir)
+            workdir.mkdir(parents=True, exist_ok=True)
+        else:
+            workdir = Path(stack.enter_context(tempfile.TemporaryDirectory()))
+        for name, decimals, trailing in CASES:
+            case_dir = workdir / name
+            if case_dir.exists():
+                shutil.rmtree(case_dir)
+            case_dir.mkdir()
+            path = make_case(case_dir, name, args.hours, args.units, args.sparsity,
+                             decimals, trailing)
+            print(f"[*] {name} ({args.hours} saat × {args.units} birim)")
+            failures += _print_checks(check_file(parser, path, case_dir, decimals,
+                                                 args.sparsity))
+        case_dir = workdir / BAD_DATE_CASE
+        if case_dir.exists():
+            shutil.rmtree(case_dir)
+        case_dir.mkdir()
+        path = make_bad_date_case(case_dir, args.hours, args.units, args.sparsity)
+        print(f"[*] {BAD_DATE_CASE} ({args.hours} saat × {args.units} birim)")
+        failures += _print_checks(check_bad_dates(parser, path, case_dir))
+
+    if failures:
+        print(f"\n⚠ {failures} kontrol başarısız")
+        return 1
+    print("\n✓ Tüm okuma yolları aynı raporu verdi")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
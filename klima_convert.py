@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Klima Aylık Tüketim Raporu - Kolonsal Biçime Dönüştürme
+Folkart Blu Çeşme Yönetimi İçin
+
+Arşivdeki PPD CSV dosyalarını bir kerelik bellek eşlemeli kolonsal
+biçime (`.ppdc` + `.ppdc.npy`) çevirir. Dönüştürülen dosyalar
+`parse_ppd_file` / `parse_ppd_hourly` ile CSV ayrıştırılmadan açılır.
+Kaynağı değişmemiş dosyalar tekrar dönüştürülmez.
+
+Kullanım:
+    python klima_convert.py ARSIV_DIZINI
+    python klima_convert.py "arsiv/PPD_*2025*.csv" --force
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from klima_batch import DEFAULT_PATTERN, collect_files
+from klima_final import COLUMNAR_SUFFIX, PPDRawParser
+
+
+def is_up_to_date(source: Path) -> bool:
+    """`source`'un kolonsal kopyası var ve kaynak o günden beri değişmedi mi?"""
+    header_path = source.with_suffix(COLUMNAR_SUFFIX)
+    try:
+        with open(header_path, 'r', encoding='utf-8') as f:
+            info = json.load(f)['source']
+        stat = source.stat()
+    except (OSError, ValueError, KeyError):
+        return False
+    return (info.get('size') == stat.st_size and info.get('mtime') == stat.st_mtime
+            and header_path.with_name(header_path.name + '.npy').exists())
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    arg_parser = argparse.ArgumentParser(
+        description="PPD CSV dosyalarını bellek eşlemeli kolonsal biçime çevirir.")
+    arg_parser.add_argument('inputs', nargs='+',
+                            help="PPD dosyalarının bulunduğu dizin(ler) veya glob deseni")
+    arg_parser.add_argument('--pattern', default=DEFAULT_PATTERN,
+                            help=f"Dizin girdilerinde aranacak desen (varsayılan: {DEFAULT_PATTERN})")
+    arg_parser.add_argument('--force', action='store_true',
+                            help="Güncel kolonsal kopyası olan dosyaları da dönüştür")
+    args = arg_parser.parse_args(argv)
+
+    files = [f for f in collect_files(args.inputs, args.pattern)
+             if f.suffix.lower() != COLUMNAR_SUFFIX]
+    if not files:
+        print("⚠ Dönüştürülecek PPD dosyası bulunamadı")
+        return 1
+
+    parser = PPDRawParser()
+    failed = 0
+    for source in files:
+        if not args.force and is_up_to_date(source):
+            print(f"✓ Güncel: {source.name}")
+            continue
+        start = time.perf_counter()
+        try:
+            parser.convert_to_columnar(source)
+        except Exception as e:
+            failed += 1
+            print(f"[ERROR] {source.name}: {e}")
+            continue
+        print(f"[OK] {source.name} ({time.perf_counter() - start:.2f} sn)")
+    return 2 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,20 +6,291 @@ Folkart Blu Çeşme Yönetimi İçin
 """
 
 import re
+import io
+import os
 import csv
+import json
+import time
+import hashlib
+import contextlib
+import importlib.util
+import itertools
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 
-from openpyxl import Workbook, load_workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from openpyxl import load_workbook
 
+import numpy as np
 import pandas as pd
 
-# Regex used throughout the parser to identify daire columns
-_DAIRE_COL_REGEX = re.compile(r"^DAIRE\s+(\d+)([A-F])?$", re.IGNORECASE)
+from klima_anomaly import COLUMNS as ANOMALY_COLUMNS, detect_anomalies
+from klima_metrics import StageMetrics
+from klima_profile import PROFILE_FILE_NAME, SiteProfile, load_site_profile
+from klima_rollup import CUBE_FILE_NAME, RollupCube
+from klima_tariff import COST_COLUMN, CURRENCY, Tariff
+from klima_xlsx import ReportSheetWriter, summary_styles
+
+# Zaman damgası sütunlarının adlarında geçen anahtar kelimeler
+_TIME_KEYWORDS = ['TARIH', 'TARİH', 'DATE', 'ZAMAN', 'TIME', 'SAAT']
+
+# PPD dosya adındaki dönem bilgisi: PPD_ggaayyyy_ggaayyyy.csv
+_PERIOD_REGEX = re.compile(r'(\d{2})(\d{2})(\d{4})_(\d{2})(\d{2})(\d{4})')
+
+# Akış modunda tek seferde okunan satır sayısı (1 yıllık saatlik veri)
+DEFAULT_CHUNK_ROWS = 8760
+# İlerleme bildirilirken bir okumada en fazla okunan bayt (parça içi ilerleme)
+_PROGRESS_BLOCK = 64 * 1024
+
+# PPD dosyalarında başlık satırı (boş satırlar hariç 7. satır, `header=6`)
+_HEADER_ROW = 6
+
+# Parse önbelleği: PPD dosyasının yanına `<dosya>.ppdcache` olarak yazılır
+_CACHE_SUFFIX = '.ppdcache'
+_CACHE_VERSION = 2
+# Dosyanın sadece uzadığını doğrulamak için baş/orta/son bloklardan özeti alınan bayt
+_CACHE_SAMPLE_BYTES = 4096
+# Bu kadar gün kullanılmayan veya dizin başına bu sayıyı aşan önbellekler silinir
+CACHE_MAX_AGE_DAYS = 90
+CACHE_MAX_ENTRIES = 64
+
+# pyarrow kuruluysa tek seferlik okumalarda onun CSV motoru kullanılır
+_HAS_PYARROW = importlib.util.find_spec('pyarrow') is not None
+
+# `run_reports` ile üretilebilen raporlar
+REPORT_STANDARD = 'standart'
+REPORT_SAYAC = 'sayac'
+REPORT_KINDS = (REPORT_STANDARD, REPORT_SAYAC)
+# `run_reports(rollup=True)` çıktısı (`outputs` anahtarı)
+OUTPUT_CUBE = 'kup'
+
+# Kolonsal (bellek eşlemeli) PPD biçimi: JSON başlık + sütun sıralı .npy matris
+COLUMNAR_SUFFIX = '.ppdc'
+_COLUMNAR_VERSION = 1
+# float32'nin birebir tuttuğu en büyük tam sayı
+_FLOAT32_EXACT_MAX = 2 ** 24
+
+# Ekim CSV'si ve sayaç çalışma kitabında verilerin başladığı satır (1 tabanlı)
+_NUMARA_FIRST_ROW = 10
+_SAYAC_FIRST_ROW = 10
+
+# Okunmuş numara eşleşmeleri: dosya yolu -> ((boyut, mtime_ns), eşleşme).
+# Aynı süreçteki tekrar çalışmalarda (GUI, izleme servisi) dosya yeniden okunmaz.
+_NUMARA_CACHE: Dict[str, Tuple[Tuple[int, int], Dict[str, str]]] = {}
+
+class ReportCancelled(Exception):
+    """İşlem kullanıcı tarafından iptal edildi (ilerleme veya iptal geri
+    çağrısından atılır)."""
+
+
+class _ByteRangeReader(io.RawIOBase):
+    """Açık bir dosyayı mevcut konumdan `end` baytına kadar okunur gösterir.
+
+    `end` boşsa dosya sonuna kadar okunur. `on_read` verilirse okumalar en
+    fazla `_PROGRESS_BLOCK` bayt olur ve her okumadan sonra dosya konumuyla
+    çağrılır; ilerleme (ve iptal) böylece tek bir parçanın içinde de işler.
+    """
+
+    def __init__(self, f: BinaryIO, end: Optional[int] = None,
+                 on_read: Optional[Callable[[int], None]] = None) -> None:
+        self._f = f
+        self._end = end
+        self._on_read = on_read
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        view = memoryview(buffer)
+        size = len(view)
+        if self._end is not None:
+            remaining = self._end - self._f.tell()
+            if remaining <= 0:
+                return 0
+            size = min(size, remaining)
+        if self._on_read is None:
+            return self._f.readinto(view[:size])
+        read = self._f.readinto(view[:min(size, _PROGRESS_BLOCK)])
+        self._on_read(self._f.tell())
+        return read
+
+
+class PPDHourly:
+    """Saatlik tüketim matrisi: PPD dosyasını tekrar okumadan analiz için.
+
+    * `values`: (saat × birim) matris, Wh cinsinden; değerler float32'nin
+      birebir tuttuğu tam sayılarsa float32, değilse float64 (kolonsal
+      dosyadan açıldıysa salt okunur bellek eşlemesi)
+    * `timestamps`: satırların zaman damgaları (çözülemezse `None`)
+    * `units`: sütun (birim) adları, örn. DAIRE 1A, DAIRE 1B, LOBI
+    * `indicator`: (birim × daire) 0/1 matrisi; 1A/1B/1C -> Daire 1
+      gruplaması tek bir matris çarpımıdır (`values @ indicator`)
+    * `missing`: birim başına boş/sayı olmayan (0 kabul edilen) hücre
+      sayısı (bilinmiyorsa `None`)
+    * `totals`: dosya okunurken `parse_ppd_file` ile aynı sırada toplanan
+      birim toplamları; tüm saatlerin toplamı bunlardan verilir, böylece
+      rapor iki yolda da aynı çıkar (bilinmiyorsa `None`)
+    """
+
+    def __init__(self, values: np.ndarray, timestamps: Optional[pd.DatetimeIndex],
+                 units: List[str], group_names: List[str], group_keys: List[Any],
+                 group_types: List[str], indicator: np.ndarray, exact: bool = False,
+                 missing: Optional[np.ndarray] = None,
+                 totals: Optional[np.ndarray] = None) -> None:
+        self.values = values
+        self.timestamps = timestamps
+        self.units = units
+        self.group_names = group_names
+        self.group_keys = group_keys
+        self.group_types = group_types
+        self.indicator = indicator
+        self.exact = exact  # tüm hücreler eksiksiz tam sayı mıydı
+        self.missing = missing
+        self.totals = totals
+
+    @property
+    def hours(self) -> int:
+        return self.values.shape[0]
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes + self.indicator.nbytes
+
+    def grouped_values(self) -> np.ndarray:
+        """(saat × daire) matrisi: alt birimler daireye toplanmış halde."""
+        return self.values @ self.indicator
+
+    def hour_mask(self, start: Any = None, end: Any = None) -> np.ndarray:
+        """[start, end) aralığındaki saatlerin maskesi; boş sınırlar açık kalır."""
+        if self.timestamps is None:
+            raise ValueError("Zaman damgaları çözülemedi; tarih aralığı seçilemez")
+        mask = np.ones(self.hours, dtype=bool)
+        if start is not None:
+            mask &= self.timestamps >= pd.Timestamp(start)
+        if end is not None:
+            mask &= self.timestamps < pd.Timestamp(end)
+        return mask
+
+    def unit_totals(self, start: Any = None, end: Any = None) -> pd.Series:
+        """Birim bazlı toplam Wh (tam sayı verilerde int64).
+
+        `start`/`end` verilirse yalnızca [start, end) aralığındaki saatler toplanır.
+        """
+        values = self.values
+        if start is not None or end is not None:
+            values = values[self.hour_mask(start, end)]
+            if not len(values):
+                raise ValueError("Seçilen tarih aralığında okuma yok")
+            sums = values.sum(axis=0, dtype=np.float64)
+        elif self.totals is not None:
+            sums = self.totals
+        else:
+            sums = values.sum(axis=0, dtype=np.float64)
+        totals = pd.Series(sums, index=self.units)
+        return totals.astype('int64') if self.exact else totals
+
+    def window(self, start: Any = None, end: Any = None) -> 'PPDHourly':
+        """Yalnızca [start, end) aralığındaki saatleri içeren matris.
+
+        Eksik hücre sayıları dosyanın tamamı için tutulduğundan aralık
+        dosyanın bir kısmıysa `missing` bilinmez (`None`) olur.
+        """
+        mask = self.hour_mask(start, end)
+        if not mask.any():
+            raise ValueError("Seçilen tarih aralığında okuma yok")
+        if mask.all():
+            return self
+        return PPDHourly(self.values[mask], self.timestamps[mask], self.units, self.group_names,
+                         self.group_keys, self.group_types, self.indicator, self.exact)
+
+    def group_totals(self) -> pd.Series:
+        """Daire bazlı toplam Wh."""
+        sums = self.values.sum(axis=0, dtype=np.float64) @ self.indicator.astype(np.float64)
+        return pd.Series(sums, index=self.group_names)
+
+    def rollup(self, freq: str) -> pd.DataFrame:
+        """Daire bazlı Wh toplamlarını `freq` dönemlerine göre toplar.
+
+        `freq` pandas dönem kodudur: 'D' (gün), 'W' (hafta), 'M' (ay).
+        """
+        if self.timestamps is None:
+            raise ValueError("Zaman damgaları çözülemedi; dönemsel toplam alınamaz")
+        frame = pd.DataFrame(self.grouped_values(), index=self.timestamps,
+                             columns=self.group_names)
+        periods = self.timestamps.to_period(freq)
+        return frame.groupby(periods).sum().rename_axis('DÖNEM')
+
+    def daily(self) -> pd.DataFrame:
+        return self.rollup('D')
+
+    def weekly(self) -> pd.DataFrame:
+        return self.rollup('W')
+
+    def monthly(self) -> pd.DataFrame:
+        return self.rollup('M')
+
+
+class PPDResult:
+    """Rapor tablosu: daire başına bir satır, sütunlar ayrı diziler halinde.
+
+    * `names`, `keys`, `types`: DAİRE_ADI, DAİRE_NO ve TİP listeleri
+    * `wh`: Wh toplamları (tam sayı verilerde int64), `kwh`: kWh toplamları
+    * `eski`: ESKİ_NUMARA listesi (numara eşleşmesi uygulanmadıysa `None`)
+    * `index`: daire numarası -> ilk satırı; daire araması O(1)
+
+    Dışa aktarımlar ve özet doğrudan bu dizileri kullanır; eski kodla
+    uyum için `to_frame()` aynı sütunlarla DataFrame üretir.
+    """
+
+    __slots__ = ('names', 'keys', 'types', 'wh', 'kwh', 'eski', 'index')
+
+    def __init__(self, names: List[str], keys: List[Any], types: List[str],
+                 wh: np.ndarray, kwh: np.ndarray, eski: Optional[List[str]] = None) -> None:
+        self.names = names
+        self.keys = keys
+        self.types = types
+        self.wh = wh
+        self.kwh = kwh
+        self.eski = eski
+        self.index: Dict[Any, int] = {}
+        for row, key in enumerate(keys):
+            self.index.setdefault(key, row)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def take(self, rows: Sequence[int]) -> 'PPDResult':
+        """`rows` sırasındaki satırlardan yeni bir sonuç üretir."""
+        rows = list(rows)
+        eski = [self.eski[r] for r in rows] if self.eski is not None else None
+        return PPDResult([self.names[r] for r in rows], [self.keys[r] for r in rows],
+                         [self.types[r] for r in rows], self.wh[rows], self.kwh[rows], eski)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Eski `parse_ppd_file` çıktısıyla aynı sütunlarda DataFrame."""
+        columns: Dict[str, Any] = {
+            'DAİRE_NO': self.keys,
+            'AYLIK_TUKETIM_WH': self.wh,
+            'AYLIK_TUKETIM_KWH': self.kwh,
+            'DAİRE_ADI': self.names,
+            'TİP': self.types,
+        }
+        if self.eski is not None:
+            columns['ESKİ_NUMARA'] = self.eski
+        return pd.DataFrame(columns)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'PPDResult':
+        """`to_frame()` biçimindeki DataFrame'den sonuç üretir."""
+        eski = df['ESKİ_NUMARA'].tolist() if 'ESKİ_NUMARA' in df.columns else None
+        return cls(df['DAİRE_ADI'].tolist(), df['DAİRE_NO'].tolist(), df['TİP'].tolist(),
+                   df['AYLIK_TUKETIM_WH'].to_numpy(), df['AYLIK_TUKETIM_KWH'].to_numpy(), eski)
+
+    @classmethod
+    def coerce(cls, result: Union['PPDResult', pd.DataFrame]) -> 'PPDResult':
+        """Sonucu olduğu gibi, DataFrame'i (eski çağrılar) dönüştürerek verir."""
+        return result if isinstance(result, cls) else cls.from_frame(result)
 
-# Helper constants for identifying ortak areas
-_ORTAK_KEYWORDS = ['LOBI', 'YONETIM', 'FITNESS', 'MUTFAK', 'P.O', 'BAYBAYAN', 'RES']
 
 class PPDRawParser:
     """PPD dosyalarını okumak, işlemek ve raporlamak için yardımcı sınıf.
@@ -28,7 +299,10 @@ class PPDRawParser:
     düşük birim sürelerde binlerce satır ayrıştırılabilir.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, quiet: bool = False) -> None:
+        # True ise bilgi/uyarı satırları ekrana yazılmaz (servis, toplu işlem);
+        # yalnızca bu parser'ı etkiler, `sys.stdout` değiştirilmez
+        self.quiet = quiet
         # Türkçe ay isimleri (bazı rapor başlıklarında gerekebilir)
         self.months_tr: Dict[int, str] = {
             1: "OCAK", 2: "ŞUBAT", 3: "MART", 4: "NİSAN",
@@ -37,25 +311,57 @@ class PPDRawParser:
         }
         self.numara_mapping: Dict[str, str] = {}  # YENİ -> ESKİ mapping
         self.daire_sirasi: List[int] = []  # Daire okuma sırası
+        self.daire_rank: Dict[int, int] = {}  # Daire no -> sıradaki konumu
+        self.metrics: Optional[StageMetrics] = None  # verilirse aşamalar ölçülür
+        # verilirse her parçadan sonra (okunan bayt, toplam bayt) ile çağrılır;
+        # işlemi durdurmak için ReportCancelled atabilir
+        self.progress: Optional[Callable[[int, int], None]] = None
+        # daire/ortak sütun kuralları (site_profili.ini, yoksa varsayılanlar)
+        self.site_profile: SiteProfile = SiteProfile("Varsayılan")
+        self.load_site_profile()
         self.load_daire_sirasi()
     
+    def _print(self, *args: Any, **kwargs: Any) -> None:
+        if not self.quiet:
+            print(*args, **kwargs)
+
     def load_daire_sirasi(self, path: Optional[Union[str, Path]] = None) -> None:
         """Daire sırasını `daire_sirasi.txt` dosyasından okur.
 
         Eğer `path` verilirse oradaki dosyayı kullanır; yoksa modül
         dizinine bakar. Hata durumunda liste boş kalır ve uyarı basılır.
+        Sıralama için `daire_rank` (daire no -> sıra) burada bir kez kurulur.
         """
         try:
             sira_file = Path(path) if path else Path(__file__).parent / "daire_sirasi.txt"
             if sira_file.exists():
                 with open(sira_file, 'r', encoding='utf-8') as f:
                     self.daire_sirasi = [int(line.strip()) for line in f if line.strip()]
-                print(f"Daire sırası yüklendi ({len(self.daire_sirasi)} daire)")
+                self.daire_rank = {}
+                for rank, daire_no in enumerate(self.daire_sirasi):
+                    self.daire_rank.setdefault(daire_no, rank)
+                self._print(f"Daire sırası yüklendi ({len(self.daire_sirasi)} daire)")
             else:
-                print("⚠ daire_sirasi.txt dosyası bulunamadı (varsayılan sırası kullanılacak)")
+                self._print("⚠ daire_sirasi.txt dosyası bulunamadı (varsayılan sırası kullanılacak)")
         except Exception as e:
-            print(f"Daire sırası yüklenemedi: {e}")
+            self._print(f"Daire sırası yüklenemedi: {e}")
     
+    def load_site_profile(self, path: Optional[Union[str, Path]] = None) -> bool:
+        """Sütun sınıflandırma kurallarını `site_profili.ini`'den okur.
+
+        `path` verilmezse modül dizinine bakılır; dosya yoksa varsayılan
+        profil (DAIRE 1-80, A-F ekleri) kalır. Hata olursa `False` döndürür
+        ve mevcut profil değişmez.
+        """
+        try:
+            self.site_profile = load_site_profile(path)
+        except Exception as e:
+            self._print(f"⚠ {PROFILE_FILE_NAME} yüklenemedi: {e}")
+            return False
+        if path or self.site_profile.name != "Varsayılan":
+            self._print(f"Site profili yüklendi: {self.site_profile.name}")
+        return True
+
     def load_numara_mapping(self, ekim_file: Union[str, Path]) -> bool:
         """Ekim formatındaki CSV'den eski-yeni numara haritalamasını alır.
 
@@ -63,156 +369,867 @@ class PPDRawParser:
         döndürür ve `numara_mapping` aynı kalır.
         """
         try:
-            with open(ekim_file, 'r', encoding='utf-8-sig') as f:
-                reader = csv.reader(f, delimiter=';')
-                for row in list(reader)[9:]:
-                    if len(row) < 2 or not row[0].strip() or not row[1].strip():
-                        continue
-                    self.numara_mapping[row[1].strip()] = row[0].strip()
-            print(f"{len(self.numara_mapping)} numaralama eşleşmesi yüklendi")
+            self.numara_mapping.update(self.read_numara_mapping(ekim_file))
+            self._print(f"{len(self.numara_mapping)} numaralama eşleşmesi yüklendi")
             return True
         except Exception as e:
-            print(f"Numara mapping yüklenemedi: {e}")
+            self._print(f"Numara mapping yüklenemedi: {e}")
             return False
+
+    @staticmethod
+    def read_numara_mapping(ekim_file: Union[str, Path]) -> Dict[str, str]:
+        """Ekim formatındaki CSV'den YENİ -> ESKİ eşleşmesini okur (parser'a dokunmaz).
+
+        Dosya satır satır okunur. Sonuç dosyanın boyutu ve değişiklik
+        zamanıyla süreç içinde önbelleklenir; dosya değişmedikçe tekrar
+        okunmaz. Her çağrı kendi kopyasını alır.
+        """
+        path = Path(ekim_file).resolve()
+        stat = path.stat()
+        signature = (stat.st_size, stat.st_mtime_ns)
+        cached = _NUMARA_CACHE.get(str(path))
+        if cached is not None and cached[0] == signature:
+            return dict(cached[1])
+
+        mapping: Dict[str, str] = {}
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            reader = csv.reader(f, delimiter=';')
+            for row in itertools.islice(reader, _NUMARA_FIRST_ROW - 1, None):
+                if len(row) < 2:
+                    continue
+                eski, yeni = row[0].strip(), row[1].strip()
+                if eski and yeni:
+                    mapping[yeni] = eski
+        _NUMARA_CACHE[str(path)] = (signature, mapping)
+        return dict(mapping)
+
+    def apply_numara_mapping(self, result: PPDResult) -> PPDResult:
+        """`ESKİ_NUMARA` sütununu güncel `numara_mapping`'e göre (yeniden) doldurur."""
+        mapping = self.numara_mapping
+        result.eski = [mapping.get(str(key), '') for key in result.keys]
+        return result
     
+    @staticmethod
+    def detect_month_year(file_path: Union[str, Path]) -> str:
+        """Dosya adındaki dönemden rapor etiketini (`ay_yıl`) çıkarır.
+
+        Başlangıç tarihinin ayı ve yılı kullanılır; dosya adı
+        `PPD_ggaayyyy_ggaayyyy.csv` biçiminde değilse "RAPOR" döner.
+        """
+        match = _PERIOD_REGEX.search(Path(file_path).name)
+        if not match:
+            return "RAPOR"
+        month = int(match.group(2))
+        year = match.group(3)
+        return f"{month}_{year}"
+
+    def _stage(self, name: str, rows: Optional[int] = None,
+               cols: Optional[int] = None) -> Any:
+        """`self.metrics` varsa aşamayı ölçer, yoksa hiçbir şey yapmaz."""
+        if self.metrics is None:
+            return contextlib.nullcontext({})
+        return self.metrics.stage(name, rows, cols)
+
+    def _timed_chunks(self, chunks: Iterator[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """Parçaları aynen verir; her parçanın okunma süresini ölçer."""
+        chunks = iter(chunks)
+        while True:
+            with self._stage('csv_okuma') as counts:
+                chunk = next(chunks, None)
+                if chunk is not None:
+                    counts.update(rows=len(chunk), cols=chunk.shape[1])
+            if chunk is None:
+                return
+            yield chunk
+
+    def _report_progress(self, done: int, total: int) -> None:
+        if self.progress is not None:
+            self.progress(min(done, total), total)
+
     def _is_daire_column(self, col_name: str) -> bool:
-        """Verilen sütun adının daire/alan verisi içerip içermediğine bakar."""
-        col = col_name.strip().upper()
-        if _DAIRE_COL_REGEX.match(col):
-            # yalnızca 1‑80 arası numaralardan oluşan gerçek daireler
-            num = int(_DAIRE_COL_REGEX.match(col).group(1))
-            return 1 <= num <= 80
-        # sabit ortak isimler
-        return any(keyword in col for keyword in _ORTAK_KEYWORDS)
+        """Verilen sütun adının daire/alan verisi içerip içermediğine bakar.
+
+        Profildeki numara aralığındaki daireler ve ortak alan anahtar
+        kelimesi geçen sütunlar seçilir.
+        """
+        return self.site_profile.classify(col_name).selected
 
     def _normalize_daire_name(self, col_name: str) -> str:
         """Hüc dergisindeki gibi orijinal sütun adını döner (boş bırakma yok)."""
         return col_name.strip()
 
-    def parse_ppd_file(self, file_path: Union[str, Path]) -> pd.DataFrame:
-        """PPD CSV dosyasını DataFrame'e dönüştürür ve toplamları hesaplar.
+    def _sniff_ppd_header(self, file_path: Union[str, Path]) -> Tuple[List[str], int]:
+        """Başlık satırını (boş satırlar hariç 7. satır) bir kez okur.
+
+        Sütun adlarını pandas'ın `header=6` ile üreteceği şekilde ve veri
+        satırlarının başladığı bayt konumunu döndürür.
+        """
+        with open(file_path, 'rb') as f:
+            seen = 0
+            while True:
+                line = f.readline()
+                if not line:
+                    raise ValueError("PPD dosyasında başlık satırı bulunamadı")
+                if line.strip(b'\r\n'):
+                    seen += 1
+                    if seen > _HEADER_ROW:
+                        break
+            data_offset = f.tell()
+        header = pd.read_csv(io.BytesIO(line), sep=';', header=0, encoding='utf-8-sig', nrows=0)
+        return [str(c) for c in header.columns], data_offset
+
+    def _iter_ppd_chunks(self, file_path: Union[str, Path], columns: List[str],
+                         usecols: List[str], data_offset: int,
+                         chunksize: Optional[int], typed: bool = True,
+                         end_offset: Optional[int] = None,
+                         text_cols: Sequence[str] = ()) -> Iterator[pd.DataFrame]:
+        """Sadece `usecols` sütunlarını `chunksize` satırlık parçalar halinde okur.
+
+        `typed` ise sütunlar doğrudan float olarak ayrıştırılır; değilse
+        pandas'ın tahmin ettiği tiplerle okunur (sayıya çevirme çağırana
+        kalır). `text_cols` (ör. tarih/saat) metin olarak okunup parçanın
+        başına eklenir. `chunksize` boşsa dosya tek parça okunur ve pyarrow
+        kuruluysa onun CSV motoru kullanılır. `end_offset` verilirse bu
+        bayttan sonrası okunmaz. `self.progress` varsa okunan bayt sayısı
+        her parçadan sonra ve parça okunurken her `_PROGRESS_BLOCK` baytta
+        bildirilir (aylık dosya tek parça olsa da ilerleme/iptal işler).
+        """
+        selected = list(text_cols) + usecols
+        with open(file_path, 'rb') as raw_file:
+            total = (end_offset if end_offset is not None
+                     else os.fstat(raw_file.fileno()).st_size) - data_offset
+            self._report_progress(0, total)
+            raw_file.seek(data_offset)
+            f: BinaryIO = raw_file
+            on_read = None
+            if self.progress is not None:
+                def on_read(position: int) -> None:
+                    self._report_progress(position - data_offset, total)
+            if end_offset is not None or on_read is not None:
+                f = io.BufferedReader(_ByteRangeReader(raw_file, end_offset, on_read))
+            if typed and not chunksize and _HAS_PYARROW:
+                table = self._read_with_pyarrow(f, columns, usecols, text_cols)[selected]
+                self._report_progress(total, total)
+                yield table
+                return
+            dtype: Dict[str, Any] = {c: 'float64' for c in usecols} if typed else {}
+            dtype.update({c: str for c in text_cols})
+            read_kwargs: Dict[str, Any] = {
+                'sep': ';', 'header': None, 'names': columns, 'usecols': selected,
+                'encoding': 'utf-8', 'engine': 'c', 'dtype': dtype or None,
+            }
+            if not chunksize:
+                frame = pd.read_csv(f, low_memory=False, **read_kwargs)[selected]
+                self._report_progress(total, total)
+                yield frame
+                return
+            with pd.read_csv(f, chunksize=chunksize, **read_kwargs) as reader:
+                for chunk in reader:
+                    self._report_progress(raw_file.tell() - data_offset, total)
+                    yield chunk[selected]
+            self._report_progress(total, total)
+
+    @staticmethod
+    def _read_with_pyarrow(f: BinaryIO, columns: List[str], usecols: List[str],
+                           text_cols: Sequence[str] = ()) -> pd.DataFrame:
+        """pyarrow CSV motoruyla `usecols` sütunlarını float olarak okur."""
+        import pyarrow as pa
+        from pyarrow import csv as pa_csv
+
+        column_types = {c: pa.float64() for c in usecols}
+        column_types.update({c: pa.string() for c in text_cols})
+        table = pa_csv.read_csv(
+            f,
+            read_options=pa_csv.ReadOptions(column_names=columns),
+            parse_options=pa_csv.ParseOptions(delimiter=';'),
+            convert_options=pa_csv.ConvertOptions(
+                include_columns=list(text_cols) + usecols,
+                column_types=column_types,
+            ),
+        )
+        return table.to_pandas()
+
+    def _sum_ppd_columns(self, file_path: Union[str, Path], columns: List[str],
+                         daire_cols: List[str], data_offset: int,
+                         chunksize: Optional[int],
+                         end_offset: Optional[int] = None) -> Tuple[np.ndarray, bool, int]:
+        """Daire sütunlarını parça parça okuyup sütun toplamlarını döndürür.
+
+        Dönüş: (toplamlar, tüm hücreler eksiksiz tam sayı mı, satır sayısı).
+        Sayı olmayan hücre bulunursa dosya esnek okumayla tekrar okunur.
+        """
+        try:
+            return self._sum_chunks(self._iter_ppd_chunks(
+                file_path, columns, daire_cols, data_offset, chunksize,
+                end_offset=end_offset), len(daire_cols), typed=True)
+        except ValueError:
+            # sayı olmayan hücreler var; esnek okuma ile eksik sayılır
+            self._print("⚠ Sayısal olmayan değerler bulundu, esnek okuma kullanılıyor")
+            return self._sum_chunks(self._iter_ppd_chunks(
+                file_path, columns, daire_cols, data_offset, chunksize, typed=False,
+                end_offset=end_offset), len(daire_cols), typed=False)
+
+    @staticmethod
+    def _chunk_values(chunk: pd.DataFrame, typed: bool) -> Tuple[np.ndarray, bool, Optional[np.ndarray]]:
+        """Parçayı eksikleri 0 olan float64 diziye çevirir.
+
+        İkinci değer, parçadaki tüm hücrelerin eksiksiz tam sayı olup
+        olmadığıdır; üçüncüsü sütun başına 0 yapılan (boş veya sayı
+        olmayan) hücre sayısıdır (hiç yoksa `None`).
+        """
+        if not typed:
+            chunk = chunk.apply(pd.to_numeric, errors='coerce')
+        values = chunk.to_numpy(dtype='float64', na_value=np.nan)
+        # eksik değerler 0 olsun
+        missing = np.isnan(values)
+        if missing.any():
+            return np.where(missing, 0.0, values), False, missing.sum(axis=0)
+        return values, not np.mod(values, 1).any(), None
+
+    def _sum_chunks(self, chunks: Iterator[pd.DataFrame], width: int,
+                    typed: bool) -> Tuple[np.ndarray, bool, int]:
+        """`_sum_ppd_columns` için parçaları toplar."""
+        sums = np.zeros(width)
+        exact = True
+        rows = 0
+        for chunk in self._timed_chunks(chunks):
+            with self._stage('sayisal_donusum', len(chunk), chunk.shape[1]):
+                values, chunk_exact, _ = self._chunk_values(chunk, typed)
+                exact = exact and chunk_exact
+                rows += len(values)
+                sums += values.sum(axis=0)
+        return sums, exact, rows
+
+    @staticmethod
+    def _lossless_dtype(values: np.ndarray) -> Any:
+        """Değerleri kayıpsız tutan en küçük tip: float32'nin birebir
+        tuttuğu tam sayılarsa float32, değilse float64."""
+        small_whole = values.size == 0 or (np.abs(values).max() <= _FLOAT32_EXACT_MAX
+                                           and not np.mod(values, 1).any())
+        return np.float32 if small_whole else np.float64
+
+    @staticmethod
+    def _totals_series(daire_cols: List[str], sums: np.ndarray, exact: bool) -> pd.Series:
+        """Toplamları Series'e çevirir; hepsi tam sayıysa int64 kalır.
+
+        Böylece çıktı, dosyanın tamamını okuyan eski yöntemle aynı olur.
+        """
+        totals = pd.Series(sums, index=daire_cols)
+        return totals.astype('int64') if exact else totals
+
+    def parse_ppd_file(self, file_path: Union[str, Path],
+                       chunksize: Optional[int] = DEFAULT_CHUNK_ROWS,
+                       use_cache: bool = False) -> PPDResult:
+        """PPD CSV dosyasını ayrıştırır ve daire toplamlarını (`PPDResult`) hesaplar.
 
-        * Pandas kullanarak tüm sayı dönüşümlerini vektörize eder,
-          böylece düşük uçlu CPU'larda bile hızlı çalışır.
-        * `DAIRE` önekli sütunları bulur ve sonra saatlik değerleri toplar.
+        * Önce sadece başlık satırı okunur ve daire/ortak sütunları seçilir;
+          ardından yalnızca bu sütunlar float olarak ayrıştırılır. Zaman
+          damgası, durum vb. sütunlar hiç belleğe alınmaz.
+        * Dosya `chunksize` satırlık parçalar halinde okunur; her parça
+          toplanıp bırakılır. Böylece çok aylık/yıllık dosyalarda bile
+          bellek kullanımı sabit kalır. `chunksize=None` tek seferde okur.
+        * `use_cache` ise dosyanın yanındaki önbellek kullanılır: dosya
+          değişmediyse hiç okunmaz, sadece sonuna satır eklendiyse yalnızca
+          yeni satırlar toplanır. Satır sonu olmadan biten son satır
+          önbellekteki toplamlara katılmaz (cihaz yazmaya devam ediyor
+          olabilir) ama rapora ayrıca eklenir; sonuç önbelleksiz okumayla
+          aynıdır.
+        * Kolonsal (`.ppdc`) dosyalar ayrıştırılmaz; bellek eşlemesiyle
+          açılıp sütun toplamları doğrudan alınır.
         """
-        print(f"PPD dosyası işleniyor: {file_path}")
-        # pandas hızlı okuma
-        raw = pd.read_csv(file_path, sep=';', header=6, encoding='utf-8-sig', low_memory=False)
+        if self.is_columnar(file_path):
+            return self.frame_from_hourly(self.open_columnar(file_path))
+
+        self._print(f"PPD dosyası işleniyor: {file_path}")
+        columns, data_offset = self._sniff_ppd_header(file_path)
 
         # sadece daire/ortak sütunları seç
-        daire_cols = [c for c in raw.columns if self._is_daire_column(c)]
+        daire_cols = self.site_profile.data_columns(columns)
         if not daire_cols:
             raise ValueError("PPD dosyasında daire sütunu bulunamadı")
-        print(f"{len(daire_cols)} sütun seçildi")
-
-        # tüm değerleri sayıya çevir, eksikler 0 olsun
-        df_vals = raw[daire_cols].apply(pd.to_numeric, errors='coerce').fillna(0)
-        totals: pd.Series = df_vals.sum(axis=0)
-
-        # sonuç tablosunu oluştur
-        records: List[Dict[str, Any]] = []
-        for col, tot in totals.items():
-            name = self._normalize_daire_name(col)
-            num = self.extract_daire_number(name)
-            typ = self.get_daire_type(name)
-            records.append({
-                'DAİRE_ADI': name,
-                'DAİRE_NO': num,
-                'TİP': typ,
-                'AYLIK_TUKETIM_WH': tot,
-                'AYLIK_TUKETIM_KWH': tot / 1000,
-            })
-
-        df = pd.DataFrame(records)
-
-        # suit dairelerini numaraya göre grupla (ortaklar zaten ayrı)
-        df_ortak = df[df['TİP'] == 'ORTAK']
-        df_suit = df[df['TİP'] == 'SÜİT']
-        if not df_suit.empty:
-            grouped = df_suit.groupby('DAİRE_NO', as_index=False)[
-                ['AYLIK_TUKETIM_WH', 'AYLIK_TUKETIM_KWH']
-            ].sum()
-            grouped['DAİRE_ADI'] = 'DAIRE ' + grouped['DAİRE_NO'].astype(str)
-            grouped['TİP'] = 'SÜİT'
-            df = pd.concat([grouped, df_ortak], ignore_index=True)
-        else:
-            df = df_ortak.copy()
+        self._print(f"{len(daire_cols)} sütun seçildi")
+
+        if not use_cache:
+            sums, exact, _ = self._sum_ppd_columns(file_path, columns, daire_cols,
+                                                   data_offset, chunksize)
+            return self._build_result(self._totals_series(daire_cols, sums, exact))
 
-        if self.numara_mapping:
-            df['ESKİ_NUMARA'] = df['DAİRE_NO'].astype(str).map(self.numara_mapping).fillna('')
+        path = Path(file_path)
+        stat = path.stat()
+        header_hash = hashlib.sha1(';'.join(columns).encode('utf-8')).hexdigest()
+        cache = self._load_parse_cache(path)
+        same_layout = (
+            cache is not None
+            and cache.get('version') == _CACHE_VERSION
+            and cache['header_hash'] == header_hash
+            and cache['data_offset'] == data_offset
+            and cache['columns'] == daire_cols
+        )
+
+        if same_layout and cache['size'] == stat.st_size and cache['mtime'] == stat.st_mtime:
+            self._print(f"✓ Önbellekten okundu ({cache['rows'] + cache['tail_rows']} satır)")
+            self._touch_parse_cache(path)
+            sums = (np.asarray(cache['totals'], dtype='float64')
+                    + np.asarray(cache['tail_totals'], dtype='float64'))
+            exact = cache['exact'] and cache['tail_exact']
+            return self._build_result(self._totals_series(daire_cols, sums, exact))
+
+        end_offset = self._complete_size(path, stat.st_size)
+        if (same_layout and stat.st_size > cache['size']
+                and self._content_hash(path, data_offset, cache['end_offset']) == cache['content_hash']):
+            # dosya sadece büyümüş: yalnızca yeni satırları topla
+            new_sums, new_exact, new_rows = self._sum_ppd_columns(
+                file_path, columns, daire_cols, cache['end_offset'], chunksize, end_offset)
+            sums = np.asarray(cache['totals'], dtype='float64') + new_sums
+            exact = cache['exact'] and new_exact
+            rows = cache['rows'] + new_rows
+            self._print(f"✓ Önbelleğe {new_rows} yeni satır eklendi")
+        else:
+            sums, exact, rows = self._sum_ppd_columns(file_path, columns, daire_cols,
+                                                      data_offset, chunksize, end_offset)
+        # satır sonu olmadan biten son satır: toplamlara değil, ayrı saklanır
+        if end_offset < stat.st_size:
+            tail_sums, tail_exact, tail_rows = self._sum_ppd_columns(
+                file_path, columns, daire_cols, end_offset, chunksize, stat.st_size)
         else:
-            df['ESKİ_NUMARA'] = ''
+            tail_sums, tail_exact, tail_rows = np.zeros(len(daire_cols)), True, 0
+
+        self._save_parse_cache(path, {
+            'version': _CACHE_VERSION,
+            'size': stat.st_size,
+            'mtime': stat.st_mtime,
+            'header_hash': header_hash,
+            'data_offset': data_offset,
+            'end_offset': end_offset,
+            'content_hash': self._content_hash(path, data_offset, end_offset),
+            'rows': rows,
+            'columns': daire_cols,
+            'totals': [int(v) for v in sums] if exact else sums.tolist(),
+            'exact': exact,
+            'tail_rows': tail_rows,
+            'tail_totals': [int(v) for v in tail_sums] if tail_exact else tail_sums.tolist(),
+            'tail_exact': tail_exact,
+        })
+        return self._build_result(self._totals_series(daire_cols, sums + tail_sums,
+                                                      exact and tail_exact))
+
+    @staticmethod
+    def _complete_size(path: Path, size: int) -> int:
+        """Son tam satırın bittiği bayt konumunu döndürür.
+
+        Cihaz dosyayı yazarken yarım kalmış son satır önbelleğe alınmaz.
+        """
+        with open(path, 'rb') as f:
+            pos = size
+            while pos > 0:
+                start = max(0, pos - 65536)
+                f.seek(start)
+                block = f.read(pos - start)
+                idx = block.rfind(b'\n')
+                if idx >= 0:
+                    return start + idx + 1
+                pos = start
+        return size
+
+    @staticmethod
+    def _content_hash(path: Path, data_offset: int, end_offset: int) -> str:
+        """Okunan veri aralığının baş, orta ve son bloklarından özet çıkarır.
+
+        Dosyanın sadece sonuna ekleme yapıldığını (önceki satırların
+        değişmediğini) tüm dosyayı okumadan doğrulamak için kullanılır.
+        """
+        digest = hashlib.sha1()
+        middle = (data_offset + end_offset) // 2
+        with open(path, 'rb') as f:
+            for start in (data_offset, middle, end_offset - _CACHE_SAMPLE_BYTES):
+                start = max(data_offset, start)
+                f.seek(start)
+                digest.update(f.read(min(_CACHE_SAMPLE_BYTES, end_offset - start)))
+        return digest.hexdigest()
+
+    @staticmethod
+    def _cache_path(path: Path) -> Path:
+        """PPD dosyasının yanındaki önbellek dosyasının yolu."""
+        return path.with_name(path.name + _CACHE_SUFFIX)
+
+    def _load_parse_cache(self, path: Path) -> Optional[Dict[str, Any]]:
+        """Önbelleği okur; yoksa veya bozuksa `None` döner."""
+        try:
+            with open(self._cache_path(path), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _touch_parse_cache(self, path: Path) -> None:
+        """Önbelleğin son kullanım zamanını günceller (temizlik için)."""
+        try:
+            os.utime(self._cache_path(path))
+        except OSError:
+            pass
+
+    def _save_parse_cache(self, path: Path, entry: Dict[str, Any]) -> None:
+        """Önbelleği yazar ve aynı dizindeki eski önbellekleri temizler.
+
+        Dizin yazılamıyorsa sadece uyarı basılır; rapor yine oluşturulur.
+        """
+        try:
+            with open(self._cache_path(path), 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            self.evict_parse_cache(path.parent)
+        except OSError as e:
+            self._print(f"⚠ Önbellek yazılamadı: {e}")
+
+    def evict_parse_cache(self, directory: Union[str, Path],
+                          max_age_days: float = CACHE_MAX_AGE_DAYS,
+                          max_entries: int = CACHE_MAX_ENTRIES) -> int:
+        """`directory` içindeki eski önbellek dosyalarını siler.
+
+        PPD dosyası artık olmayan, `max_age_days` gündür kullanılmayan ve
+        en yeni `max_entries` tanesinin dışında kalan önbellekler silinir.
+        Silinen dosya sayısını döndürür.
+        """
+        entries = []
+        for cache_file in Path(directory).glob('*' + _CACHE_SUFFIX):
+            try:
+                entries.append((cache_file.stat().st_mtime, cache_file))
+            except OSError:
+                continue
+        entries.sort(reverse=True)
+
+        cutoff = time.time() - max_age_days * 86400
+        removed = 0
+        for idx, (last_used, cache_file) in enumerate(entries):
+            source = cache_file.with_name(cache_file.name[:-len(_CACHE_SUFFIX)])
+            if idx < max_entries and last_used >= cutoff and source.exists():
+                continue
+            try:
+                cache_file.unlink()
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+    def _time_columns(self, columns: List[str], daire_cols: List[str]) -> List[str]:
+        """Zaman damgası sütunlarını (tarih, saat) bulur.
+
+        Adında tarih/saat geçen sütunlar alınır; hiçbiri yoksa ilk daire
+        dışı sütun zaman damgası kabul edilir.
+        """
+        others = [c for c in columns if c not in set(daire_cols)]
+        found = [c for c in others if any(k in c.strip().upper() for k in _TIME_KEYWORDS)]
+        if found:
+            return found
+        return others[:1]
+
+    def _parse_timestamps(self, parts: List[pd.Series]) -> Optional[pd.DatetimeIndex]:
+        """Tarih/saat metinlerini DatetimeIndex'e çevirir; çözülemezse `None`."""
+        if not parts:
+            return None
+        text = parts[0].fillna('')
+        for part in parts[1:]:
+            text = text.str.cat(part.fillna(''), sep=' ')
+        stamps = pd.DatetimeIndex(pd.to_datetime(text.str.strip(), dayfirst=True, errors='coerce'))
+        if len(stamps) and stamps.isna().all():
+            self._print("⚠ Zaman damgaları çözülemedi")
+            return None
+        return stamps
+
+    def _unit_groups(self, units: List[str]) -> Tuple[List[str], List[Any], List[str], List[List[int]]]:
+        """Birimleri dairelere gruplar.
+
+        SÜİT birimleri daire numarasına göre birleşir (sıralı), ORTAK
+        alanlar ayrı kalır ve sona eklenir. Dönüş: (adlar, numaralar,
+        tipler, her dairenin dosya sırasındaki birim indeksleri).
+        """
+        suit_index: Dict[Any, List[int]] = {}
+        ortak: List[int] = []
+        classes = self.site_profile.classify_header(units)
+        for idx, info in enumerate(classes):
+            if info.type == 'SÜİT':
+                suit_index.setdefault(info.key, []).append(idx)
+            else:
+                ortak.append(idx)
+
+        names: List[str] = []
+        keys: List[Any] = []
+        types: List[str] = []
+        members: List[List[int]] = []
+        for num in sorted(suit_index):
+            names.append(f"DAIRE {num}")
+            keys.append(num)
+            types.append('SÜİT')
+            members.append(suit_index[num])
+        for idx in ortak:
+            names.append(classes[idx].name)
+            keys.append(classes[idx].key)
+            types.append('ORTAK')
+            members.append([idx])
+        return names, keys, types, members
+
+    def _group_units(self, units: List[str]) -> Tuple[List[str], List[Any], List[str], np.ndarray]:
+        """`_unit_groups` gruplaması; üyeler birim × daire gösterge matrisi olarak."""
+        names, keys, types, members = self._unit_groups(units)
+        indicator = np.zeros((len(units), len(names)), dtype=np.float32)
+        for group, unit_idx in enumerate(members):
+            indicator[unit_idx, group] = 1.0
+        return names, keys, types, indicator
+
+    def parse_ppd_hourly(self, file_path: Union[str, Path],
+                         chunksize: Optional[int] = DEFAULT_CHUNK_ROWS,
+                         dtype: Any = None) -> PPDHourly:
+        """PPD dosyasını saatlik matris olarak okur (`PPDHourly`).
+
+        `parse_ppd_file` gibi sadece daire/ortak ve zaman sütunlarını
+        parça parça okur, ancak toplamak yerine saatlik değerleri matris
+        olarak saklar. `dtype` verilmezse kayıpsız olan en küçük tip seçilir
+        (`_lossless_dtype`): kesirli Wh değerleri float32'ye yuvarlanmaz.
+        Birim toplamları da `parse_ppd_file` ile aynı şekilde parça parça
+        float64 toplanır; rapor tablosu `frame_from_hourly` ile dosya tekrar
+        okunmadan, CSV yoluyla birebir aynı elde edilir.
+        Kolonsal (`.ppdc`) dosyalar okunmaz, bellek eşlemesiyle açılır.
+        """
+        if self.is_columnar(file_path):
+            return self.open_columnar(file_path)
+        self._print(f"PPD dosyası saatlik olarak işleniyor: {file_path}")
+        columns, data_offset = self._sniff_ppd_header(file_path)
+        daire_cols = self.site_profile.data_columns(columns)
+        if not daire_cols:
+            raise ValueError("PPD dosyasında daire sütunu bulunamadı")
+        time_cols = self._time_columns(columns, daire_cols)
+
+        def read(typed: bool) -> Tuple[List[np.ndarray], List[List[pd.Series]], bool,
+                                       np.ndarray, np.ndarray]:
+            blocks: List[np.ndarray] = []
+            stamp_parts: List[List[pd.Series]] = []
+            exact = True
+            missing = np.zeros(len(daire_cols), dtype=np.int64)
+            sums = np.zeros(len(daire_cols))
+            chunks = self._iter_ppd_chunks(file_path, columns, daire_cols, data_offset,
+                                           chunksize, typed, text_cols=time_cols)
+            for chunk in self._timed_chunks(chunks):
+                with self._stage('sayisal_donusum', len(chunk), len(daire_cols)):
+                    values, chunk_exact, chunk_missing = self._chunk_values(chunk[daire_cols], typed)
+                    exact = exact and chunk_exact
+                    if chunk_missing is not None:
+                        missing += chunk_missing
+                    sums += values.sum(axis=0)
+                    blocks.append(values if dtype is None else values.astype(dtype, copy=False))
+                stamp_parts.append([chunk[c] for c in time_cols])
+            return blocks, stamp_parts, exact, missing, sums
+
+        try:
+            blocks, stamp_parts, exact, missing, sums = read(typed=True)
+        except ValueError:
+            self._print("⚠ Sayısal olmayan değerler bulundu, esnek okuma kullanılıyor")
+            blocks, stamp_parts, exact, missing, sums = read(typed=False)
+
+        values = (np.vstack(blocks) if blocks
+                  else np.zeros((0, len(daire_cols)), dtype=dtype or np.float64))
+        if dtype is None:
+            values = values.astype(self._lossless_dtype(values), copy=False)
+        timestamps = None
+        if time_cols:
+            with self._stage('zaman_damgasi', len(values), len(time_cols)):
+                timestamps = self._parse_timestamps(
+                    [pd.concat([parts[i] for parts in stamp_parts], ignore_index=True)
+                     if stamp_parts else pd.Series([], dtype=str)
+                     for i in range(len(time_cols))])
+        names, keys, types, indicator = self._group_units(daire_cols)
+        self._print(f"{values.shape[0]} saat × {values.shape[1]} birim okundu")
+        return PPDHourly(values, timestamps, daire_cols, names, keys, types, indicator,
+                         exact, missing, sums)
+
+    def merge_hourly(self, files: Sequence[Union[str, Path]]) -> PPDHourly:
+        """Örtüşen PPD dosyalarını tek bir saatlik zaman çizelgesinde birleştirir.
+
+        Her dosya `parse_ppd_hourly` ile okunur, zaman damgaları saate
+        yuvarlanıp ortak saat dizinine yerleştirilir. Bir saat birden fazla
+        dosyada varsa en son dosyanın değeri alınır: son okuması en geç olan
+        dosya önceliklidir, eşitlikte listede sonra gelen. Aynı dosyada
+        tekrar eden saatte ilk satır kalır. Eşleştirme satır döngüsü
+        olmadan tek bir sıralama (`lexsort` + `unique`) ile yapılır.
+
+        Birim (sütun) kümesi dosyaların birleşimidir; bir birimin
+        bulunmadığı dosyadan gelen saatler 0 (eksik) sayılır. Dosyalar
+        arasındaki boşluklar doldurulmaz, yalnızca bildirilir.
+        """
+        if not files:
+            raise ValueError("Birleştirilecek PPD dosyası verilmedi")
+        parts = [self.parse_ppd_hourly(f) for f in files]
+        for path, part in zip(files, parts):
+            if part.timestamps is None:
+                raise ValueError(f"{Path(path).name}: zaman damgaları çözülemedi, "
+                                 "dosyalar birleştirilemez")
+
+        with self._stage('birlestirme', sum(p.hours for p in parts)):
+            stamps = np.concatenate([p.timestamps.floor('h').as_unit('ns').asi8 for p in parts])
+            source = np.repeat(np.arange(len(parts)), [p.hours for p in parts])
+            rows = np.concatenate([np.arange(p.hours) for p in parts])
+            valid = stamps != pd.NaT.value
+            if not valid.all():
+                self._print(f"⚠ {int((~valid).sum())} satırın zamanı çözülemedi, birleştirmede atlandı")
+
+            # öncelik: son okuması en geç olan dosya; eşitlikte listede sonraki
+            last = [p.timestamps.max() for p in parts]
+            ranked = sorted(range(len(parts)),
+                            key=lambda i: (pd.Timestamp.min if pd.isna(last[i]) else last[i], i))
+            precedence = np.empty(len(parts), dtype=np.int64)
+            precedence[ranked] = np.arange(len(parts))
+
+            # saate göre, aynı saatte önceliği yüksek dosya önde; her saatin ilki kazanır
+            order = np.lexsort((-precedence[source], stamps))
+            order = order[valid[order]]
+            hours, first = np.unique(stamps[order], return_index=True)
+            winners = order[first]
+
+            # birim sırası en eski dosyadan başlar (yeni birimler sona eklenir)
+            units = list(dict.fromkeys(u for i in ranked for u in parts[i].units))
+            column = {u: i for i, u in enumerate(units)}
+            dtype = np.result_type(*[p.values.dtype for p in parts])
+            values = np.zeros((len(hours), len(units)), dtype=dtype)
+            missing: Optional[np.ndarray] = np.zeros(len(units), dtype=np.int64)
+            for idx, part in enumerate(parts):
+                won = np.flatnonzero(source[winners] == idx)
+                cols = np.array([column[u] for u in part.units], dtype=np.intp)
+                if len(won):
+                    values[won[:, None], cols] = part.values[rows[winners[won]]]
+                if missing is None:
+                    continue
+                absent = np.ones(len(units), dtype=bool)
+                absent[cols] = False
+                missing[absent] += len(won)
+                if part.missing is not None and (len(won) == part.hours or not part.missing.any()):
+                    missing[cols] += part.missing
+                else:
+                    # dosyanın yalnızca bir kısmı alındı; eksiklerin hangi saatte olduğu bilinmiyor
+                    missing = None
+
+        overlap = int(valid.sum()) - len(hours)
+        gaps = int((hours[-1] - hours[0]) // 3_600_000_000_000) + 1 - len(hours) if len(hours) else 0
+        self._print(f"{len(parts)} dosya birleştirildi: {len(hours)} saat, {overlap} örtüşen saat atlandı")
+        if gaps > 0:
+            self._print(f"⚠ Birleşik zaman çizelgesinde {gaps} saatlik boşluk var")
+        names, keys, types, indicator = self._group_units(units)
+        return PPDHourly(values, pd.DatetimeIndex(pd.to_datetime(hours)), units, names, keys,
+                         types, indicator, all(p.exact for p in parts), missing)
+
+    @staticmethod
+    def is_columnar(file_path: Union[str, Path]) -> bool:
+        """Dosya `convert_to_columnar` ile üretilmiş kolonsal başlık mı?"""
+        return Path(file_path).suffix.lower() == COLUMNAR_SUFFIX
+
+    def convert_to_columnar(self, file_path: Union[str, Path],
+                            output: Optional[Union[str, Path]] = None,
+                            chunksize: Optional[int] = DEFAULT_CHUNK_ROWS) -> Path:
+        """PPD CSV dosyasını bir kerelik kolonsal biçime çevirir; başlık yolunu döndürür.
+
+        Çıktı iki dosyadır: `<ad>.ppdc` (JSON: sütunlar, zaman damgaları,
+        kaynak dosya bilgisi) ve `<ad>.ppdc.npy` (saat × birim matris).
+        Matris sütun sıralı (Fortran) yazılır; her birimin değerleri diskte
+        ardışık durduğu için bellek eşlemesinde sadece kullanılan sütunlar
+        okunur. Tüm değerler float32'nin birebir tuttuğu tam sayılarsa
+        float32, değilse float64 saklanır (CSV'ye göre kayıpsız).
+        """
+        source = Path(file_path)
+        header_path = Path(output) if output else source.with_suffix(COLUMNAR_SUFFIX)
+        values_path = header_path.with_name(header_path.name + '.npy')
+        stat = source.stat()
+
+        hourly = self.parse_ppd_hourly(source, chunksize, dtype=np.float64)
+        values = hourly.values
+        # eksik hücreler 0 olarak gelir; `exact` bayrağı başlıkta ayrıca saklanır
+        dtype = self._lossless_dtype(values)
+        matrix = np.lib.format.open_memmap(values_path, mode='w+', dtype=dtype,
+                                           shape=values.shape, fortran_order=True)
+        matrix[:] = values
+        matrix.flush()
+        del matrix
+
+        header = {
+            'version': _COLUMNAR_VERSION,
+            'source': {'name': source.name, 'size': stat.st_size, 'mtime': stat.st_mtime},
+            'values': values_path.name,
+            'rows': int(values.shape[0]),
+            'columns': hourly.units,
+            'exact': bool(hourly.exact),
+            'missing': hourly.missing.tolist() if hourly.missing is not None else None,
+            'timestamps': self._encode_timestamps(hourly.timestamps),
+        }
+        with open(header_path, 'w', encoding='utf-8') as f:
+            json.dump(header, f, ensure_ascii=False)
+        self._print(f"✓ Kolonsal dosya yazıldı: {header_path} ({values.shape[0]} saat × "
+                    f"{values.shape[1]} birim, {np.dtype(dtype).name})")
+        return header_path
+
+    @staticmethod
+    def _encode_timestamps(stamps: Optional[pd.DatetimeIndex]) -> Any:
+        """Düzenli zaman damgaları başlangıç + adım, düzensizler epoch listesi olarak."""
+        if stamps is None:
+            return None
+        if len(stamps) and not stamps.isna().any():
+            epochs = stamps.to_numpy().astype('datetime64[s]').astype(np.int64)
+            steps = np.diff(epochs)
+            if len(steps) == 0 or (steps == steps[0]).all():
+                step = int(steps[0]) if len(steps) else 3600
+                return {'start': int(epochs[0]), 'step': step, 'count': len(epochs)}
+        return [None if pd.isna(t) else int(t.value // 10**9) for t in stamps]
+
+    @staticmethod
+    def _decode_timestamps(encoded: Any) -> Optional[pd.DatetimeIndex]:
+        if encoded is None:
+            return None
+        if isinstance(encoded, dict):
+            epochs = encoded['start'] + encoded['step'] * np.arange(encoded['count'], dtype=np.int64)
+            return pd.DatetimeIndex(pd.to_datetime(epochs, unit='s'))
+        return pd.DatetimeIndex(pd.to_datetime(
+            [np.nan if e is None else e for e in encoded], unit='s'))
+
+    def _read_columnar_header(self, file_path: Union[str, Path]) -> Dict[str, Any]:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            header = json.load(f)
+        if header.get('version') != _COLUMNAR_VERSION:
+            raise ValueError(f"Desteklenmeyen kolonsal dosya sürümü: {header.get('version')}")
+        return header
+
+    def open_columnar(self, file_path: Union[str, Path]) -> PPDHourly:
+        """Kolonsal PPD dosyasını kopyasız, bellek eşlemesiyle açar.
+
+        Matris salt okunur `np.memmap`'tir; sayfalar ancak ilgili sütunlar
+        kullanıldığında diskten okunur.
+        """
+        header = self._read_columnar_header(file_path)
+        with self._stage('kolonsal_okuma', header['rows'], len(header['columns'])):
+            values = np.load(Path(file_path).with_name(header['values']), mmap_mode='r')
+            timestamps = self._decode_timestamps(header['timestamps'])
+        units = header['columns']
+        names, keys, types, indicator = self._group_units(units)
+        # eski kolonsal dosyalarda eksik hücre sayısı yok
+        missing = header.get('missing')
+        if missing is not None:
+            missing = np.asarray(missing, dtype=np.int64)
+        self._print(f"{values.shape[0]} saat × {values.shape[1]} birim eşlendi: {file_path}")
+        return PPDHourly(values, timestamps, units, names, keys, types, indicator,
+                         header['exact'], missing)
+
+    def frame_from_hourly(self, hourly: PPDHourly, start: Any = None,
+                          end: Any = None) -> PPDResult:
+        """Saatlik matristen `parse_ppd_file` ile aynı rapor tablosunu üretir.
+
+        `start`/`end` verilirse rapor yalnızca [start, end) aralığını kapsar.
+        """
+        return self._build_result(hourly.unit_totals(start, end))
+
+    def frame_from_store(self, store: Any, start: Any = None, end: Any = None) -> PPDResult:
+        """[start, end) aralığının rapor tablosunu SQLite deposundan üretir.
+
+        `store` bir `klima_store.PPDStore`'dur; CSV dosyası okunmaz.
+        """
+        return self._build_result(store.unit_totals(start, end))
+
+    def _build_result(self, totals: pd.Series) -> PPDResult:
+        """Sütun bazlı Wh toplamlarından rapor tablosunu (`PPDResult`) oluşturur."""
+        with self._stage('gruplama', len(totals)):
+            result = self._group_totals(totals)
+        self._print(f"{len(result)} kayıt hazır")
+        return result
+
+    def _group_totals(self, totals: pd.Series) -> PPDResult:
+        # sonuç tablosunu oluştur: suit birimleri numaraya göre toplanır, ortaklar ayrı
+        names, keys, types, members = self._unit_groups(list(totals.index))
+        values = totals.to_numpy()
+        wh = self._group_sum(values, members)
+        kwh = self._group_sum(values / 1000, members)
+        return self.apply_numara_mapping(PPDResult(names, keys, types, wh, kwh))
+
+    @staticmethod
+    def _group_sum(values: np.ndarray, members: List[List[int]]) -> np.ndarray:
+        """Her grubun üyelerini dosya sırasıyla toplar.
+
+        Ondalık değerler pandas `groupby().sum()` gibi Kahan telafisiyle
+        toplanır; böylece rapor önceki sürümlerle bit düzeyinde aynı kalır.
+        """
+        width = max((len(m) for m in members), default=0)
+        # (daire × üye) birim indeksleri; eksik üyeler -1
+        index = np.full((len(members), width), -1, dtype=np.intp)
+        for row, unit_idx in enumerate(members):
+            index[row, :len(unit_idx)] = unit_idx
+        if values.dtype.kind in 'iu':
+            return np.where(index >= 0, values[index], 0).sum(axis=1) if width else values[:0]
+        total = np.zeros(len(members))
+        compensation = np.zeros(len(members))
+        for col in range(width):
+            present = index[:, col] >= 0
+            y = values[index[present, col]] - compensation[present]
+            t = total[present] + y
+            comp = t - total[present] - y
+            # +/- sonsuz değerlerde telafi NaN olur; sonuç sonsuz kalsın
+            comp[np.isnan(comp)] = 0
+            compensation[present] = comp
+            total[present] = t
+        return total
 
-        print(f"{len(df)} kayıt hazır")
-        return df
-    
     def extract_daire_number(self, daire_name):
-        """Daire adından numarası çıkar"""
-        daire_name = daire_name.strip().upper()
-        
-        if 'LOBI' in daire_name:
-            return 'LOBI'
-        if 'YONETIM' in daire_name:
-            return 'YONETIM'
-        if 'FITNESS' in daire_name:
-            return 'FITNESS'
-        if 'MUTFAK' in daire_name or 'P.O' in daire_name or 'BAYBAYAN' in daire_name:
-            return 'ORTAK'
-        
-        match = re.search(r'(\d+)', daire_name)
-        if match:
-            return int(match.group(1))
-        
-        return daire_name
+        """Daire adından numarası çıkar
+
+        Ortak alanlar profildeki anahtarı (LOBI, ORTAK, ...) alır; diğerleri
+        addaki ilk sayıyı, sayı yoksa büyük harfli adı.
+        """
+        return self.site_profile.classify(daire_name).key
     
     def get_daire_type(self, daire_name):
-        """Daire tipi belirle"""
-        daire_name = daire_name.strip().upper()
-        
-        if any(x in daire_name for x in ['LOBI', 'YONETIM', 'FITNESS', 'MUTFAK', 'P.O', 'BAYBAYAN', 'RES']):
-            return 'ORTAK'
-        
-        return 'SÜİT'
+        """Daire tipi belirle (profildeki ortak alan kelimesi geçiyorsa ORTAK)"""
+        return self.site_profile.classify(daire_name).type
     
-    def create_summary(self, df):
+    def create_summary(self, result):
         """İstatistikler oluştur"""
-        summary = {
-            'Toplam Alan': len(df),
-            'Genel Aylık Toplam (kWh)': df['AYLIK_TUKETIM_KWH'].sum(),
-            'Ortalama (kWh)': df['AYLIK_TUKETIM_KWH'].mean(),
-            'En Yüksek (kWh)': df['AYLIK_TUKETIM_KWH'].max(),
-            'En Düşük (kWh)': df['AYLIK_TUKETIM_KWH'].min(),
-        }
-        
-        for dtype in df['TİP'].unique():
-            subset = df[df['TİP'] == dtype]
-            summary[f'{dtype} - Toplam (kWh)'] = subset['AYLIK_TUKETIM_KWH'].sum()
-            summary[f'{dtype} - Sayı'] = len(subset)
+        result = PPDResult.coerce(result)
+        kwh = result.kwh
+        with self._stage('ozet', len(result)):
+            summary = {
+                'Toplam Alan': len(result),
+                'Genel Aylık Toplam (kWh)': kwh.sum(),
+                'Ortalama (kWh)': kwh.mean(),
+                'En Yüksek (kWh)': kwh.max(),
+                'En Düşük (kWh)': kwh.min(),
+            }
+            
+            types = np.array(result.types, dtype=object)
+            for dtype in dict.fromkeys(result.types):
+                mask = types == dtype
+                summary[f'{dtype} - Toplam (kWh)'] = kwh[mask].sum()
+                summary[f'{dtype} - Sayı'] = int(mask.sum())
         
         return summary
     
-    def export_results(self, df, summary, month_year, output_dir=None):
+    def sort_by_daire_sirasi(self, result: PPDResult) -> PPDResult:
+        """Satırları `daire_sirasi` düzenine göre tek seferde sıralar.
+
+        Sırada olan daireler önce (sıradaki konumlarına göre), sırada
+        olmayanlar (ORTAK alanlar vb.) isme göre sıralanıp sona eklenir.
+        """
+        result = PPDResult.coerce(result)
+        ranks = [self.daire_rank.get(key) for key in result.keys]
+        in_order = sorted((row for row, rank in enumerate(ranks) if rank is not None),
+                          key=ranks.__getitem__)
+        # Kalanları (sırada olmayan - ORTAK alanlar) isme göre sırala
+        remaining = sorted((row for row, rank in enumerate(ranks) if rank is None),
+                           key=result.names.__getitem__)
+        return result.take(in_order + remaining)
+
+    def export_results(self, result, summary, month_year, output_dir=None, anomalies=None,
+                       costs=None):
         """CSV ve Excel'e kaydet
 
+        result: `parse_ppd_file` sonucu (`PPDResult`; DataFrame de kabul edilir)
         output_dir: Kullanıcı tarafından seçilen klasör (varsayılan olarak çalışma dizini)
+        anomalies: `detect_anomalies` tablosu; verilirse Excel'e "Anomaliler" sayfası eklenir
+        costs: `Tariff.bill` tablosu; verilirse tutar sütunu ve "Tarife" sayfası eklenir
         """
+        result = PPDResult.coerce(result)
         # Daire sırasını uygula
         if len(self.daire_sirasi) > 0:
-            # Daire sırasına göre sort et (sadece integer daireler)
-            df_sorted = pd.DataFrame()
-            for daire_no in self.daire_sirasi:
-                daire_match = df[df['DAİRE_NO'] == daire_no]
-                if len(daire_match) > 0:
-                    df_sorted = pd.concat([df_sorted, daire_match], ignore_index=True)
-            
-            # Kalanları (sırada olmayan - ORTAK alanlar) sonuna ekle
-            used_daires = set(self.daire_sirasi)
-            df_remaining = df[~df['DAİRE_NO'].isin(used_daires)]
-            # ORTAK alanları isme göre sırala
-            if len(df_remaining) > 0:
-                df_remaining = df_remaining.sort_values('DAİRE_ADI').reset_index(drop=True)
-            df = pd.concat([df_sorted, df_remaining], ignore_index=True)
+            with self._stage('siralama', len(result)):
+                result = self.sort_by_daire_sirasi(result)
         
         # Dosya adı - sabit olarak ısıtma_sogutma (Türkçe karakterler yerine ascii)
         csv_name = "ısıtma_sogutma.csv"
@@ -226,248 +1243,234 @@ class PPDRawParser:
             csv_file = csv_name
             xlsx_file = xlsx_name
         
-        # CSV
-        print(f"\n💾 CSV kaydediliyor: {csv_file}")
-        with open(csv_file, 'w', encoding='utf-8-sig') as f:
-            f.write("FOLKART BLU ÇEŞME YÖNETİMİ\n")
-            f.write("ISITMA/SOĞUTMA RAPORU\n\n")
-        
         # Sadece DAİRE_ADI, TİP, TÜKETİM WH/KWH sütunlarını dahil et
         # (DAİRE_NO ve ESKİ_NUMARA kullanıcı tarafından istenmiyor)
-        df_export = df[['DAİRE_ADI', 'TİP', 'AYLIK_TUKETIM_WH', 'AYLIK_TUKETIM_KWH']]
-        
-        df_export.to_csv(csv_file, mode='a', index=False, encoding='utf-8-sig')
+        export: Dict[str, List[Any]] = {
+            'DAİRE_ADI': result.names,
+            'TİP': result.types,
+            'AYLIK_TUKETIM_WH': result.wh.tolist(),
+            'AYLIK_TUKETIM_KWH': result.kwh.tolist(),
+        }
+        if costs is not None:
+            cost_map = dict(zip(costs['DAİRE_ADI'], costs[COST_COLUMN]))
+            export[COST_COLUMN] = [cost_map.get(name, np.nan) for name in result.names]
+        shape = (len(result), len(export))
         
-        with open(csv_file, 'a', encoding='utf-8-sig') as f:
-            f.write("\n\nÖZET İSTATİSTİKLERİ\n")
-            for key, value in summary.items():
-                if isinstance(value, float):
-                    f.write(f"{key};{value:.2f}\n")
-                else:
-                    f.write(f"{key};{value}\n")
+        # CSV (DataFrame sadece pandas'ın CSV biçimlendirmesi için kurulur)
+        self._print(f"\n💾 CSV kaydediliyor: {csv_file}")
+        with self._stage('csv_kayit', *shape):
+            with open(csv_file, 'w', encoding='utf-8-sig') as f:
+                f.write("FOLKART BLU ÇEŞME YÖNETİMİ\n")
+                f.write("ISITMA/SOĞUTMA RAPORU\n\n")
+            
+            pd.DataFrame(export).to_csv(csv_file, mode='a', index=False, encoding='utf-8-sig')
+            
+            with open(csv_file, 'a', encoding='utf-8-sig') as f:
+                f.write("\n\nÖZET İSTATİSTİKLERİ\n")
+                for key, value in summary.items():
+                    if isinstance(value, float):
+                        f.write(f"{key};{value:.2f}\n")
+                    else:
+                        f.write(f"{key};{value}\n")
         
         # Excel
-        print(f"💾 Excel kaydediliyor: {xlsx_file}")
+        self._print(f"💾 Excel kaydediliyor: {xlsx_file}")
+        with self._stage('xlsx_kayit', *shape):
+            self._write_results_xlsx(xlsx_file, result, export, summary, anomalies, costs)
         
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Tüketim"
+        self._print(f"\n✅ TAMAMLANDI!")
+        self._print(f"   • {csv_file}")
+        self._print(f"   • {xlsx_file}")
         
-        title_fill = PatternFill(start_color="1F4E78", end_color="1F4E78", fill_type="solid")
-        title_font = Font(color="FFFFFF", bold=True, size=14)
-        header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-        header_font = Font(color="FFFFFF", bold=True, size=11)
-        border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
+        return csv_file, xlsx_file
+
+    def _write_results_xlsx(self, xlsx_file: str, result: PPDResult,
+                            export: Dict[str, List[Any]], summary: Dict[str, Any],
+                            anomalies: Optional[pd.DataFrame] = None,
+                            costs: Optional[pd.DataFrame] = None) -> None:
+        """Standart raporun Excel sayfasını (ve varsa anomali/tarife sayfalarını) yazar."""
+        # Kolon genişlikleri (4 kolon, tarife varsa tutar ile 5)
+        widths = [20, 12, 18, 18] + ([16] if costs is not None else [])
+        writer = ReportSheetWriter("Tüketim", widths=widths)
         
-        row = 1
         # Başlık satırlarındaki sütun sayısını ayarla
-        col_count = 6 if 'ESKİ_NUMARA' in df.columns else 5
-        ws.merge_cells(f'A{row}:{"ABCDEF"[col_count-1]}{row}')
-        cell = ws[f'A{row}']
-        cell.value = "FOLKART BLU ÇEŞME YÖNETİMİ"
-        cell.font = title_font
-        cell.fill = title_fill
-        cell.alignment = Alignment(horizontal="center", vertical="center")
-        ws.row_dimensions[row].height = 25
-        row += 1
-        
-        ws.merge_cells(f'A{row}:{"ABCDEF"[col_count-1]}{row}')
-        cell = ws[f'A{row}']
-        cell.value = "ISITMA/SOĞUTMA RAPORU"
-        cell.font = Font(color="FFFFFF", bold=True, size=12)
-        cell.fill = title_fill
-        cell.alignment = Alignment(horizontal="center", vertical="center")
-        row += 2
+        col_count = 6 if result.eski is not None else 5
+        writer.title("FOLKART BLU ÇEŞME YÖNETİMİ", col_count, 'baslik_14', height=25)
+        writer.title("ISITMA/SOĞUTMA RAPORU", col_count, 'baslik_12')
+        writer.blank()
         
         # Başlık satırı (sadece ad, tip ve tüketim)
         headers = ['DAİRE ADI', 'TİP', 'TÜKETİM (Wh)', 'TÜKETİM (kWh)']
+        styles = ['hucre', 'hucre_orta', 'hucre_tamsayi', 'hucre_ondalik']
+        if costs is not None:
+            headers.append(f'TUTAR ({CURRENCY})')
+            styles.append('hucre_ondalik')
+        writer.append(headers, ['tablo_baslik_11'] * len(headers))
         
-        for col_idx, header in enumerate(headers, 1):
-            cell = ws.cell(row=row, column=col_idx)
-            cell.value = header
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal="center", vertical="center")
-            cell.border = border
-        
-        row += 1
-        
-        # Veri satırları
-        for _, data_row in df.iterrows():
-            col = 1
-            ws.cell(row=row, column=col).value = data_row['DAİRE_ADI']
-            ws.cell(row=row, column=col).border = border
-            col += 1
-            
-            ws.cell(row=row, column=col).value = data_row['TİP']
-            ws.cell(row=row, column=col).border = border
-            ws.cell(row=row, column=col).alignment = Alignment(horizontal="center")
-            col += 1
-            
-            ws.cell(row=row, column=col).value = data_row['AYLIK_TUKETIM_WH']
-            ws.cell(row=row, column=col).border = border
-            ws.cell(row=row, column=col).number_format = '0'
-            ws.cell(row=row, column=col).alignment = Alignment(horizontal="right")
-            col += 1
-            
-            ws.cell(row=row, column=col).value = data_row['AYLIK_TUKETIM_KWH']
-            ws.cell(row=row, column=col).border = border
-            ws.cell(row=row, column=col).number_format = '0.00'
-            ws.cell(row=row, column=col).alignment = Alignment(horizontal="right")
-            
-            row += 1
+        # Veri satırları (sütun dizilerinden)
+        writer.columns(list(export.values()), styles)
         
         # Özet
-        row += 2
-        ws.merge_cells(f'A{row}:{"ABCDEF"[col_count-1]}{row}')
-        cell = ws[f'A{row}']
-        cell.value = "ÖZET İSTATİSTİKLERİ"
-        cell.font = Font(bold=True, size=11, color="FFFFFF")
-        cell.fill = header_fill
-        row += 1
-        
+        writer.blank(2)
+        writer.title("ÖZET İSTATİSTİKLERİ", col_count, 'bolum_baslik')
         for key, value in summary.items():
-            ws.cell(row=row, column=1).value = key
-            ws.cell(row=row, column=1).font = Font(bold=True)
-            ws.cell(row=row, column=1).border = border
-            
-            ws.cell(row=row, column=2).value = value
-            ws.cell(row=row, column=2).border = border
-            if isinstance(value, float):
-                ws.cell(row=row, column=2).number_format = '0.00'
-            ws.cell(row=row, column=2).alignment = Alignment(horizontal="right")
-            
-            row += 1
+            writer.append([key, value], summary_styles(value))
         
-        # Kolon genişlikleri (sadece 4 kolon)
-        ws.column_dimensions['A'].width = 20
-        ws.column_dimensions['B'].width = 12
-        ws.column_dimensions['C'].width = 18
-        ws.column_dimensions['D'].width = 18
+        if costs is not None:
+            self._write_tariff_sheet(writer, result, costs)
+        if anomalies is not None:
+            self._write_anomaly_sheet(writer, anomalies)
         
-        wb.save(xlsx_file)
-        
-        print(f"\n✅ TAMAMLANDI!")
-        print(f"   • {csv_file}")
-        print(f"   • {xlsx_file}")
-        
-        return csv_file, xlsx_file
+        writer.save(xlsx_file)
+
+    @staticmethod
+    def _write_tariff_sheet(writer: ReportSheetWriter, result: PPDResult,
+                            costs: pd.DataFrame) -> None:
+        """Daire başına bant kWh/tutar dökümünü rapor sırasıyla "Tarife" sayfasına yazar."""
+        band_cols = [c for c in costs.columns if c not in ('DAİRE_ADI', 'DAİRE_NO')]
+        writer.sheet("Tarife", widths=[20] + [13] * len(band_cols))
+        col_count = len(band_cols) + 1
+        writer.title("ZAMAN DİLİMLİ TARİFE TUTARLARI", col_count, 'baslik_12', height=22)
+        writer.blank()
+        # `Puant_KWH` -> "Puant (kWh)", `Puant_TL` -> "Puant (TL)", `TUTAR_TL` -> "TOPLAM (TL)"
+        headers = ['DAİRE ADI']
+        for col in band_cols:
+            band, unit = col.rsplit('_', 1)
+            headers.append(f"{'TOPLAM' if col == COST_COLUMN else band} "
+                           f"({'kWh' if unit == 'KWH' else unit})")
+        writer.append(headers, ['tablo_baslik_10'] * len(headers), height=30)
+        ordered = costs.drop_duplicates('DAİRE_ADI').set_index('DAİRE_ADI').reindex(result.names)
+        writer.columns(
+            [result.names] + [ordered[c].tolist() for c in band_cols],
+            ['hucre'] + ['hucre_ondalik'] * len(band_cols),
+        )
+        writer.append(['TOPLAM'] + [float(costs[c].sum()) for c in band_cols],
+                      ['hucre_kalin'] + ['hucre_ondalik'] * len(band_cols))
+
+    @staticmethod
+    def _write_anomaly_sheet(writer: ReportSheetWriter, anomalies: pd.DataFrame) -> None:
+        """Bulgu olan birimleri daire sırasıyla "Anomaliler" sayfasına yazar."""
+        found = anomalies[anomalies['BULGULAR'] != '']
+        writer.sheet("Anomaliler", widths=[14, 14, 9, 10, 10, 12, 10, 12, 10, 10, 9, 70])
+        col_count = len(ANOMALY_COLUMNS)
+        writer.title("SAYAÇ ANOMALİ TARAMASI", col_count, 'baslik_12', height=22)
+        writer.title(f"{len(found)} / {len(anomalies)} birimde bulgu", col_count, 'baslik_11')
+        writer.blank()
+        headers = ['BİRİM', 'DAİRE', 'TİP', 'EKSİK DEĞER', 'NEGATİF DEĞER',
+                   'EN UZUN SIFIR (saat)', 'SIFIR SERİSİ', 'EN UZUN SABİT (saat)',
+                   'SABİT SERİ', 'SIÇRAMA', 'MAKS. Z', 'BULGULAR']
+        writer.append(headers, ['tablo_baslik_10'] * len(headers), height=30)
+        writer.columns(
+            [found[c].tolist() for c in ANOMALY_COLUMNS],
+            ['hucre', 'hucre', 'hucre_orta'] + ['hucre_tamsayi'] * 7 + ['hucre_ondalik', 'hucre'],
+        )
     
     def load_subat_sayac_data(self, excel_file):
-        """Şubat sayaç okumaları Excel dosyasından veri yükle ve formata dönüştür"""
-        print(f"\n📊 Şubat Sayaç Okumaları yükleniyor: {excel_file}")
+        """Şubat sayaç okumaları Excel dosyasından veri yükle ve formata dönüştür
+
+        Çalışma kitabı salt okunur modda satır satır okunur (stiller ve
+        hücre nesneleri yüklenmez). Veriler 10. satırdan başlar:
+        B = eski no, C = yeni no, D = durum, G = tüketim; B ve C'nin boş
+        olduğu ilk satırda sayfa biter. Her bina ayrı bir sayfadaysa tüm
+        sayfalar okunur; aynı yeni numara birden çok sayfada varsa etkin
+        sayfadaki (yoksa ilk görülen) kayıt kullanılır.
+        """
+        self._print(f"\n📊 Şubat Sayaç Okumaları yükleniyor: {excel_file}")
         
         try:
-            wb = load_workbook(excel_file)
-            ws = wb.active
-            
-            # Daire verilerini oku (Satır 10'dan başlıyor)
-            sayac_data = {}
-            for row_idx in range(10, 100):
-                eski_no = ws.cell(row_idx, 2).value
-                yeni_no = ws.cell(row_idx, 3).value
-                durum = ws.cell(row_idx, 4).value
-                tuketim = ws.cell(row_idx, 7).value
-                
-                # Eğer tüm veriler boş ise dur
-                if eski_no is None and yeni_no is None:
-                    break
-                
-                # Yeni numaraya göre depolamak daha iyi
-                if yeni_no is not None:
-                    try:
-                        yeni_no = int(yeni_no) if isinstance(yeni_no, str) else yeni_no
-                        tuketim = float(tuketim) if tuketim else 0
-                        sayac_data[yeni_no] = {
+            wb = load_workbook(excel_file, read_only=True)
+            try:
+                active = wb.active
+                sheets = [active] + [ws for ws in wb.worksheets if ws is not active]
+                sayac_data = {}
+                for ws in sheets:
+                    sheet_data = {}
+                    for eski_no, yeni_no, durum, tuketim in self._iter_sayac_rows(ws):
+                        # Yeni numaraya göre depolamak daha iyi
+                        try:
+                            yeni_no = int(yeni_no) if isinstance(yeni_no, str) else yeni_no
+                            tuketim = float(tuketim) if tuketim else 0
+                        except (TypeError, ValueError):
+                            continue
+                        sheet_data[yeni_no] = {
                             'ESKİ_NO': eski_no,
                             'YENİ_NO': yeni_no,
                             'DURUM': durum,
                             'TUKETIM': tuketim
                         }
-                    except:
-                        pass
+                    for yeni_no, record in sheet_data.items():
+                        sayac_data.setdefault(yeni_no, record)
+            finally:
+                wb.close()
             
-            print(f"✓ {len(sayac_data)} daire verisi yüklendi")
+            self._print(f"✓ {len(sayac_data)} daire verisi yüklendi")
             return sayac_data
         
         except Exception as e:
-            print(f"⚠ Şubat verileri yüklenemedi: {e}")
+            self._print(f"⚠ Şubat verileri yüklenemedi: {e}")
             return {}
+
+    @staticmethod
+    def _iter_sayac_rows(ws: Any) -> Iterator[Tuple[Any, Any, Any, Any]]:
+        """Sayfadaki (eski no, yeni no, durum, tüketim) satırlarını sırayla verir."""
+        # B..G sütunları: 0 = B, 1 = C, 2 = D, 5 = G
+        for row in ws.iter_rows(min_row=_SAYAC_FIRST_ROW, min_col=2, max_col=7,
+                                values_only=True):
+            row = tuple(row) + (None,) * (6 - len(row))
+            eski_no, yeni_no = row[0], row[1]
+            # Eğer tüm veriler boş ise dur
+            if eski_no is None and yeni_no is None:
+                break
+            if yeni_no is not None:
+                yield eski_no, yeni_no, row[2], row[5]
     
-    def export_sayac_format(self, df, sayac_data, month_year):
-        """Sayaç formatında Excel raporu oluştur"""
-        print(f"\n💾 Sayaç Formatı Excel kaydediliyor...")
+    def export_sayac_format(self, result, sayac_data, month_year, output_dir=None, costs=None):
+        """Sayaç formatında Excel raporu oluştur
+
+        result: `parse_ppd_file` sonucu (`PPDResult`; DataFrame de kabul edilir)
+        output_dir: Kayıt klasörü (varsayılan olarak çalışma dizini)
+        costs: `Tariff.bill` tablosu; verilirse PPD tüketiminden hesaplanan tutar sütunu eklenir
+        """
+        self._print(f"\n💾 Sayaç Formatı Excel kaydediliyor...")
+        result = PPDResult.coerce(result)
         
         # "/" karakterini "_" ile değiştir (Windows uyumluluğu)
         safe_filename = month_year.replace(' / ', '_')
         xlsx_file = f"Klima_{safe_filename}_SAYAÇ_OKUMALARI.xlsx"
+        if output_dir:
+            xlsx_file = str(Path(output_dir) / xlsx_file)
         
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Sayaç Okumaları"
-        
-        # Stiller
-        title_fill = PatternFill(start_color="1F4E78", end_color="1F4E78", fill_type="solid")
-        title_font = Font(color="FFFFFF", bold=True, size=14)
-        subtitle_font = Font(color="FFFFFF", bold=True, size=11)
-        header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-        header_font = Font(color="FFFFFF", bold=True, size=10)
-        border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
+        widths = [15, 15, 12, 20, 15, 15, 15] + ([15] if costs is not None else [])
+        writer = ReportSheetWriter("Sayaç Okumaları", widths=widths)
         
         # Başlık
-        row = 1
-        ws.merge_cells(f'A{row}:F{row}')
-        cell = ws[f'A{row}']
-        cell.value = "FOLKART BLU ÇEŞME YÖNETİMİ"
-        cell.font = title_font
-        cell.fill = title_fill
-        cell.alignment = Alignment(horizontal="center", vertical="center")
-        ws.row_dimensions[row].height = 22
-        row += 1
-        
-        ws.merge_cells(f'A{row}:F{row}')
-        cell = ws[f'A{row}']
-        cell.value = month_year
-        cell.font = subtitle_font
-        cell.fill = title_fill
-        cell.alignment = Alignment(horizontal="center", vertical="center")
-        row += 1
-        
-        ws.merge_cells(f'A{row}:F{row}')
-        cell = ws[f'A{row}']
-        cell.value = "ISITMA/SOĞUTMA SAYAÇ TÜKETİMLERİ"
-        cell.font = subtitle_font
-        cell.fill = title_fill
-        cell.alignment = Alignment(horizontal="center", vertical="center")
-        row += 2
+        writer.title("FOLKART BLU ÇEŞME YÖNETİMİ", 6, 'baslik_14', height=22)
+        writer.title(month_year, 6, 'baslik_11')
+        writer.title("ISITMA/SOĞUTMA SAYAÇ TÜKETİMLERİ", 6, 'baslik_11')
+        writer.blank()
         
         # Başlık satırı
         headers = ['ESKİ NUMARASI', 'YENİ NUMARASI', 'DURUM', 'ISITMA/SOĞUTMA', 'İLK OKUMA', 'SON OKUMA', 'TÜKETİM']
-        for col_idx, header in enumerate(headers, 1):
-            cell = ws.cell(row=row, column=col_idx)
-            cell.value = header
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-            cell.border = border
-        
-        ws.row_dimensions[row].height = 25
-        row += 1
+        if costs is not None:
+            headers.append(f'TUTAR ({CURRENCY})')
+        writer.append(headers, ['tablo_baslik_10'] * len(headers), height=25)
         
         # Veri satırları - daire sırasına göre yerleştir
         # Sırası olan daireleri önce göster
         daire_order = self.daire_sirasi if len(self.daire_sirasi) > 0 else sorted(sayac_data.keys())
         
+        # PPD tüketimleri: daire numarası -> ilk satır indeksi (ilk eşleşme geçerli)
+        ppd_kwh = result.kwh.tolist()
+        daire_cost: Dict[Any, float] = {}
+        if costs is not None and len(costs) > 0:
+            first = costs.drop_duplicates('DAİRE_NO')
+            daire_cost = dict(zip(first['DAİRE_NO'], first[COST_COLUMN]))
+        
+        eski_col: List[Any] = []
+        yeni_col: List[Any] = []
+        durum_col: List[Any] = []
+        tuketim_col: List[Any] = []
+        tutar_col: List[Any] = []
         for daire_no in daire_order:
             if daire_no not in sayac_data:
                 continue
@@ -475,56 +1478,154 @@ class PPDRawParser:
             sayac = sayac_data[daire_no]
             
             # PPD'den gelen tüketimi bul
-            tuketim_kw = 0
-            if len(df) > 0:
-                # DAİRE_NO ile eşleştir
-                daire_match = df[df['DAİRE_NO'] == daire_no]
-                if len(daire_match) > 0:
-                    tuketim_kw = daire_match.iloc[0]['AYLIK_TUKETIM_KWH']
+            row = result.index.get(daire_no)
+            tuketim_kw = ppd_kwh[row] if row is not None else 0
             
             # Sayaç formatında kullan, eğer yoksa PPD verisi kullan
             tuketim_val = sayac.get('TUKETIM', tuketim_kw)
             
-            ws.cell(row=row, column=1).value = sayac['ESKİ_NO']
-            ws.cell(row=row, column=1).border = border
-            ws.cell(row=row, column=1).alignment = Alignment(horizontal="center")
-            
-            ws.cell(row=row, column=2).value = sayac['YENİ_NO']
-            ws.cell(row=row, column=2).border = border
-            ws.cell(row=row, column=2).alignment = Alignment(horizontal="center")
-            
-            ws.cell(row=row, column=3).value = sayac['DURUM']
-            ws.cell(row=row, column=3).border = border
-            ws.cell(row=row, column=3).alignment = Alignment(horizontal="center")
-            
-            ws.cell(row=row, column=4).value = ""  # ISITMA/SOĞUTMA etiketi boş
-            ws.cell(row=row, column=4).border = border
-            
-            ws.cell(row=row, column=5).value = ""  # İLK OKUMA
-            ws.cell(row=row, column=5).border = border
-            ws.cell(row=row, column=5).alignment = Alignment(horizontal="right")
-            
-            ws.cell(row=row, column=6).value = ""  # SON OKUMA
-            ws.cell(row=row, column=6).border = border
-            ws.cell(row=row, column=6).alignment = Alignment(horizontal="right")
-            
-            ws.cell(row=row, column=7).value = tuketim_val if tuketim_val else ""
-            ws.cell(row=row, column=7).border = border
-            ws.cell(row=row, column=7).number_format = '0.00'
-            ws.cell(row=row, column=7).alignment = Alignment(horizontal="right")
-            
-            row += 1
+            eski_col.append(sayac['ESKİ_NO'])
+            yeni_col.append(sayac['YENİ_NO'])
+            durum_col.append(sayac['DURUM'])
+            tuketim_col.append(tuketim_val if tuketim_val else "")
+            tutar_col.append(daire_cost.get(daire_no, ""))
         
-        # Genişlikleri ayarla
-        ws.column_dimensions['A'].width = 15
-        ws.column_dimensions['B'].width = 15
-        ws.column_dimensions['C'].width = 12
-        ws.column_dimensions['D'].width = 20
-        ws.column_dimensions['E'].width = 15
-        ws.column_dimensions['F'].width = 15
-        ws.column_dimensions['G'].width = 15
+        # ISITMA/SOĞUTMA etiketi, İLK OKUMA ve SON OKUMA boş
+        empty_col = [""] * len(eski_col)
+        columns = [eski_col, yeni_col, durum_col, empty_col, empty_col, empty_col, tuketim_col]
+        styles = ['hucre_orta', 'hucre_orta', 'hucre_orta', 'hucre', 'hucre_sag', 'hucre_sag', 'hucre_ondalik']
+        if costs is not None:
+            columns.append(tutar_col)
+            styles.append('hucre_ondalik')
+        writer.columns(columns, styles)
         
-        wb.save(xlsx_file)
-        print(f"✓ Sayaç formatı: {xlsx_file}")
+        writer.save(xlsx_file)
+        self._print(f"✓ Sayaç formatı: {xlsx_file}")
         
         return xlsx_file
+
+    def run_reports(self, file_path: Union[str, Path, Sequence[Union[str, Path]]],
+                    reports: Sequence[str] = REPORT_KINDS,
+                    output_dir: Optional[Union[str, Path]] = None,
+                    sayac_file: Optional[Union[str, Path]] = None,
+                    numara_file: Optional[Union[str, Path]] = None,
+                    month_year: Optional[str] = None,
+                    use_cache: bool = True,
+                    anomalies: bool = False,
+                    tariff: Optional[Union[str, Path, Tariff]] = None,
+                    rollup: bool = False, start: Any = None,
+                    end: Any = None,
+                    cancel: Optional[Callable[[], None]] = None,
+                    force_hourly: bool = False) -> Dict[str, Any]:
+        """PPD dosyasını bir kez parse edip seçilen raporların hepsini üretir.
+
+        * Sayaç çalışma kitabı ve numara eşleşmesi parse ile eşzamanlı
+          olarak arka planda yüklenir.
+        * `export_results` ve `export_sayac_format` aynı `PPDResult` üzerinde
+          iş parçacığı havuzunda birlikte çalışır.
+        * `anomalies` ise dosya saatlik matris olarak okunur (parse önbelleği
+          kullanılmaz), sayaç anomalileri taranır ve standart raporun
+          Excel'ine "Anomaliler" sayfası eklenir.
+        * `tariff` (tarife dosyası veya `Tariff`) verilirse dosya yine
+          saatlik okunur; daire tutarları her iki rapora ve özete eklenir.
+        * `rollup` ise dosya yine saatlik okunur; dönemsel toplam küpü
+          (`RollupCube`) raporun yanına `ısıtma_sogutma_kup.npz` olarak yazılır.
+        * `file_path` birden fazla dosyanın listesiyse dosyalar
+          `merge_hourly` ile tek zaman çizelgesinde birleştirilir (örtüşen
+          saatlerde en son dosya geçerli) ve tek rapor üretilir.
+        * `start`/`end` verilirse rapor ve diğer çıktılar yalnızca
+          [start, end) aralığını kapsar.
+        * Birleştirmede veya tarih aralığında `month_year` verilmezse
+          etiket, kapsanan ilk saatin ay ve yılıdır.
+        * `force_hourly` ise başka bir seçenek gerektirmese de dosya saatlik
+          okunur ve `hourly` döner (ör. tek dosyalı birleştirme).
+        * `cancel` verilirse parse ile dışa aktarımlar arasında ve her
+          çıktı başlatılmadan önce çağrılır; `ReportCancelled` atarsa
+          henüz başlamamış çıktılar yazılmaz.
+
+        Dönüş: `result`, `summary`, `month_year`, `anomalies`, `costs`,
+        `cube` (istenmediyse `None`), saatlik okunduysa `hourly` matrisi
+        (`PPDHourly`, yoksa `None`) ve rapor türü -> dosya yolları listesi
+        olan `outputs`.
+        """
+        reports = list(dict.fromkeys(reports))
+        unknown = [r for r in reports if r not in REPORT_KINDS]
+        if unknown:
+            raise ValueError(f"Bilinmeyen rapor türü: {', '.join(unknown)}")
+        if REPORT_SAYAC in reports and not sayac_file:
+            raise ValueError("Sayaç raporu için sayaç okumaları dosyası gerekli")
+        files = [file_path] if isinstance(file_path, (str, Path)) else list(file_path)
+        merged = len(files) > 1
+        windowed = start is not None or end is not None
+        if not (merged or windowed):
+            month_year = month_year or self.detect_month_year(files[0])
+        if tariff is not None and not isinstance(tariff, Tariff):
+            tariff = Tariff.load(tariff)
+
+        with ThreadPoolExecutor(max_workers=3, thread_name_prefix='klima-rapor') as pool:
+            sayac_future = (pool.submit(self.load_subat_sayac_data, sayac_file)
+                            if REPORT_SAYAC in reports else None)
+            numara_future = (pool.submit(self.read_numara_mapping, numara_file)
+                             if numara_file else None)
+
+            anomaly_table = None
+            costs = None
+            cube = None
+            hourly = None
+            if anomalies or tariff is not None or rollup or merged or windowed or force_hourly:
+                hourly = self.merge_hourly(files) if merged else self.parse_ppd_hourly(files[0])
+                if windowed:
+                    hourly = hourly.window(start, end)
+                if not month_year:
+                    first = hourly.timestamps[0] if hourly.timestamps is not None else None
+                    month_year = (f"{first.month}_{first.year}" if first is not None
+                                  else self.detect_month_year(files[0]))
+                result = self.frame_from_hourly(hourly)
+                if anomalies:
+                    with self._stage('anomali', hourly.hours, len(hourly.units)):
+                        anomaly_table = detect_anomalies(hourly)
+                if tariff is not None:
+                    with self._stage('tarife', hourly.hours, len(hourly.units)):
+                        costs = tariff.bill(hourly)
+                if rollup:
+                    with self._stage('kup', hourly.hours, len(hourly.units)):
+                        cube = RollupCube.build(hourly, ' + '.join(Path(f).name for f in files))
+                    if cube.skipped:
+                        self._print(f"⚠ Zamanı çözülemeyen {cube.skipped} saat dönemsel küpe alınmadı")
+            else:
+                result = self.parse_ppd_file(files[0], use_cache=use_cache)
+            if numara_future is not None:
+                try:
+                    self.numara_mapping.update(numara_future.result())
+                    self._print(f"{len(self.numara_mapping)} numaralama eşleşmesi yüklendi")
+                    self.apply_numara_mapping(result)
+                except Exception as e:
+                    self._print(f"Numara mapping yüklenemedi: {e}")
+            summary = self.create_summary(result)
+            if costs is not None:
+                summary.update(tariff.summary(costs))
+
+            checkpoint = cancel or (lambda: None)
+            jobs = {}
+            if REPORT_STANDARD in reports:
+                checkpoint()
+                jobs[REPORT_STANDARD] = pool.submit(
+                    self.export_results, result, summary, month_year, output_dir, anomaly_table,
+                    costs)
+            if sayac_future is not None:
+                checkpoint()
+                jobs[REPORT_SAYAC] = pool.submit(
+                    self.export_sayac_format, result, sayac_future.result(),
+                    month_year.replace('_', ' / '), output_dir, costs)
+            if cube is not None:
+                checkpoint()
+                cube_file = Path(output_dir or '.') / CUBE_FILE_NAME
+                jobs[OUTPUT_CUBE] = pool.submit(lambda: str(cube.save(cube_file)))
+            outputs: Dict[str, List[str]] = {}
+            for kind, job in jobs.items():
+                paths = job.result()
+                outputs[kind] = list(paths) if isinstance(paths, tuple) else [paths]
+
+        return {'result': result, 'summary': summary, 'month_year': month_year,
+                'anomalies': anomaly_table, 'costs': costs, 'cube': cube, 'hourly': hourly,
+                'outputs': outputs}
@@ -3,22 +3,47 @@
 """
 Klima Aylık Tüketim Raporu - Professional GUI v3
 Folkart Blu Çeşme Yönetimi İçin
+
+Pencere, pandas/numpy/openpyxl yüklenmeden açılır: veri işleme modülleri
+pencere çizildikten sonra arka plan iş parçacığında yüklenir. Kullanıcı
+dosya seçerken yükleme biter; bitmeden "Rapor Oluştur"a basılırsa işlem
+yüklemeyi bekler.
 """
 
 import tkinter as tk
 from tkinter import filedialog, messagebox, scrolledtext, ttk
 import threading
+import queue
 from pathlib import Path
 import sys
 import os
+import json
+import time
 from datetime import datetime
-from typing import Optional
-
-import pandas as pd
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
 
 # ana modülü çalışma dizinine ekle (paket yapısında gerek kalmayacak)
 sys.path.insert(0, os.path.dirname(__file__))
-from klima_final import PPDRawParser
+from klima_metrics import METRICS_FILE_NAME, STARTUP_PROBE_ENV, StageMetrics
+
+if TYPE_CHECKING:
+    from klima_final import PPDRawParser, PPDResult
+    from klima_chart import ProfileChart, ProfileSource
+    from klima_preview import TableModel, VirtualTable
+
+# Arka plan mesajlarının arayüze aktarılma aralığı (ms) ve tur başına en fazla mesaj
+_PUMP_INTERVAL_MS = 50
+_PUMP_MAX_ITEMS = 1000
+
+# İlerleme çubuğunda PPD okumasına ayrılan pay (%); kalanı rapor kaydı içindir
+_PARSE_SHARE = 90.0
+
+# Veri önizleme görünümleri ve süzgeç yazımı bitince tabloyu güncelleme gecikmesi (ms)
+_PREVIEW_DAIRE = 'daire'
+_PREVIEW_HOURLY = 'saat'
+_PREVIEW_ALL_TYPES = "Tümü"
+_PREVIEW_FILTER_DELAY_MS = 200
+
 
 class KlimaGUI:
     def __init__(self, root):
@@ -57,12 +82,74 @@ class KlimaGUI:
         
         self.root.configure(bg=self.bg_color)
         
-        self.parser = PPDRawParser()
+        # parser arka planda oluşturulur (`_load_backend`)
+        self.parser: Optional["PPDRawParser"] = None
+        self._backend_ready = threading.Event()
         self.selected_file: Optional[str] = None
-        self.ppd_df: Optional[pd.DataFrame] = None
+        self.ppd_result: Optional["PPDResult"] = None
         self.output_dir: Optional[str] = None  # kullanıcı seçimiyle belirlenecek klasör
+        self.sayac_file: Optional[str] = None  # sayaç raporu için okuma çalışma kitabı
+        self.tariff_file: Optional[str] = None  # tutar hesabı için tarife CSV'si
+        
+        # Arka plan iş parçacığı arayüze doğrudan dokunmaz; (tür, veri) mesajları
+        # bu kuyruğa yazılır ve ana iş parçacığında `_pump_ui_queue` ile uygulanır
+        self._ui_queue: "queue.Queue[Tuple[str, Any]]" = queue.Queue()
+        self._cancel_event = threading.Event()
+        
+        # Veri önizleme: tablo ilk rapordan sonra kurulur (numpy yüklü olmalı)
+        self.preview_table: Optional["VirtualTable"] = None
+        self.preview_models: Dict[str, "TableModel"] = {}  # görünüm -> model
+        self.preview_file: Optional[str] = None  # önizlenen sonucun PPD dosyası
+        # Saatlik profil grafiği: seriler saatlik matristen seçildikçe üretilir
+        self.profile_chart: Optional["ProfileChart"] = None
+        self.profile_source: Optional["ProfileSource"] = None
+        self._preview_filter_job: Optional[str] = None
+        self._processing = False
+        self._hourly_loading = False
         
         self.create_ui()
+        self.root.after(_PUMP_INTERVAL_MS, self._pump_ui_queue)
+        # ağır modüller pencere çizildikten sonra yüklenir
+        self.root.after_idle(
+            lambda: threading.Thread(target=self._load_backend, daemon=True).start())
+    
+    def _load_backend(self) -> None:
+        """Veri işleme modüllerini (pandas, numpy, openpyxl) yükler ve parser'ı kurar."""
+        try:
+            from klima_final import PPDRawParser
+            import klima_anomaly  # noqa: F401  (rapor sonunda gerekir)
+            self.parser = PPDRawParser()
+        except Exception as e:
+            self.log(f"[ERROR] Veri işleme modülleri yüklenemedi: {e}\n")
+            if isinstance(e, ImportError):
+                self.log("Lütfen şu komutu çalıştırın: pip install pandas openpyxl\n")
+            self.set_status("Hata!", "#cc0000")
+        finally:
+            self._backend_ready.set()
+    
+    def startup_probe(self, path: str) -> None:
+        """Başlangıç ölçümü (`klima_bench.py --startup`).
+
+        Pencere çizildiğinde ve modüller yüklendiğinde zamanı (epoch sn)
+        `path`'e JSON olarak yazar ve programı kapatır.
+        """
+        marks = {}
+        
+        def wait_backend() -> None:
+            if not self._backend_ready.is_set():
+                self.root.after(10, wait_backend)
+                return
+            marks['backend'] = time.time()
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(marks, f)
+            self.root.destroy()
+        
+        def window_shown() -> None:
+            self.root.update_idletasks()
+            marks['window'] = time.time()
+            wait_backend()
+        
+        self.root.after_idle(window_shown)
     
     def create_ui(self):
         """Modern UI oluştur"""
@@ -75,7 +162,18 @@ class KlimaGUI:
         self.notebook.add(self.tab_main, text="Rapor Oluştur")
         self.create_main_tab()
         
-        # Tab 2: Hakkında
+        # Tab 2: Veri Önizleme
+        self.tab_preview = ttk.Frame(self.notebook)
+        self.notebook.add(self.tab_preview, text="Veri Önizleme")
+        self.create_preview_tab()
+        
+        # Tab 3: Saatlik Profil
+        self.tab_chart = ttk.Frame(self.notebook)
+        self.notebook.add(self.tab_chart, text="Saatlik Profil")
+        self.create_chart_tab()
+        self.notebook.bind("<<NotebookTabChanged>>", lambda _: self._on_tab_changed())
+        
+        # Tab 4: Hakkında
         self.tab_about = ttk.Frame(self.notebook)
         self.notebook.add(self.tab_about, text="Hakkında")
         self.create_about_tab()
@@ -108,6 +206,25 @@ class KlimaGUI:
         process_frame = ttk.LabelFrame(main_frame, text="2. İşlem", padding=15)
         process_frame.pack(fill="x", pady=10)
         
+        # Üretilecek raporlar (PPD bir kez okunur, seçilenlerin hepsi yazılır)
+        report_frame = ttk.Frame(process_frame)
+        report_frame.pack(fill="x")
+        self.var_standard = tk.BooleanVar(value=True)
+        self.var_sayac = tk.BooleanVar(value=False)
+        ttk.Checkbutton(report_frame, text="Standart rapor (CSV + Excel)",
+                        variable=self.var_standard).pack(side="left", padx=5)
+        ttk.Checkbutton(report_frame, text="Sayaç formatı (Excel)",
+                        variable=self.var_sayac).pack(side="left", padx=5)
+        self.var_anomaly = tk.BooleanVar(value=False)
+        ttk.Checkbutton(report_frame, text="Sayaç anomali taraması",
+                        variable=self.var_anomaly).pack(side="left", padx=5)
+        self.var_tariff = tk.BooleanVar(value=False)
+        ttk.Checkbutton(report_frame, text="Tarife ile tutar",
+                        variable=self.var_tariff).pack(side="left", padx=5)
+        self.var_rollup = tk.BooleanVar(value=False)
+        ttk.Checkbutton(report_frame, text="Dönemsel döküm",
+                        variable=self.var_rollup).pack(side="left", padx=5)
+        
         btn_frame = ttk.Frame(process_frame)
         btn_frame.pack(fill="x", pady=10)
         
@@ -115,6 +232,10 @@ class KlimaGUI:
                                        command=self.process_file, state="disabled")
         self.btn_process.pack(side="left", padx=5)
         
+        self.btn_cancel = ttk.Button(btn_frame, text="İptal",
+                                     command=self.cancel_processing, state="disabled")
+        self.btn_cancel.pack(side="left", padx=5)
+        
         # Durumu göster
         status_frame = ttk.Frame(process_frame)
         status_frame.pack(fill="x", pady=10)
@@ -124,6 +245,11 @@ class KlimaGUI:
                                       foreground="blue", font=self.normal_font)
         self.status_label.pack(side="left", padx=10)
         
+        self.progress_var = tk.DoubleVar(value=0.0)
+        self.progress_bar = ttk.Progressbar(process_frame, variable=self.progress_var,
+                                            maximum=100, mode="determinate")
+        self.progress_bar.pack(fill="x", pady=(0, 5))
+        
         # İşlem Günlüğü
         log_frame = ttk.LabelFrame(main_frame, text="3. İşlem Günlüğü", padding=10)
         log_frame.pack(fill="both", expand=True, pady=10)
@@ -144,6 +270,78 @@ class KlimaGUI:
                                font=("Arial", 8), foreground="#666666")
         footer_text.pack(side="left")
     
+    def create_preview_tab(self):
+        """Veri önizleme sekmesi (daire toplamları ve saatlik veriler)"""
+        preview_frame = ttk.Frame(self.tab_preview)
+        preview_frame.pack(fill="both", expand=True, padx=15, pady=15)
+        
+        controls = ttk.Frame(preview_frame)
+        controls.pack(fill="x", pady=(0, 10))
+        
+        self.var_preview_view = tk.StringVar(value=_PREVIEW_DAIRE)
+        ttk.Radiobutton(controls, text="Daire toplamları", value=_PREVIEW_DAIRE,
+                        variable=self.var_preview_view,
+                        command=self.show_preview_view).pack(side="left", padx=5)
+        ttk.Radiobutton(controls, text="Saatlik", value=_PREVIEW_HOURLY,
+                        variable=self.var_preview_view,
+                        command=self.show_preview_view).pack(side="left", padx=5)
+        
+        ttk.Label(controls, text="Daire:").pack(side="left", padx=(20, 5))
+        self.var_preview_filter = tk.StringVar()
+        self.var_preview_filter.trace_add("write", lambda *_: self._schedule_preview_filter())
+        ttk.Entry(controls, textvariable=self.var_preview_filter, width=16).pack(side="left")
+        
+        ttk.Label(controls, text="Tip:").pack(side="left", padx=(20, 5))
+        self.var_preview_type = tk.StringVar(value=_PREVIEW_ALL_TYPES)
+        self.preview_type_combo = ttk.Combobox(controls, textvariable=self.var_preview_type,
+                                               values=[_PREVIEW_ALL_TYPES], width=10,
+                                               state="readonly")
+        self.preview_type_combo.bind("<<ComboboxSelected>>", lambda _: self.apply_preview_filter())
+        self.preview_type_combo.pack(side="left")
+        
+        self.preview_count_label = ttk.Label(controls, text="", font=self.normal_font)
+        self.preview_count_label.pack(side="right", padx=5)
+        
+        self.preview_body = ttk.Frame(preview_frame)
+        self.preview_body.pack(fill="both", expand=True)
+        self.preview_hint = ttk.Label(self.preview_body,
+                                      text="Rapor oluşturulduktan sonra veriler burada listelenir.",
+                                      foreground="#666666", font=self.normal_font)
+        self.preview_hint.pack(pady=40)
+    
+    def create_chart_tab(self):
+        """Saatlik profil grafiği sekmesi (tüm daireler, tip veya tek daire)"""
+        chart_frame = ttk.Frame(self.tab_chart)
+        chart_frame.pack(fill="both", expand=True, padx=15, pady=15)
+        
+        controls = ttk.Frame(chart_frame)
+        controls.pack(fill="x", pady=(0, 10))
+        
+        ttk.Label(controls, text="Profil:").pack(side="left", padx=(0, 5))
+        self.var_profile = tk.StringVar()
+        self.profile_combo = ttk.Combobox(controls, textvariable=self.var_profile, width=20,
+                                          state="readonly")
+        self.profile_combo.bind("<<ComboboxSelected>>", lambda _: self.show_profile())
+        self.profile_combo.pack(side="left")
+        
+        ttk.Button(controls, text="Yakınlaştır",
+                   command=lambda: self._zoom_profile(1)).pack(side="left", padx=(20, 5))
+        ttk.Button(controls, text="Uzaklaştır",
+                   command=lambda: self._zoom_profile(-1)).pack(side="left", padx=5)
+        ttk.Button(controls, text="Tümü",
+                   command=lambda: self._zoom_profile(0)).pack(side="left", padx=5)
+        
+        self.profile_info_label = ttk.Label(controls, text="", font=self.normal_font)
+        self.profile_info_label.pack(side="right", padx=5)
+        
+        self.chart_body = ttk.Frame(chart_frame)
+        self.chart_body.pack(fill="both", expand=True)
+        self.chart_hint = ttk.Label(self.chart_body,
+                                    text="Rapor oluşturulduktan sonra saatlik profiller burada "
+                                         "çizilir (tekerlek: yakınlaştır, sürükle: kaydır).",
+                                    foreground="#666666", font=self.normal_font)
+        self.chart_hint.pack(pady=40)
+    
     def create_about_tab(self):
         """Hakkında sekmesi"""
         about_frame = ttk.Frame(self.tab_about)
@@ -262,7 +460,8 @@ GitHub: https://github.com/serhat-yildiz/intelligent-touch-manager-ppd-reader
         """Kullanıcının bir PPD CSV dosyası seçmesini sağlar."""
         file_path = filedialog.askopenfilename(
             title="PPD Dosyasını Seçin",
-            filetypes=[("CSV Dosyaları", "*.csv"), ("Tüm Dosyalar", "*.*")],
+            filetypes=[("CSV Dosyaları", "*.csv"), ("Kolonsal PPD", "*.ppdc"),
+                       ("Tüm Dosyalar", "*.*")],
             initialdir=str(Path.home() / "Desktop")
         )
         if not file_path:
@@ -277,6 +476,33 @@ GitHub: https://github.com/serhat-yildiz/intelligent-touch-manager-ppd-reader
         if not self.selected_file:
             messagebox.showwarning("Uyarı", "Lütfen bir dosya seçin!")
             return
+        if self._hourly_loading:
+            messagebox.showwarning("Uyarı", "Saatlik önizleme yükleniyor, lütfen bekleyin.")
+            return
+        standard, sayac = self.var_standard.get(), self.var_sayac.get()
+        if not (standard or sayac):
+            messagebox.showwarning("Uyarı", "Lütfen en az bir rapor türü seçin!")
+            return
+        self.sayac_file = None
+        if sayac:
+            self.sayac_file = filedialog.askopenfilename(
+                title="Sayaç okumaları Excel dosyasını seçin",
+                filetypes=[("Excel Dosyaları", "*.xlsx"), ("Tüm Dosyalar", "*.*")],
+                initialdir=str(Path.home() / "Desktop")
+            )
+            if not self.sayac_file:
+                self.log("[WARNING] Sayaç dosyası seçilmedi, işlem iptal edildi.\n")
+                return
+        self.tariff_file = None
+        if self.var_tariff.get():
+            self.tariff_file = filedialog.askopenfilename(
+                title="Tarife dosyasını seçin",
+                filetypes=[("Tarife CSV", "*.csv"), ("Tüm Dosyalar", "*.*")],
+                initialdir=str(Path.home() / "Desktop")
+            )
+            if not self.tariff_file:
+                self.log("[WARNING] Tarife dosyası seçilmedi, işlem iptal edildi.\n")
+                return
         self.output_dir = filedialog.askdirectory(
             title="Raporları kaydetmek için klasör seçin",
             initialdir=str(Path.home() / "Desktop")
@@ -284,43 +510,93 @@ GitHub: https://github.com/serhat-yildiz/intelligent-touch-manager-ppd-reader
         if not self.output_dir:
             self.log("[WARNING] Kayıt dizini seçilmedi, işlem iptal edildi.\n")
             return
+        self._processing = True
         self.btn_process.config(state="disabled")
+        self.btn_cancel.config(state="normal")
         self.status_label.config(text="İşleniyor...", foreground="orange")
+        self.progress_var.set(0.0)
         self.log_text.delete("1.0", tk.END)
-        threading.Thread(target=self._process_standard, daemon=True).start()
+        self._cancel_event.clear()
+        threading.Thread(target=self._process_reports,
+                         args=(standard, sayac, self.var_anomaly.get(), self.var_rollup.get()),
+                         daemon=True).start()
+    
+    def cancel_processing(self) -> None:
+        """Arka plandaki işi okumanın bir sonraki bloğunda veya dışa aktarımdan önce durdurur."""
+        self._cancel_event.set()
+        self.btn_cancel.config(state="disabled")
+        self.log("[WARNING] İptal ediliyor...\n")
+    
+    def _check_cancelled(self) -> None:
+        if self._cancel_event.is_set():
+            from klima_final import ReportCancelled
+            raise ReportCancelled()
+    
+    def _on_parse_progress(self, done: int, total: int) -> None:
+        """Parser'ın okuma ilerlemesi (arka plan iş parçacığında, parça
+        içinde de her 64 KB'de bir çağrılır)."""
+        self._check_cancelled()
+        self.set_progress(_PARSE_SHARE * done / total if total else _PARSE_SHARE)
     
-    def _process_standard(self):
-        """Standart rapor işleme"""
+    def _process_reports(self, standard: bool, sayac: bool, anomalies: bool = False,
+                         rollup: bool = False) -> None:
+        """PPD dosyasını bir kez okuyup seçilen raporları üretir."""
+        if not self._backend_ready.is_set():
+            self.log("[*] Veri işleme modülleri yükleniyor...\n")
+            self._backend_ready.wait()
+        if self.parser is None:
+            self.call_in_ui(lambda: messagebox.showerror(
+                "Hata", "Veri işleme modülleri yüklenemedi (ayrıntılar günlükte)."))
+            self.call_in_ui(self._finish_processing)
+            return
+        from klima_anomaly import summary_lines as anomaly_summary_lines
+        from klima_final import REPORT_SAYAC, REPORT_STANDARD, ReportCancelled
+        from klima_rollup import type_lines as rollup_type_lines
+        
+        reports = ([REPORT_STANDARD] if standard else []) + ([REPORT_SAYAC] if sayac else [])
+        metrics = StageMetrics(file=str(self.selected_file))
+        self.parser.metrics = metrics
+        self.parser.progress = self._on_parse_progress
         try:
-            self.log("[*] PPD dosyası okunuyor...\n")
-            
-            import re
-            
-            # PPD parse et
-            self.ppd_df = self.parser.parse_ppd_file(self.selected_file)
-            self.log(f"[OK] {len(self.ppd_df)} alan verisi işlendi\n")
-            
-            # Tarih bilgisini filename'den çıkar
-            filename = Path(self.selected_file).name
-            match = re.search(r'(\d{2})(\d{2})(\d{4})_(\d{2})(\d{2})(\d{4})', filename)
-            if match:
-                end_month = int(match.groups()[1])
-                end_year = match.groups()[2]
-                month_year = f"{end_month}_{end_year}"
-            else:
-                month_year = "RAPOR"
+            self.log("[*] PPD dosyası okunuyor ve raporlar oluşturuluyor...\n")
             
-            self.log("[*] Rapor oluşturuluyor...\n")
-            
-            # Özet oluştur ve export et
-            summary = self.parser.create_summary(self.ppd_df)
-            csv_file, xlsx_file = self.parser.export_results(
-                self.ppd_df, summary, month_year, output_dir=self.output_dir
+            # Tek parse, seçilen raporlar eşzamanlı yazılır
+            run = self.parser.run_reports(
+                self.selected_file, reports, output_dir=self.output_dir,
+                sayac_file=self.sayac_file, anomalies=anomalies,
+                tariff=self.tariff_file or None, rollup=rollup,
+                cancel=self._check_cancelled
             )
+            self.ppd_result = run['result']
+            summary = run['summary']
+            self._publish_preview(run['result'], run['hourly'], self.selected_file)
+            self.log(f"[OK] {len(self.ppd_result)} alan verisi işlendi\n")
+            self.log("[OK] Raporlar başarıyla oluşturuldu!\n")
+            self.set_progress(100.0)
             
-            self.log("[OK] Standart rapor başarıyla oluşturuldu!\n")
+            # Aşama süreleri (saha sorunlarını teşhis için raporun yanına da yazılır)
+            metrics.close()
+            self.log("\n⏱ AŞAMA SÜRELERİ:\n")
+            for line in metrics.format_lines():
+                self.log(line + "\n")
+            try:
+                metrics.save(Path(self.output_dir) / METRICS_FILE_NAME)
+            except OSError as e:
+                self.log(f"[WARNING] Ölçüm raporu yazılamadı: {e}\n")
             
             # İstatistikler
+            if run['anomalies'] is not None:
+                self.log("\n🔎 ANOMALİ TARAMASI:\n")
+                for line in anomaly_summary_lines(run['anomalies']):
+                    self.log(line + "\n")
+            if run['cube'] is not None:
+                self.log("\n📅 AYLIK DÖKÜM:\n")
+                for line in rollup_type_lines(run['cube'], 'ay'):
+                    self.log(line + "\n")
+                if run['cube'].skipped:
+                    self.log(f"[WARNING] Zamanı çözülemeyen {run['cube'].skipped} saat "
+                             "dökümde yok\n")
+            
             self.log("\n📈 İSTATİSTİKLER:\n")
             for key, value in summary.items():
                 if isinstance(value, float):
@@ -329,29 +605,233 @@ GitHub: https://github.com/serhat-yildiz/intelligent-touch-manager-ppd-reader
                     self.log(f"   • {key}: {value}\n")
             
             self.log("\n[DONE] TAMAMLANDI!\n")
-            self.status_label.config(text="Tamamlandı", foreground="black")
+            self.set_status("Tamamlandı", "black")
             
             # Dosya adları mesaj için tam yol olarak göster
-            messagebox.showinfo("Başarılı",
-                                f"Rapor oluşturuldu!\n\n- {csv_file}\n- {xlsx_file}")
+            files = "\n".join(f"- {path}" for paths in run['outputs'].values() for path in paths)
+            self.call_in_ui(lambda: messagebox.showinfo(
+                "Başarılı", f"Rapor oluşturuldu!\n\n{files}"))
+            
+        except ReportCancelled:
+            self.log("\n[WARNING] İşlem iptal edildi.\n")
+            self.set_status("İptal edildi", "black")
+            self.set_progress(0.0)
             
         except Exception as e:
-            self.log(f"\n[ERROR] HATA: {str(e)}\n")
-            self.status_label.config(text="Hata!", foreground="#cc0000")
-            messagebox.showerror("Hata", f"İşlem başarısız:\n{str(e)}")
+            error = str(e)
+            self.log(f"\n[ERROR] HATA: {error}\n")
+            self.set_status("Hata!", "#cc0000")
+            self.call_in_ui(lambda: messagebox.showerror("Hata", f"İşlem başarısız:\n{error}"))
         
         finally:
-            self.btn_process.config(state="normal")
+            self.parser.metrics = None
+            self.parser.progress = None
+            metrics.close()
+            self.call_in_ui(self._finish_processing)
+    
+    def _finish_processing(self) -> None:
+        self._processing = False
+        self.btn_process.config(state="normal")
+        self.btn_cancel.config(state="disabled")
+    
+    def _publish_preview(self, result: "PPDResult", hourly: Any, source: Optional[str]) -> None:
+        """Önizleme modellerini hazırlar ve sekmeye aktarır (arka planda çağrılır)."""
+        from klima_chart import ProfileSource
+        from klima_preview import HourlyTableModel, ResultTableModel
+        models = {_PREVIEW_DAIRE: ResultTableModel(self.parser.sort_by_daire_sirasi(result))}
+        profiles = None
+        if hourly is not None:
+            models[_PREVIEW_HOURLY] = HourlyTableModel(hourly)
+            profiles = ProfileSource(hourly)
+        self.call_in_ui(lambda: self._set_preview_models(models, profiles, source))
+    
+    def _set_preview_models(self, models: Dict[str, "TableModel"],
+                            profiles: Optional["ProfileSource"], source: Optional[str]) -> None:
+        if self.preview_table is None:
+            from klima_preview import VirtualTable
+            self.preview_hint.pack_forget()
+            self.preview_table = VirtualTable(self.preview_body,
+                                              on_change=self._on_preview_change)
+            self.preview_table.pack(fill="both", expand=True)
+        self.preview_models = models
+        self.profile_source = profiles
+        self.preview_file = source
+        self.show_preview_view()
+        self.show_profile()
+    
+    def show_preview_view(self) -> None:
+        """Seçili görünümü (daire toplamları / saatlik) tabloya bağlar."""
+        if self.preview_table is None:
+            return
+        view = self.var_preview_view.get()
+        model = self.preview_models.get(view)
+        if model is None:
+            if view == _PREVIEW_HOURLY:
+                self._load_hourly()
+            return
+        types = sorted(set(model.types))
+        self.preview_type_combo.config(values=[_PREVIEW_ALL_TYPES] + types)
+        if self.var_preview_type.get() not in types:
+            self.var_preview_type.set(_PREVIEW_ALL_TYPES)
+        self.preview_table.set_model(model, *self._preview_filter())
+    
+    def _preview_filter(self) -> Tuple[str, Optional[str]]:
+        daire_type = self.var_preview_type.get()
+        return (self.var_preview_filter.get(),
+                None if daire_type == _PREVIEW_ALL_TYPES else daire_type)
+    
+    def _schedule_preview_filter(self) -> None:
+        """Yazım bitince süzer; her tuşta 750 bin satır yeniden süzülmez."""
+        if self._preview_filter_job is not None:
+            self.root.after_cancel(self._preview_filter_job)
+        self._preview_filter_job = self.root.after(_PREVIEW_FILTER_DELAY_MS,
+                                                   self.apply_preview_filter)
+    
+    def apply_preview_filter(self) -> None:
+        self._preview_filter_job = None
+        if self.preview_table is not None and self.preview_table.model is not None:
+            self.preview_table.set_filter(*self._preview_filter())
+    
+    def _on_preview_change(self, count: int) -> None:
+        total = len(self.preview_table.model) if self.preview_table.model is not None else 0
+        self.preview_count_label.config(text=f"{count:,} / {total:,} satır".replace(",", "."))
+    
+    def _on_tab_changed(self) -> None:
+        if self.notebook.select() == str(self.tab_chart):
+            self.show_profile()
+    
+    def show_profile(self) -> None:
+        """Seçili profili çizer; saatlik veri yoksa sekme açıkken okunur."""
+        if self.preview_file is None or self.notebook.select() != str(self.tab_chart):
+            return
+        if self.profile_source is None:
+            self._load_hourly()
+            return
+        if self.profile_chart is None:
+            from klima_chart import ProfileChart
+            self.chart_hint.pack_forget()
+            self.profile_chart = ProfileChart(
+                self.chart_body, on_view=lambda text: self.profile_info_label.config(text=text))
+            self.profile_chart.pack(fill="both", expand=True)
+        choices = self.profile_source.choices()
+        self.profile_combo.config(values=choices)
+        if self.var_profile.get() not in choices:
+            self.var_profile.set(choices[0])
+        series = self.profile_source.series(self.var_profile.get())
+        if self.profile_chart.series is not series:
+            self.profile_chart.set_series(series)
+    
+    def _zoom_profile(self, step: int) -> None:
+        """Grafiği `step` düzey yakınlaştırır; 0 tüm süreye döner."""
+        if self.profile_chart is None:
+            return
+        if step:
+            self.profile_chart.zoom(step)
+        else:
+            self.profile_chart.reset()
+    
+    def _set_hourly_message(self, text: str) -> None:
+        self.preview_count_label.config(text=text)
+        self.profile_info_label.config(text=text)
+    
+    def _load_hourly(self) -> None:
+        """Saatlik veri rapor sırasında okunmadıysa dosyayı arka planda saatlik okur
+        (saatlik önizleme ve profil grafiği için)."""
+        if self._hourly_loading or self._processing or not self.preview_file:
+            if self._processing:
+                self._set_hourly_message("İşlem sürerken saatlik veri yüklenemez")
+            return
+        self._hourly_loading = True
+        self._set_hourly_message("Saatlik veri yükleniyor...")
+        threading.Thread(target=self._read_hourly, args=(self.preview_file,),
+                         daemon=True).start()
+    
+    def _read_hourly(self, source: str) -> None:
+        try:
+            from klima_chart import ProfileSource
+            from klima_preview import HourlyTableModel
+            hourly = self.parser.parse_ppd_hourly(source)
+            model = HourlyTableModel(hourly)
+            profiles = ProfileSource(hourly)
+        except Exception as e:
+            error = str(e)
+            self.log(f"[ERROR] Saatlik veri okunamadı: {error}\n")
+            self.call_in_ui(lambda: self._set_hourly_message("Saatlik veri okunamadı"))
+        else:
+            def done() -> None:
+                if self.preview_file == source:
+                    self.preview_models[_PREVIEW_HOURLY] = model
+                    self.profile_source = profiles
+                    if self.var_preview_view.get() == _PREVIEW_HOURLY:
+                        self.show_preview_view()
+                    self.show_profile()
+            self.call_in_ui(done)
+        finally:
+            self._hourly_loading = False
     
     def log(self, message: str) -> None:
-        """Günlüğe `message` ekler ve arayüzü günceller."""
-        self.log_text.insert(tk.END, message)
-        self.log_text.see(tk.END)
-        self.root.update()
+        """Günlüğe `message` ekler (her iş parçacığından çağrılabilir)."""
+        self._ui_queue.put(('log', message))
+    
+    def set_status(self, text: str, color: str) -> None:
+        """Durum etiketini günceller (her iş parçacığından çağrılabilir)."""
+        self._ui_queue.put(('status', (text, color)))
+    
+    def set_progress(self, percent: float) -> None:
+        """İlerleme çubuğunu günceller (her iş parçacığından çağrılabilir)."""
+        self._ui_queue.put(('progress', percent))
+    
+    def call_in_ui(self, func: Callable[[], Any]) -> None:
+        """`func`'ı ana iş parçacığında çalıştırır (mesaj kutuları vb. için)."""
+        self._ui_queue.put(('call', func))
+    
+    def _pump_ui_queue(self) -> None:
+        """Kuyruktaki mesajları toplu olarak arayüze uygular.
+        
+        Günlük satırları tek seferde eklenir; durum ve ilerleme için
+        yalnızca son değer uygulanır. Böylece çok sayıda mesaj gelse de
+        arayüz her turda bir kez yeniden çizilir.
+        """
+        try:
+            self._apply_ui_messages()
+        finally:
+            self.root.after(_PUMP_INTERVAL_MS, self._pump_ui_queue)
+    
+    def _apply_ui_messages(self) -> None:
+        lines: List[str] = []
+        status = None
+        progress = None
+        calls: List[Callable[[], Any]] = []
+        for _ in range(_PUMP_MAX_ITEMS):
+            try:
+                kind, payload = self._ui_queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'log':
+                lines.append(payload)
+            elif kind == 'status':
+                status = payload
+            elif kind == 'progress':
+                progress = payload
+            else:
+                calls.append(payload)
+        
+        if lines:
+            self.log_text.insert(tk.END, "".join(lines))
+            self.log_text.see(tk.END)
+        if status is not None:
+            self.status_label.config(text=status[0], foreground=status[1])
+        if progress is not None:
+            self.progress_var.set(progress)
+        for func in calls:
+            func()
 
 def main():
     root = tk.Tk()
     app = KlimaGUI(root)
+    probe = os.environ.get(STARTUP_PROBE_ENV)
+    if probe:
+        app.startup_probe(probe)
     root.mainloop()
 
 if __name__ == "__main__":
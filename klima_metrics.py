@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Klima Aylık Tüketim Raporu - Aşama Ölçümleri
+Folkart Blu Çeşme Yönetimi İçin
+
+`PPDRawParser` aşamalarının (CSV okuma, sayısal dönüşüm, gruplama,
+CSV/Excel kayıt) süresini, işlenen satır/sütun sayısını ve bellek
+kullanımını kaydeder. Sürekli açık kalabilecek kadar ucuzdur: aşama
+başına iki `perf_counter` ve bir işlem bellek sorgusu yapılır.
+
+Aşama bazında kesin bellek zirvesi için tracemalloc kullanılabilir
+(`trace_memory=True` veya `KLIMA_TRACE_MEMORY=1`); ancak izleme
+okumayı 2-4 kat yavaşlattığı için varsayılan olarak kapalıdır.
+"""
+
+import contextlib
+import json
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+# Rapor dosyası (ısıtma_sogutma.xlsx'in yanına yazılır)
+METRICS_FILE_NAME = "ısıtma_sogutma_olcum.json"
+
+# Başlangıç ölçümü: arayüz bu değişkendeki dosyaya pencere/modül hazır olma
+# zamanlarını yazıp kapanır (`klima_bench.py --startup`)
+STARTUP_PROBE_ENV = 'KLIMA_STARTUP_PROBE'
+
+# Aşama anahtarı -> günlükte gösterilen ad
+STAGE_LABELS: Dict[str, str] = {
+    'csv_okuma': 'CSV okuma',
+    'kolonsal_okuma': 'Kolonsal okuma',
+    'sayisal_donusum': 'Sayısal dönüşüm',
+    'zaman_damgasi': 'Zaman damgaları',
+    'birlestirme': 'Dosya birleştirme',
+    'gruplama': 'Gruplama',
+    'ozet': 'Özet',
+    'anomali': 'Anomali taraması',
+    'tarife': 'Tarife hesabı',
+    'kup': 'Dönemsel küp',
+    'siralama': 'Sıralama',
+    'csv_kayit': 'CSV kayıt',
+    'xlsx_kayit': 'Excel kayıt',
+}
+
+_MB = 1024 * 1024
+
+
+def _windows_peak_rss() -> Optional[int]:
+    import ctypes
+    from ctypes import wintypes
+
+    class _Counters(ctypes.Structure):
+        _fields_ = [
+            ('cb', wintypes.DWORD),
+            ('PageFaultCount', wintypes.DWORD),
+            ('PeakWorkingSetSize', ctypes.c_size_t),
+            ('WorkingSetSize', ctypes.c_size_t),
+            ('QuotaPeakPagedPoolUsage', ctypes.c_size_t),
+            ('QuotaPagedPoolUsage', ctypes.c_size_t),
+            ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+            ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+            ('PagefileUsage', ctypes.c_size_t),
+            ('PeakPagefileUsage', ctypes.c_size_t),
+        ]
+
+    counters = _Counters()
+    counters.cb = ctypes.sizeof(counters)
+    handle = ctypes.windll.kernel32.GetCurrentProcess()
+    if not ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+        return None
+    return int(counters.PeakWorkingSetSize)
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """İşlemin şimdiye kadarki en yüksek bellek kullanımı (bayt); bilinmiyorsa None."""
+    try:
+        if sys.platform == 'win32':
+            return _windows_peak_rss()
+        import resource
+    except (ImportError, OSError, AttributeError):
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux kB, macOS bayt döndürür
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class StageMetrics:
+    """Tek bir çalışmanın aşama ölçümleri.
+
+    Aynı ada sahip aşama birden çok kez ölçülürse (ör. her parça için
+    CSV okuma) süreler ve satır sayıları toplanır, bellek zirvesinin
+    en büyüğü tutulur. Aşamalar iç içe açılmamalıdır.
+    """
+
+    def __init__(self, trace_memory: Optional[bool] = None, **info: Any) -> None:
+        if trace_memory is None:
+            trace_memory = os.environ.get('KLIMA_TRACE_MEMORY', '') not in ('', '0')
+        self.trace_memory = trace_memory
+        self.info: Dict[str, Any] = dict(info)
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.created = datetime.now()
+        self._started = time.perf_counter()
+        self._elapsed: Optional[float] = None
+        self._own_trace = trace_memory and not tracemalloc.is_tracing()
+        if self._own_trace:
+            tracemalloc.start()
+
+    @contextlib.contextmanager
+    def stage(self, name: str, rows: Optional[int] = None,
+              cols: Optional[int] = None) -> Iterator[Dict[str, int]]:
+        """`name` aşamasını ölçer.
+
+        Dönen sözlüğe aşama içinde `rows`/`cols` yazılabilir (satır
+        sayısı ancak okuma bitince bilindiğinde).
+        """
+        counts: Dict[str, int] = {}
+        if rows is not None:
+            counts['rows'] = rows
+        if cols is not None:
+            counts['cols'] = cols
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield counts
+        finally:
+            seconds = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1] - base if tracing else None
+            self._record(name, seconds, counts, peak)
+
+    def _record(self, name: str, seconds: float, counts: Dict[str, int],
+                peak: Optional[int]) -> None:
+        rec = self.stages.setdefault(name, {
+            'stage': name,
+            'label': STAGE_LABELS.get(name, name),
+            'seconds': 0.0,
+            'calls': 0,
+            'rows': 0,
+            'cols': 0,
+            'peak_mb': None,
+            'rss_peak_mb': None,
+        })
+        rec['seconds'] += seconds
+        rec['calls'] += 1
+        rec['rows'] += counts.get('rows', 0)
+        rec['cols'] = max(rec['cols'], counts.get('cols', 0))
+        if peak is not None:
+            rec['peak_mb'] = max(rec['peak_mb'] or 0.0, peak / _MB)
+        rss = peak_rss_bytes()
+        if rss is not None:
+            rec['rss_peak_mb'] = rss / _MB
+
+    def close(self) -> None:
+        """Toplam süreyi sabitler; ölçüm için açılan tracemalloc'u kapatır."""
+        if self._elapsed is None:
+            self._elapsed = time.perf_counter() - self._started
+        if self._own_trace:
+            tracemalloc.stop()
+            self._own_trace = False
+
+    @property
+    def total_seconds(self) -> float:
+        if self._elapsed is not None:
+            return self._elapsed
+        return time.perf_counter() - self._started
+
+    def report(self) -> Dict[str, Any]:
+        """JSON'a yazılabilir çalışma raporu."""
+        rss = peak_rss_bytes()
+        return {
+            'created': self.created.isoformat(timespec='seconds'),
+            **self.info,
+            'total_seconds': self.total_seconds,
+            'trace_memory': self.trace_memory,
+            'rss_peak_mb': rss / _MB if rss is not None else None,
+            'stages': list(self.stages.values()),
+        }
+
+    def save(self, path: Union[str, Path]) -> Path:
+        """Raporu `path`'e yazar."""
+        path = Path(path)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
+        return path
+
+    def format_lines(self) -> List[str]:
+        """Günlük için aşama dökümü (her aşama bir satır)."""
+        lines = []
+        for rec in self.stages.values():
+            detail = []
+            if rec['rows']:
+                detail.append(f"{rec['rows']} satır" +
+                              (f" × {rec['cols']} sütun" if rec['cols'] else ""))
+            if rec['peak_mb'] is not None:
+                detail.append(f"zirve {rec['peak_mb']:.1f} MB")
+            elif rec['rss_peak_mb'] is not None:
+                detail.append(f"işlem {rec['rss_peak_mb']:.0f} MB")
+            suffix = f"  ({', '.join(detail)})" if detail else ""
+            lines.append(f"   • {rec['label']:<16} {rec['seconds']:8.3f} sn{suffix}")
+        lines.append(f"   • {'Toplam':<16} {self.total_seconds:8.3f} sn")
+        return lines
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Klima Aylık Tüketim Raporu - Veri Önizleme Tablosu
+Folkart Blu Çeşme Yönetimi İçin
+
+Arayüzdeki "Veri Önizleme" sekmesinin sanal tablosu. İki görünüm vardır:
+daire toplamları (`PPDResult`, daire başına bir satır) ve saatlik matris
+(`PPDHourly`, saat × daire satır). 1 yıllık saatlik görünüm ~750 bin
+satırdır; bunların hepsi Treeview'a eklenmez:
+
+* Treeview'da yalnızca pencereye sığan kadar satır öğesi bulunur.
+  Kaydırma yalnızca ilk görünen satırı değiştirir; öğelerin değerleri
+  modelden o an görünen satırlar için yeniden üretilir.
+* Süzme (daire adı, tip) ve sıralama satır numarası dizileri üzerinde
+  numpy ile yapılır; metin yalnızca görünen satırlar için oluşturulur.
+"""
+
+import re
+import tkinter as tk
+from tkinter import ttk
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# (başlık, genişlik px, hizalama)
+Column = Tuple[str, int, str]
+
+# Fare tekerleğinin bir adımında kaydırılan satır sayısı
+_WHEEL_ROWS = 3
+
+
+def _natural_key(value: Any) -> List[Any]:
+    """'DAIRE 2' < 'DAIRE 10' olacak şekilde sayıları sayı olarak karşılaştırır."""
+    parts = re.split(r'(\d+)', str(value))
+    return [int(part) if i % 2 else part for i, part in enumerate(parts)]
+
+
+def _ranks(values: Sequence[Any]) -> np.ndarray:
+    """Her değerin doğal sıralamadaki yeri (sıralama anahtarı olarak)."""
+    order = sorted(range(len(values)), key=lambda i: _natural_key(values[i]))
+    ranks = np.empty(len(values), dtype=np.int64)
+    ranks[order] = np.arange(len(values))
+    return ranks
+
+
+class TableModel:
+    """Sanal tablonun veri kaynağı.
+
+    Satırlar 0..len-1 numaralıdır ve her satır bir daireye aittir. Süzme
+    önce daireleri (`names`/`types` sırasındaki numaraları) seçer, `rows_for` bunları satır
+    numaralarına çevirir; sıralama `sort_key` ile üretilen sayısal
+    anahtarlarla yapılır.
+    """
+
+    columns: Tuple[Column, ...] = ()
+
+    def __init__(self, names: Sequence[str], types: Sequence[str]) -> None:
+        self.names = list(names)
+        self.types = list(types)
+        self._upper_names = [name.upper() for name in self.names]
+        self._name_ranks = _ranks(self.names)
+        self._type_ranks = _ranks(self.types)
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def rows_for(self, daires: np.ndarray) -> np.ndarray:
+        """Seçilen dairelerin (sütun numaraları) satırları, varsayılan sırada."""
+        raise NotImplementedError
+
+    def sort_key(self, rows: np.ndarray, column: int) -> np.ndarray:
+        """`rows` satırlarının `column` sütunundaki sayısal sıralama anahtarı."""
+        raise NotImplementedError
+
+    def format_rows(self, rows: np.ndarray) -> List[Tuple[str, ...]]:
+        """`rows` satırlarının hücre metinleri (yalnızca görünen satırlar için)."""
+        raise NotImplementedError
+
+    def select(self, text: str = '', daire_type: Optional[str] = None) -> np.ndarray:
+        """Adında `text` geçen (büyük/küçük harf ayrımsız) ve tipi
+        `daire_type` olan dairelerin satırları."""
+        mask = np.ones(len(self.names), dtype=bool)
+        text = text.strip().upper()
+        if text:
+            mask &= np.fromiter((text in name for name in self._upper_names),
+                                dtype=bool, count=len(self.names))
+        if daire_type:
+            mask &= np.fromiter((t == daire_type for t in self.types),
+                                dtype=bool, count=len(self.types))
+        return self.rows_for(np.flatnonzero(mask))
+
+    def sort(self, rows: np.ndarray, column: int, descending: bool = False) -> np.ndarray:
+        """`rows`'u `column`'a göre kararlı sıralar (eşitlerde mevcut sıra korunur)."""
+        key = self.sort_key(rows, column)
+        order = np.argsort(-key if descending else key, kind='stable')
+        return rows[order]
+
+
+class ResultTableModel(TableModel):
+    """Daire toplamları: `PPDResult`'un her satırı bir tablo satırı."""
+
+    columns = (
+        ('DAİRE ADI', 160, 'w'),
+        ('DAİRE NO', 80, 'center'),
+        ('TİP', 80, 'center'),
+        ('TÜKETİM (Wh)', 130, 'e'),
+        ('TÜKETİM (kWh)', 130, 'e'),
+        ('ESKİ NO', 80, 'center'),
+    )
+
+    def __init__(self, result: Any) -> None:
+        super().__init__(result.names, result.types)
+        self.result = result
+        self._keys = [str(key) for key in result.keys]
+        self._eski = list(result.eski) if result.eski is not None else [''] * len(result)
+        self._key_ranks = _ranks(self._keys)
+        self._eski_ranks = _ranks(self._eski)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def rows_for(self, daires: np.ndarray) -> np.ndarray:
+        return daires.astype(np.int64)
+
+    def sort_key(self, rows: np.ndarray, column: int) -> np.ndarray:
+        if column == 0:
+            return self._name_ranks[rows]
+        if column == 1:
+            return self._key_ranks[rows]
+        if column == 2:
+            return self._type_ranks[rows]
+        if column == 3:
+            return np.asarray(self.result.wh, dtype=np.float64)[rows]
+        if column == 4:
+            return np.asarray(self.result.kwh, dtype=np.float64)[rows]
+        return self._eski_ranks[rows]
+
+    def format_rows(self, rows: np.ndarray) -> List[Tuple[str, ...]]:
+        wh = self.result.wh
+        kwh = self.result.kwh
+        return [(self.names[r], self._keys[r], self.types[r], f"{wh[r]:.0f}",
+                 f"{kwh[r]:.3f}", self._eski[r]) for r in rows.tolist()]
+
+
+class HourlyTableModel(TableModel):
+    """Saatlik matris: satır `saat * daire_sayısı + daire`, Wh cinsinden.
+
+    Daireye toplanmış (saat × daire) matris bir kez hesaplanır; satır
+    numarasından saat ve daire aritmetikle bulunur, satır başına nesne
+    tutulmaz.
+    """
+
+    columns = (
+        ('ZAMAN', 150, 'w'),
+        ('DAİRE ADI', 160, 'w'),
+        ('TİP', 80, 'center'),
+        ('TÜKETİM (Wh)', 130, 'e'),
+    )
+
+    def __init__(self, hourly: Any) -> None:
+        super().__init__(hourly.group_names, hourly.group_types)
+        grouped = np.asarray(hourly.grouped_values())
+        self.hours, self.daires = grouped.shape
+        self.values = np.ascontiguousarray(grouped).reshape(-1)
+        self.timestamps = hourly.timestamps
+        self._value_format = "{:.0f}" if hourly.exact else "{:.1f}"
+
+    def __len__(self) -> int:
+        return self.values.size
+
+    def rows_for(self, daires: np.ndarray) -> np.ndarray:
+        if len(daires) == self.daires:
+            return np.arange(self.values.size, dtype=np.int64)
+        hours = np.arange(self.hours, dtype=np.int64) * self.daires
+        return (hours[:, None] + daires.astype(np.int64)[None, :]).reshape(-1)
+
+    def sort_key(self, rows: np.ndarray, column: int) -> np.ndarray:
+        if column == 0:
+            return rows // self.daires
+        if column == 1:
+            return self._name_ranks[rows % self.daires]
+        if column == 2:
+            return self._type_ranks[rows % self.daires]
+        return self.values[rows].astype(np.float64)
+
+    def format_rows(self, rows: np.ndarray) -> List[Tuple[str, ...]]:
+        hours, daires = np.divmod(rows, self.daires)
+        if self.timestamps is not None:
+            stamps = list(self.timestamps[hours].strftime('%Y-%m-%d %H:%M'))
+        else:
+            stamps = [f"#{h + 1}" for h in hours.tolist()]
+        values = self.values[rows].tolist()
+        fmt = self._value_format
+        return [(stamp, self.names[d], self.types[d], fmt.format(value))
+                for stamp, d, value in zip(stamps, daires.tolist(), values)]
+
+
+class VirtualTable(ttk.Frame):
+    """Yalnızca görünen satırları çizen tablo.
+
+    Treeview'daki öğe sayısı pencere yüksekliğine göre ayarlanır ve öğeler
+    yeniden kullanılır: kaydırma çubuğu, fare tekerleği ve tuşlar yalnızca
+    ilk görünen satırı (`top`) değiştirir. Sütun başlığına tıklamak o
+    sütuna göre sıralar, ikinci tıklama sırayı tersine çevirir.
+    """
+
+    def __init__(self, master: tk.Misc, on_change: Optional[Callable[[int], None]] = None,
+                 **kwargs: Any) -> None:
+        super().__init__(master, **kwargs)
+        self.model: Optional[TableModel] = None
+        self.rows = np.arange(0, dtype=np.int64)  # süzülmüş ve sıralanmış satırlar
+        self.top = 0
+        self.filter_text = ''
+        self.filter_type: Optional[str] = None
+        self.sort_column: Optional[int] = None
+        self.descending = False
+        self.selected_row: Optional[int] = None
+        self._on_change = on_change
+        self._items: List[str] = []
+
+        self.tree = ttk.Treeview(self, show='headings', selectmode='browse', height=1)
+        self.scrollbar = ttk.Scrollbar(self, orient='vertical', command=self._on_scrollbar)
+        self.scrollbar.pack(side='right', fill='y')
+        self.tree.pack(side='left', fill='both', expand=True)
+        self._row_height = int(ttk.Style(self).lookup('Treeview', 'rowheight') or 20)
+
+        self.tree.bind('<Configure>', self._on_resize)
+        self.tree.bind('<<TreeviewSelect>>', self._on_select)
+        # Treeview'ın kendi kaydırması kapalı: öğeler hep pencereye sığar
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.tree.bind(sequence, self._on_wheel)
+        for sequence in ('<Up>', '<Down>', '<Prior>', '<Next>', '<Home>', '<End>'):
+            self.tree.bind(sequence, self._on_key)
+
+    @property
+    def visible(self) -> int:
+        return len(self._items)
+
+    def set_model(self, model: TableModel, text: str = '',
+                  daire_type: Optional[str] = None) -> None:
+        """Tabloyu `model`'e bağlar ve süzgeci uygular; sıralama sıfırlanır."""
+        self.model = model
+        self.filter_text = text
+        self.filter_type = daire_type or None
+        self.sort_column = None
+        self.descending = False
+        self.selected_row = None
+        ids = [f"c{i}" for i in range(len(model.columns))]
+        self.tree.configure(columns=ids)
+        for i, (title, width, anchor) in enumerate(model.columns):
+            self.tree.heading(ids[i], text=title, anchor=anchor,
+                              command=lambda c=i: self.sort_by(c))
+            self.tree.column(ids[i], width=width, anchor=anchor, stretch=True)
+        self._reselect()
+
+    def set_filter(self, text: str = '', daire_type: Optional[str] = None) -> None:
+        """Daire adı ve tip süzgecini uygular (mevcut sıralama korunur)."""
+        self.filter_text = text
+        self.filter_type = daire_type or None
+        self._reselect()
+
+    def sort_by(self, column: int) -> None:
+        """`column`'a göre sıralar; aynı sütunda sırayı tersine çevirir."""
+        if self.model is None:
+            return
+        self.descending = not self.descending if column == self.sort_column else False
+        self.sort_column = column
+        self.rows = self.model.sort(self.rows, column, self.descending)
+        self.top = 0
+        self._update_headings()
+        self.refresh()
+
+    def scroll_to(self, top: int) -> None:
+        self.top = top
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Görünen öğeleri `top`'tan başlayan satırlarla doldurur."""
+        total = len(self.rows)
+        self.top = max(0, min(self.top, total - self.visible))
+        window = self.rows[self.top:self.top + self.visible]
+        values = self.model.format_rows(window) if self.model is not None and len(window) else []
+        for i, item in enumerate(self._items):
+            self.tree.item(item, values=values[i] if i < len(values) else ())
+        # öğeler yeniden kullanıldığı için seçim, seçilen veri satırını izler
+        slots = (np.flatnonzero(window == self.selected_row)
+                 if self.selected_row is not None else ())
+        self.tree.selection_set([self._items[slots[0]]] if len(slots) else [])
+        if total:
+            self.scrollbar.set(self.top / total, min(1.0, (self.top + self.visible) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _reselect(self) -> None:
+        if self.model is None:
+            return
+        self.rows = self.model.select(self.filter_text, self.filter_type)
+        if self.sort_column is not None:
+            self.rows = self.model.sort(self.rows, self.sort_column, self.descending)
+        self.top = 0
+        self._update_headings()
+        self.refresh()
+        if self._on_change is not None:
+            self._on_change(len(self.rows))
+
+    def _update_headings(self) -> None:
+        if self.model is None:
+            return
+        for i, (title, _, _) in enumerate(self.model.columns):
+            if i == self.sort_column:
+                title += " ▼" if self.descending else " ▲"
+            self.tree.heading(f"c{i}", text=title)
+
+    def _on_resize(self, event: tk.Event) -> None:
+        # başlık satırı yüksekliği ilk öğenin konumundan okunur
+        header = self._row_height + 4
+        if self._items:
+            box = self.tree.bbox(self._items[0])
+            if box:
+                header = box[1]
+        wanted = max(1, (event.height - header) // self._row_height)
+        while len(self._items) < wanted:
+            self._items.append(self.tree.insert('', 'end', values=()))
+        while len(self._items) > wanted:
+            self.tree.delete(self._items.pop())
+        self.tree.yview_moveto(0)
+        self.refresh()
+
+    def _on_scrollbar(self, action: str, amount: str, unit: Optional[str] = None) -> None:
+        if action == 'moveto':
+            self.scroll_to(int(float(amount) * len(self.rows)))
+        elif action == 'scroll':
+            step = self.visible if unit == 'pages' else 1
+            self.scroll_to(self.top + int(amount) * step)
+
+    def _on_wheel(self, event: tk.Event) -> str:
+        if event.num == 4:
+            direction = -1
+        elif event.num == 5:
+            direction = 1
+        else:
+            direction = -1 if event.delta > 0 else 1
+        self.scroll_to(self.top + direction * _WHEEL_ROWS)
+        return 'break'
+
+    def _on_key(self, event: tk.Event) -> str:
+        steps = {'Up': -1, 'Down': 1, 'Prior': -self.visible, 'Next': self.visible,
+                 'Home': -len(self.rows), 'End': len(self.rows)}
+        self.scroll_to(self.top + steps[event.keysym])
+        return 'break'
+
+    def _on_select(self, _event: tk.Event) -> None:
+        selection = self.tree.selection()
+        if not selection:
+            return
+        slot = self.top + self._items.index(selection[0])
+        if slot < len(self.rows):
+            self.selected_row = int(self.rows[slot])
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Klima Aylık Tüketim Raporu - Site Profili (Sütun Sınıflandırıcı)
+Folkart Blu Çeşme Yönetimi İçin
+
+PPD başlığındaki hangi sütunların daire/ortak alan olduğunu, daire
+numarasını ve tipini (SÜİT/ORTAK) bina bazında ayarlanabilir kılar.
+Profil `site_profili.ini` dosyasından okunur; dosya yoksa Folkart Blu
+Çeşme varsayılanları (DAIRE 1-80, A-F ekleri, LOBI/YONETIM/... ortak
+alanları) kullanılır.
+
+    [site]
+    ad = Folkart Blu Çeşme
+
+    [daire]
+    onek = DAIRE
+    numaralar = 1-80
+    ekler = A-F
+
+    [ortak]
+    # ANAHTAR KELİME = rapordaki numara (boşsa addaki sayı/ad kullanılır)
+    LOBI = LOBI
+    MUTFAK = ORTAK
+    RES
+
+Profil tek bir daire düzenli ifadesine ve tek bir ortak alan anahtar
+kelime ifadesine derlenir; her başlık tek geçişte sınıflandırılır.
+Sonuçlar hem sütun adı hem de başlık imzası (sütun listesi) bazında
+önbelleklenir, binlerce sütunlu dosyalarda bile tekrar hesaplanmaz.
+"""
+
+import configparser
+import re
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+PROFILE_FILE_NAME = "site_profili.ini"
+
+# Folkart Blu Çeşme varsayılanları (profil dosyası yoksa)
+DEFAULT_PREFIXES = ['DAIRE']
+DEFAULT_RANGES = [(1, 80)]
+DEFAULT_SUFFIXES = 'ABCDEF'
+# (anahtar kelime, rapordaki numara): numara None ise addaki sayı/ad kullanılır
+DEFAULT_ORTAK: List[Tuple[str, Optional[str]]] = [
+    ('LOBI', 'LOBI'),
+    ('YONETIM', 'YONETIM'),
+    ('FITNESS', 'FITNESS'),
+    ('MUTFAK', 'ORTAK'),
+    ('P.O', 'ORTAK'),
+    ('BAYBAYAN', 'ORTAK'),
+    ('RES', None),
+]
+
+# Saklanan en fazla başlık imzası
+_HEADER_CACHE_SIZE = 16
+
+_DIGITS_REGEX = re.compile(r'(\d+)')
+
+
+class ColumnClass(NamedTuple):
+    """Tek başlığın sınıflandırması."""
+    selected: bool      # daire/ortak veri sütunu mu
+    name: str           # raporda görünen ad (boşlukları kırpılmış)
+    key: object         # daire numarası (int) veya ortak alan anahtarı (str)
+    type: str           # 'SÜİT' veya 'ORTAK'
+
+
+def _parse_ranges(text: str) -> List[Tuple[int, int]]:
+    """'1-80, 101-140, 200' -> [(1, 80), (101, 140), (200, 200)]."""
+    ranges = []
+    for part in text.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        first, _, last = part.partition('-')
+        try:
+            low, high = int(first), int(last or first)
+        except ValueError:
+            raise ValueError(f"Geçersiz numara aralığı: {part!r} (örnek: 1-80)") from None
+        if low > high:
+            raise ValueError(f"Geçersiz numara aralığı: {part!r}")
+        ranges.append((low, high))
+    return ranges
+
+
+def _parse_suffixes(text: str) -> str:
+    """'A-F' veya 'ABC' -> 'ABCDEF' / 'ABC'; boşsa ek yok."""
+    text = text.replace(',', '').replace(' ', '').upper()
+    letters = ''
+    idx = 0
+    while idx < len(text):
+        if idx + 2 < len(text) and text[idx + 1] == '-':
+            letters += ''.join(chr(c) for c in range(ord(text[idx]), ord(text[idx + 2]) + 1))
+            idx += 3
+        else:
+            letters += text[idx]
+            idx += 1
+    return letters
+
+
+class SiteProfile:
+    """Bir binanın sütun adlandırma kuralları; derlenmiş sınıflandırıcı."""
+
+    def __init__(self, name: str = "", prefixes: Sequence[str] = DEFAULT_PREFIXES,
+                 ranges: Sequence[Tuple[int, int]] = DEFAULT_RANGES,
+                 suffixes: str = DEFAULT_SUFFIXES,
+                 ortak: Sequence[Tuple[str, Optional[str]]] = DEFAULT_ORTAK) -> None:
+        if not prefixes:
+            raise ValueError("Site profilinde daire öneki yok")
+        self.name = name
+        self.prefixes = [p.strip().upper() for p in prefixes if p.strip()]
+        self.ranges = list(ranges)
+        self.suffixes = suffixes
+        self.ortak = [(k.strip().upper(), v) for k, v in ortak if k.strip()]
+
+        # daire sütunu: ^(önek)\s+(numara)(ek)?$
+        prefix = '|'.join(re.escape(p) for p in sorted(self.prefixes, key=len, reverse=True))
+        suffix = f"([{re.escape(suffixes)}])?" if suffixes else ""
+        self._unit_regex = re.compile(rf"^(?:{prefix})\s+(\d+){suffix}$")
+        self._numbers = frozenset(n for low, high in self.ranges for n in range(low, high + 1))
+
+        # ortak alanlar: tüm anahtar kelimeler tek ifadede; ileri bakış (lookahead)
+        # sayesinde iç içe geçen eşleşmeler de bulunur. Numara veren kelimeler
+        # öne alınır ki aynı konumda eşleşen numarasız kelime onları gizlemesin.
+        keyed = [(k, v) for k, v in self.ortak if v]
+        unkeyed = [(k, v) for k, v in self.ortak if not v]
+        self._ortak_order = keyed + unkeyed
+        alternatives = '|'.join(f"({re.escape(k)})" for k, _ in self._ortak_order)
+        self._ortak_regex = re.compile(f"(?=(?:{alternatives}))") if self._ortak_order else None
+        # öncelik: profil dosyasındaki sıra (ilk numara veren kelime geçerli)
+        self._priority = {k: idx for idx, (k, _) in enumerate(self.ortak)}
+
+        self._names: Dict[str, ColumnClass] = {}
+        self._headers: Dict[Tuple[str, ...], List[ColumnClass]] = {}
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'SiteProfile':
+        """`site_profili.ini` biçimindeki dosyayı okur."""
+        parser = configparser.ConfigParser(allow_no_value=True, delimiters=('=',),
+                                           comment_prefixes=('#', ';'), interpolation=None)
+        parser.optionxform = str  # anahtar kelimeler büyük harf kalsın
+        with open(path, 'r', encoding='utf-8-sig') as f:
+            parser.read_file(f)
+        daire = parser['daire'] if parser.has_section('daire') else {}
+        prefixes = [p for p in daire.get('onek', 'DAIRE').split(',')]
+        ranges = _parse_ranges(daire.get('numaralar', '1-80'))
+        suffixes = _parse_suffixes(daire.get('ekler', 'A-F') or '')
+        ortak: List[Tuple[str, Optional[str]]] = list(DEFAULT_ORTAK)
+        if parser.has_section('ortak'):
+            ortak = [(k, (v or '').strip() or None) for k, v in parser.items('ortak')]
+        name = parser.get('site', 'ad', fallback=Path(path).stem)
+        return cls(name, prefixes, ranges, suffixes, ortak)
+
+    def classify(self, column: str) -> ColumnClass:
+        """Sütun adını sınıflandırır (ad bazında önbellekli)."""
+        cached = self._names.get(column)
+        if cached is not None:
+            return cached
+
+        name = column.strip()
+        upper = name.upper()
+        key_word: Optional[str] = None
+        is_ortak = False
+        if self._ortak_regex is not None:
+            best = len(self._priority)
+            for match in self._ortak_regex.finditer(upper):
+                is_ortak = True
+                word, number = self._ortak_order[match.lastindex - 1]
+                if number and self._priority[word] < best:
+                    best, key_word = self._priority[word], number
+
+        unit = self._unit_regex.match(upper)
+        if unit:
+            selected = int(unit.group(1)) in self._numbers
+        else:
+            selected = is_ortak
+
+        if key_word is not None:
+            key: object = key_word
+        else:
+            digits = _DIGITS_REGEX.search(upper)
+            key = int(digits.group(1)) if digits else upper
+        result = ColumnClass(selected, name, key, 'ORTAK' if is_ortak else 'SÜİT')
+        self._names[column] = result
+        return result
+
+    def classify_header(self, columns: Sequence[str]) -> List[ColumnClass]:
+        """Başlıktaki tüm sütunları sınıflandırır (başlık imzası bazında önbellekli)."""
+        signature = tuple(columns)
+        cached = self._headers.get(signature)
+        if cached is not None:
+            return cached
+        result = [self.classify(c) for c in signature]
+        if len(self._headers) >= _HEADER_CACHE_SIZE:
+            self._headers.pop(next(iter(self._headers)))
+        self._headers[signature] = result
+        return result
+
+    def data_columns(self, columns: Sequence[str]) -> List[str]:
+        """Başlıktaki daire/ortak veri sütunları (dosyadaki sırayla)."""
+        return [c for c, info in zip(columns, self.classify_header(columns)) if info.selected]
+
+
+def load_site_profile(path: Optional[Union[str, Path]] = None) -> SiteProfile:
+    """`path` (yoksa modül dizinindeki `site_profili.ini`) profilini okur.
+
+    Dosya bulunamazsa varsayılan profil döner.
+    """
+    profile_file = Path(path) if path else Path(__file__).parent / PROFILE_FILE_NAME
+    if not profile_file.exists():
+        if path:
+            raise FileNotFoundError(f"Site profili bulunamadı: {profile_file}")
+        return SiteProfile("Varsayılan")
+    return SiteProfile.load(profile_file)
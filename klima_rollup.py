@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Klima Aylık Tüketim Raporu - Dönemsel Toplam Küpü
+Folkart Blu Çeşme Yönetimi İçin
+
+Saatlik PPD matrisinden (`PPDHourly`) bir kez hesaplanan küçük bir
+toplam küpü: daire × {günün saati, gün, ISO hafta, ay} kWh toplamları ve
+her dönem için SÜİT/ORTAK ara toplamları. Özet istatistikleri de küp
+oluşturulurken hesaplanır.
+
+Küp raporun yanına `ısıtma_sogutma_kup.npz` olarak kaydedilir. Dönemsel
+dökümler, özet ve yıllık karşılaştırmalar bu dosyadan okunur; PPD
+dosyası tekrar taranmaz. 1 yıllık veri için küp yaklaşık 100 KB'tır.
+
+Kullanım:
+    python klima_rollup.py build PPD_01012026_31122026.csv -o raporlar
+    python klima_rollup.py show raporlar/ısıtma_sogutma_kup.npz --level ay
+    python klima_rollup.py compare kup_2026.npz kup_2025.npz --level ay
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+CUBE_FILE_NAME = "ısıtma_sogutma_kup.npz"
+_CUBE_VERSION = 1
+
+# Dönem düzeyi -> açıklama; etiketlerin sözlük sırası zaman sırasıdır
+LEVELS: Dict[str, str] = {
+    'saat': "Günün saati",
+    'gun': "Gün",
+    'hafta': "ISO hafta",
+    'ay': "Ay",
+}
+TYPES = ('SÜİT', 'ORTAK')
+
+
+def period_labels(timestamps: pd.DatetimeIndex, level: str) -> np.ndarray:
+    """Her saatin `level` dönem etiketi: '07', '2026-01-31', '2026-W05', '2026-01'."""
+    if level == 'saat':
+        return np.char.zfill(timestamps.hour.to_numpy().astype(str), 2)
+    if level == 'gun':
+        return np.asarray(timestamps.strftime('%Y-%m-%d'))
+    if level == 'hafta':
+        iso = timestamps.isocalendar()
+        return (iso['year'].astype(str) + '-W' + iso['week'].astype(str).str.zfill(2)).to_numpy()
+    if level == 'ay':
+        return np.asarray(timestamps.strftime('%Y-%m'))
+    raise ValueError(f"Bilinmeyen dönem düzeyi: {level} ({', '.join(LEVELS)})")
+
+
+def _season_label(label: str, level: str) -> str:
+    """Yıllık karşılaştırma için yılı atılmış etiket: '2026-01' -> '01'."""
+    return label if level == 'saat' else label.split('-', 1)[1]
+
+
+class RollupCube:
+    """Daire × dönem kWh toplamları ve ara toplamlar.
+
+    * `names`, `keys`, `types`: daire eksenleri (`PPDHourly` grup sırası)
+    * `periods[level]`: dönem etiketleri, `hours[level]`: dönemdeki saat sayısı
+    * `kwh[level]`: (dönem × daire) kWh matrisi
+    * `totals`: daire başına tüm dönem kWh toplamı
+    * `skipped`: zamanı çözülemediği için hiçbir döneme girmeyen saat sayısı
+    """
+
+    def __init__(self, names: List[str], keys: List[Any], types: List[str],
+                 periods: Dict[str, np.ndarray], hours: Dict[str, np.ndarray],
+                 kwh: Dict[str, np.ndarray], source: str = "", skipped: int = 0) -> None:
+        self.names = names
+        self.keys = keys
+        self.types = types
+        self.periods = periods
+        self.hours = hours
+        self.kwh = kwh
+        self.source = source
+        self.skipped = skipped
+        # ay düzeyi tüm saatleri kapsar; daire toplamları oradan
+        self.totals: np.ndarray = kwh['ay'].sum(axis=0)
+        types_arr = np.array(types, dtype=object)
+        # (daire × tip) gösterge matrisi: ara toplamlar tek matris çarpımı
+        self._type_indicator = np.stack(
+            [(types_arr == t).astype(np.float64) for t in TYPES], axis=1)
+        self.type_kwh = {level: matrix @ self._type_indicator for level, matrix in kwh.items()}
+        self._summary = self._build_summary()
+
+    @classmethod
+    def build(cls, hourly: Any, source: str = "") -> 'RollupCube':
+        """`PPDHourly` matrisinden küpü hesaplar (her düzey için tek gruplama).
+
+        Zamanı çözülemeyen saatler (`NaT`) hiçbir döneme girmez; sayıları
+        `skipped`'ta tutulur.
+        """
+        if hourly.timestamps is None:
+            raise ValueError("Zaman damgaları çözülemedi; dönemsel küp oluşturulamaz")
+        valid = ~np.asarray(hourly.timestamps.isna())
+        if not valid.any():
+            raise ValueError("Zaman damgaları çözülemedi; dönemsel küp oluşturulamaz")
+        timestamps = hourly.timestamps[valid]
+        values = np.asarray(hourly.values)
+        if not valid.all():
+            values = values[valid]
+        grouped = np.asarray(values, dtype=np.float64) @ hourly.indicator.astype(np.float64)
+        grouped /= 1000
+        periods: Dict[str, np.ndarray] = {}
+        hours: Dict[str, np.ndarray] = {}
+        kwh: Dict[str, np.ndarray] = {}
+        for level in LEVELS:
+            codes, labels = pd.factorize(period_labels(timestamps, level), sort=True)
+            sums = pd.DataFrame(grouped).groupby(codes).sum().to_numpy()
+            periods[level] = np.asarray(labels, dtype=str)
+            hours[level] = np.bincount(codes, minlength=len(labels))
+            kwh[level] = sums
+        return cls(list(hourly.group_names), list(hourly.group_keys), list(hourly.group_types),
+                   periods, hours, kwh, source, int((~valid).sum()))
+
+    def _build_summary(self) -> Dict[str, Any]:
+        totals = self.totals
+        summary: Dict[str, Any] = {
+            'Toplam Alan': len(self.names),
+            'Genel Aylık Toplam (kWh)': totals.sum(),
+            'Ortalama (kWh)': totals.mean(),
+            'En Yüksek (kWh)': totals.max(),
+            'En Düşük (kWh)': totals.min(),
+        }
+        types = np.array(self.types, dtype=object)
+        for dtype in dict.fromkeys(self.types):
+            mask = types == dtype
+            summary[f'{dtype} - Toplam (kWh)'] = totals[mask].sum()
+            summary[f'{dtype} - Sayı'] = int(mask.sum())
+        return summary
+
+    def summary(self) -> Dict[str, Any]:
+        """`create_summary` ile aynı anahtarlarda özet (önceden hesaplanmış)."""
+        return dict(self._summary)
+
+    def breakdown(self, level: str = 'ay') -> pd.DataFrame:
+        """(dönem × daire) kWh tablosu."""
+        self._check_level(level)
+        return pd.DataFrame(self.kwh[level], index=pd.Index(self.periods[level], name='DÖNEM'),
+                            columns=self.names)
+
+    def type_breakdown(self, level: str = 'ay') -> pd.DataFrame:
+        """(dönem × tip) kWh tablosu ve dönemdeki saat sayısı."""
+        self._check_level(level)
+        frame = pd.DataFrame(self.type_kwh[level], columns=list(TYPES),
+                             index=pd.Index(self.periods[level], name='DÖNEM'))
+        frame['TOPLAM'] = frame[list(TYPES)].sum(axis=1)
+        frame['SAAT'] = self.hours[level]
+        return frame
+
+    def year_over_year(self, previous: 'RollupCube', level: str = 'ay') -> pd.DataFrame:
+        """Daire bazında önceki yılın aynı dönemleriyle karşılaştırma.
+
+        Dönemler yılsız etikete göre eşlenir (ay '01', hafta 'W05', gün
+        '01-31'); yalnızca iki küpte de bulunan dönemler toplanır.
+        Daireler ada göre eşlenir; önceki küpte olmayan dairede önceki 0'dır.
+        """
+        self._check_level(level)
+        current = self._season_totals(level)
+        before = previous._season_totals(level)
+        common = [s for s in current.index if s in before.index]
+        now_kwh = current.loc[common].sum(axis=0)
+        old_kwh = before.loc[common].sum(axis=0).reindex(self.names, fill_value=0.0)
+        result = pd.DataFrame({
+            'DAİRE_ADI': self.names,
+            'TİP': self.types,
+            'ÖNCEKİ_KWH': old_kwh.to_numpy(),
+            'GÜNCEL_KWH': now_kwh.to_numpy(),
+        })
+        result['FARK_KWH'] = result['GÜNCEL_KWH'] - result['ÖNCEKİ_KWH']
+        with np.errstate(divide='ignore', invalid='ignore'):
+            change = result['FARK_KWH'] / result['ÖNCEKİ_KWH'] * 100
+        result['DEĞİŞİM_%'] = change.where(result['ÖNCEKİ_KWH'] > 0).round(1)
+        result.attrs['periods'] = common
+        return result
+
+    def _season_totals(self, level: str) -> pd.DataFrame:
+        seasons = [_season_label(p, level) for p in self.periods[level]]
+        frame = pd.DataFrame(self.kwh[level], index=seasons, columns=self.names)
+        return frame.groupby(level=0, sort=False).sum()
+
+    @staticmethod
+    def _check_level(level: str) -> None:
+        if level not in LEVELS:
+            raise ValueError(f"Bilinmeyen dönem düzeyi: {level} ({', '.join(LEVELS)})")
+
+    def save(self, path: Union[str, Path]) -> Path:
+        """Küpü sıkıştırılmış `.npz` olarak yazar (pickle kullanılmaz)."""
+        path = Path(path)
+        meta = {'version': _CUBE_VERSION, 'source': self.source, 'keys': self.keys,
+                'skipped': self.skipped}
+        arrays: Dict[str, np.ndarray] = {
+            'meta': np.array(json.dumps(meta, ensure_ascii=False)),
+            'names': np.array(self.names, dtype=str),
+            'types': np.array(self.types, dtype=str),
+        }
+        for level in LEVELS:
+            arrays[f'{level}_periods'] = self.periods[level]
+            arrays[f'{level}_hours'] = self.hours[level]
+            arrays[f'{level}_kwh'] = self.kwh[level]
+        with open(path, 'wb') as f:
+            np.savez_compressed(f, **arrays)
+        return path
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'RollupCube':
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data['meta']))
+            if meta.get('version') != _CUBE_VERSION:
+                raise ValueError(f"Desteklenmeyen küp sürümü: {path}")
+            return cls(data['names'].tolist(), meta['keys'], data['types'].tolist(),
+                       {level: data[f'{level}_periods'] for level in LEVELS},
+                       {level: data[f'{level}_hours'] for level in LEVELS},
+                       {level: data[f'{level}_kwh'] for level in LEVELS},
+                       meta.get('source', ""), meta.get('skipped', 0))
+
+
+def type_lines(cube: RollupCube, level: str = 'ay', limit: int = 24) -> List[str]:
+    """Dönem başına SÜİT/ORTAK kWh satırları (günlük/arayüz için)."""
+    frame = cube.type_breakdown(level)
+    lines = [f"   {LEVELS[level]:<12} {'SÜİT':>12} {'ORTAK':>10} {'TOPLAM':>12} kWh"]
+    for period, row in frame.tail(limit).iterrows():
+        lines.append(f"   • {period:<10} {row['SÜİT']:12.2f} {row['ORTAK']:10.2f} "
+                     f"{row['TOPLAM']:12.2f}")
+    if len(frame) > limit:
+        lines.insert(1, f"   ... (son {limit} / {len(frame)} dönem)")
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    arg_parser = argparse.ArgumentParser(description="Dönemsel tüketim küpü.")
+    commands = arg_parser.add_subparsers(dest='command', required=True)
+
+    build = commands.add_parser('build', help="PPD dosyasından küp oluştur")
+    build.add_argument('file', help="PPD CSV veya kolonsal (.ppdc) dosya")
+    build.add_argument('-o', '--output', default='.', help="Küpün kaydedileceği dizin")
+
+    show = commands.add_parser('show', help="Küpten dönemsel döküm")
+    show.add_argument('cube', help="Küp dosyası (.npz)")
+    show.add_argument('--level', default='ay', choices=list(LEVELS), help="Dönem düzeyi")
+    show.add_argument('--csv', default=None, help="Daire × dönem tablosunun yazılacağı CSV")
+
+    compare = commands.add_parser('compare', help="İki küpü yıllık karşılaştır")
+    compare.add_argument('cube', help="Güncel küp")
+    compare.add_argument('previous', help="Önceki yılın küpü")
+    compare.add_argument('--level', default='ay', choices=list(LEVELS), help="Dönem düzeyi")
+    compare.add_argument('--csv', default=None, help="Karşılaştırmanın yazılacağı CSV")
+    args = arg_parser.parse_args(argv)
+
+    if args.command == 'build':
+        from klima_final import PPDRawParser
+
+        hourly = PPDRawParser().parse_ppd_hourly(args.file)
+        output_dir = Path(args.output)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        cube = RollupCube.build(hourly, Path(args.file).name)
+        if cube.skipped:
+            print(f"⚠ Zamanı çözülemeyen {cube.skipped} saat küpe alınmadı")
+        path = cube.save(output_dir / CUBE_FILE_NAME)
+        print(f"✓ Küp kaydedildi: {path} ({path.stat().st_size / 1024:.0f} KB)")
+        return 0
+
+    cube = RollupCube.load(args.cube)
+    if args.command == 'show':
+        print(f"\n📅 {cube.source or args.cube}")
+        for line in type_lines(cube, args.level, limit=10 ** 6):
+            print(line)
+        if args.csv:
+            cube.breakdown(args.level).T.to_csv(args.csv, sep=';', encoding='utf-8-sig')
+            print(f"\n✓ Döküm kaydedildi: {args.csv}")
+        return 0
+
+    table = cube.year_over_year(RollupCube.load(args.previous), args.level)
+    periods = table.attrs['periods']
+    print(f"\n📊 YILLIK KARŞILAŞTIRMA ({len(periods)} ortak dönem)")
+    for _, row in table.iterrows():
+        change = '' if pd.isna(row['DEĞİŞİM_%']) else f"{row['DEĞİŞİM_%']:+.1f}%"
+        print(f"   • {row['DAİRE_ADI']:<14} {row['ÖNCEKİ_KWH']:10.2f} → "
+              f"{row['GÜNCEL_KWH']:10.2f} kWh {change}")
+    if args.csv:
+        table.to_csv(args.csv, sep=';', index=False, encoding='utf-8-sig')
+        print(f"\n✓ Karşılaştırma kaydedildi: {args.csv}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Klima Aylık Tüketim Raporu - Yerel Rapor Servisi (HTTP)
+Folkart Blu Çeşme Yönetimi İçin
+
+Yönetim ofisindeki herkesin aynı PPD dosyasını kendi bilgisayarında
+tekrar parse etmesi yerine tek bir süreç raporları HTTP üzerinden sunar.
+Sadece standart kütüphane (`http.server`) kullanılır.
+
+* Parse edilen sonuçlar LRU önbellekte, dosya kimliğine (yol, boyut,
+  değişiklik zamanı) göre tutulur; dosya değişince anahtar da değişir.
+  Önbellek kayıt sayısıyla değil, kayıtların yaklaşık bellek boyutuyla
+  sınırlıdır (tarih aralığı istekleri saatlik matrisleri de saklar).
+* Aynı rapor için eşzamanlı gelen istekler tek bir parse'ı bekler;
+  dosya bir kez okunur.
+* Yalnızca `--root` klasöründeki dosyalar sunulur.
+
+Uç noktalar:
+    GET /files                                  klasördeki PPD dosyaları (JSON)
+    GET /report?file=PPD_...csv                 dosyanın raporu (JSON)
+    GET /report?file=...&start=2026-01-01&end=2026-01-15&format=xlsx
+                                                [start, end) aralığı; json | csv | xlsx
+    GET /report?start=...&end=...               `--db` deposundan aralık raporu
+    GET /stats                                  önbellek istatistikleri
+
+Kullanım:
+    python klima_server.py --root \\\\sunucu\\itm\\ppd
+    python klima_server.py --root gelen/ --port 8765 --numara EKIM.csv --db klima_gecmis.sqlite
+    python klima_server.py --root gelen/ --cache-mb 512
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+from urllib.parse import parse_qs, quote, urlsplit
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from klima_batch import DEFAULT_PATTERN
+from klima_final import PPDHourly, PPDRawParser, PPDResult
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# Önbellek bütçesi (MB): parse sonuçları, saatlik matrisler, dosya içerikleri
+DEFAULT_CACHE_MB = 256
+
+FORMATS = ('json', 'csv', 'xlsx')
+_CONTENT_TYPES = {
+    'json': 'application/json; charset=utf-8',
+    'csv': 'text/csv; charset=utf-8',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+_REPORT_FILES = {'csv': "ısıtma_sogutma.csv", 'xlsx': "ısıtma_sogutma.xlsx"}
+
+# Dosya kimliği: (çözümlenmiş yol, boyut, değişiklik zamanı ns)
+Identity = Tuple[str, int, int]
+
+
+class RequestError(Exception):
+    """İstemci hatası; HTTP durum koduyla birlikte döner."""
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+def approx_nbytes(value: Any) -> int:
+    """Önbellek kaydının yaklaşık bellek boyutu (bayt).
+
+    numpy dizileri, saatlik matrisler ve bayt içerikleri gerçek boyutlarıyla,
+    rapor tablosu dizileriyle sayılır; kalan küçük nesneler `sys.getsizeof`.
+    """
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, (np.ndarray, PPDHourly)):
+        return int(value.nbytes)
+    if isinstance(value, PPDResult):
+        # ad/tip listeleri satır başına küçük dizgelerdir
+        return int(value.wh.nbytes + value.kwh.nbytes) + 100 * len(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(approx_nbytes(v) for v in value.values())
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(approx_nbytes(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    """İş parçacığı güvenli, bellek boyutuyla sınırlı LRU önbellek.
+
+    `get_or_compute` aynı anahtar için eşzamanlı çağrılarda değeri bir
+    kez hesaplar; diğer çağrılar hesaplamanın bitmesini bekler.
+    Hata önbelleğe alınmaz, bekleyenlere iletilir. Kayıtların toplam
+    boyutu (`sizeof`) `max_bytes`'ı aşınca en eski kayıtlar atılır; tek
+    başına bütçeyi aşan değer döndürülür ama saklanmaz.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_MB * 1024 * 1024,
+                 sizeof: Callable[[Any], int] = approx_nbytes) -> None:
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._pending: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            pending = self._pending.get(key)
+            if pending is None:
+                self.misses += 1
+                future: Future = Future()
+                self._pending[key] = future
+            else:
+                self.hits += 1
+        if pending is not None:
+            return pending.result()
+
+        try:
+            value = compute()
+        except BaseException as e:
+            with self._lock:
+                del self._pending[key]
+            future.set_exception(e)
+            raise
+        size = self.sizeof(value)
+        with self._lock:
+            del self._pending[key]
+            if size <= self.max_bytes:
+                self._entries[key] = (value, size)
+                self.nbytes += size
+                while self.nbytes > self.max_bytes:
+                    self.nbytes -= self._entries.popitem(last=False)[1][1]
+        future.set_result(value)
+        return value
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self.nbytes,
+                    'max_bytes': self.max_bytes, 'hits': self.hits, 'misses': self.misses}
+
+
+def file_identity(path: Path) -> Identity:
+    stat = path.stat()
+    return str(path), stat.st_size, stat.st_mtime_ns
+
+
+class ReportService:
+    """PPD raporlarını önbellekli olarak üretir (HTTP'den bağımsız).
+
+    Parser iş parçacığı güvenli olmadığı için parse/dışa aktarma tek
+    kilitle sırayla yapılır; önbellekten sunulan istekler kilidi beklemez.
+    Parser çıktısı parser'ın kendi `quiet` bayrağına göre yazılır.
+    """
+
+    def __init__(self, root: Path, parser: PPDRawParser, db: Optional[Path] = None,
+                 pattern: str = DEFAULT_PATTERN,
+                 max_bytes: int = DEFAULT_CACHE_MB * 1024 * 1024) -> None:
+        self.root = root.resolve()
+        self.parser = parser
+        self.db = db.resolve() if db else None
+        self.pattern = pattern
+        self.cache = LRUCache(max_bytes)
+        self._parser_lock = threading.Lock()
+
+    def files(self) -> List[Dict[str, Any]]:
+        """Kök klasördeki PPD dosyaları (ad, boyut, dönem)."""
+        listing = []
+        for path in sorted(self.root.glob(self.pattern)):
+            if path.is_file():
+                listing.append({'file': path.name, 'size': path.stat().st_size,
+                                'month_year': self.parser.detect_month_year(path)})
+        return listing
+
+    def resolve(self, name: str) -> Path:
+        """İstekteki dosya adını kök klasör içindeki bir dosyaya çevirir."""
+        path = (self.root / name).resolve()
+        if path.parent != self.root and self.root not in path.parents:
+            raise RequestError(403, f"Klasör dışındaki dosya istenemez: {name}")
+        if not path.is_file():
+            raise RequestError(404, f"Dosya bulunamadı: {name}")
+        return path
+
+    def _locked(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        with self._parser_lock:
+            return func(*args, **kwargs)
+
+    def _source_identity(self, name: Optional[str]) -> Tuple[Any, ...]:
+        if name:
+            return ('file',) + file_identity(self.resolve(name))
+        if self.db is None:
+            raise RequestError(400, "`file` parametresi gerekli (depo tanımlı değil)")
+        # WAL modunda yazılar önce -wal dosyasına gider; onun imzası da kimliğe girer
+        wal = self.db.with_name(self.db.name + '-wal')
+        return ('db',) + file_identity(self.db) + (file_identity(wal) if wal.exists() else ())
+
+    def report(self, name: Optional[str] = None, start: Optional[str] = None,
+               end: Optional[str] = None) -> Tuple[PPDResult, Dict[str, Any], Tuple[Any, ...]]:
+        """(sonuç, özet, önbellek anahtarı); dosya değişmedikçe tekrar parse edilmez."""
+        for bound in (start, end):
+            if bound is not None:
+                try:
+                    pd.Timestamp(bound)
+                except ValueError:
+                    raise RequestError(400, f"Geçersiz tarih: {bound}") from None
+        source = self._source_identity(name)
+        key = source + ('rapor', start, end)
+
+        def compute() -> Tuple[PPDResult, Dict[str, Any]]:
+            if source[0] == 'db':
+                result = self._locked(self._from_store, start, end)
+            elif start is None and end is None:
+                result = self._locked(self.parser.parse_ppd_file, source[1], use_cache=True)
+            else:
+                hourly = self.cache.get_or_compute(
+                    source + ('saatlik',), lambda: self._locked(self.parser.parse_ppd_hourly,
+                                                                source[1]))
+                result = self._locked(self.parser.frame_from_hourly, hourly, start, end)
+            return result, self._locked(self.parser.create_summary, result)
+
+        try:
+            result, summary = self.cache.get_or_compute(key, compute)
+        except ValueError as e:
+            raise RequestError(422, str(e)) from None
+        return result, summary, key
+
+    def _from_store(self, start: Optional[str], end: Optional[str]) -> PPDResult:
+        from klima_store import PPDStore
+        with PPDStore(self.db, parser=self.parser) as store:
+            return self.parser.frame_from_store(store, start, end)
+
+    def render(self, fmt: str, name: Optional[str] = None, start: Optional[str] = None,
+               end: Optional[str] = None) -> bytes:
+        """Raporu `fmt` (json, csv, xlsx) biçiminde döndürür."""
+        if fmt not in FORMATS:
+            raise RequestError(400, f"Bilinmeyen biçim: {fmt} ({', '.join(FORMATS)})")
+        result, summary, key = self.report(name, start, end)
+        if fmt == 'json':
+            return self.cache.get_or_compute(
+                key + ('json',), lambda: self._to_json(result, summary, name, start, end))
+        files = self.cache.get_or_compute(key + ('dosyalar',),
+                                          lambda: self._export(result, summary, name))
+        return files[fmt]
+
+    def _to_json(self, result: PPDResult, summary: Dict[str, Any], name: Optional[str],
+                 start: Optional[str], end: Optional[str]) -> bytes:
+        if self.parser.daire_sirasi:
+            result = self.parser.sort_by_daire_sirasi(result)
+        rows = result.to_frame().to_dict('records')
+        payload = {
+            'file': name,
+            'month_year': self.parser.detect_month_year(name) if name else None,
+            'start': start,
+            'end': end,
+            'summary': summary,
+            'rows': rows,
+        }
+        return _dumps(payload)
+
+    def _export(self, result: PPDResult, summary: Dict[str, Any],
+                name: Optional[str]) -> Dict[str, bytes]:
+        """CSV ve Excel raporunu geçici klasöre yazıp içeriklerini döndürür."""
+        month_year = self.parser.detect_month_year(name) if name else ""
+        with tempfile.TemporaryDirectory(prefix='klima-servis-') as tmp:
+            self._locked(self.parser.export_results, result, summary, month_year, tmp)
+            return {fmt: (Path(tmp) / file_name).read_bytes()
+                    for fmt, file_name in _REPORT_FILES.items()}
+
+
+def _json_default(value: Any) -> Any:
+    # numpy sayıları (özet değerleri, DAİRE_NO)
+    if hasattr(value, 'item'):
+        return value.item()
+    raise TypeError(f"JSON'a çevrilemeyen değer: {value!r}")
+
+
+def _json_safe(value: Any) -> Any:
+    """NaN/sonsuz değerleri null yapar; JSON'da karşılıkları yok."""
+    if isinstance(value, dict):
+        return {k: _json_safe(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(v) for v in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+class ReportRequestHandler(BaseHTTPRequestHandler):
+    server_version = "KlimaRapor/1.0"
+    service: ReportService  # `make_server` sınıf özelliği olarak atar
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        try:
+            if url.path == '/files':
+                self._send(200, 'json', _dumps(self.service.files()))
+            elif url.path == '/stats':
+                self._send(200, 'json', _dumps(self.service.cache.stats()))
+            elif url.path == '/report':
+                fmt = query.get('format', 'json')
+                body = self.service.render(fmt, query.get('file'), query.get('start'),
+                                           query.get('end'))
+                self._send(200, fmt, body, _REPORT_FILES.get(fmt))
+            else:
+                raise RequestError(404, f"Bilinmeyen adres: {url.path}")
+        except RequestError as e:
+            self._send(e.status, 'json', _dumps({'error': str(e)}))
+        except Exception as e:
+            self.log_error("Rapor üretilemedi: %s", e)
+            self._send(500, 'json', _dumps({'error': str(e)}))
+
+    def _send(self, status: int, fmt: str, body: bytes,
+              download_name: Optional[str] = None) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', _CONTENT_TYPES[fmt])
+        self.send_header('Content-Length', str(len(body)))
+        if download_name:
+            self.send_header('Content-Disposition',
+                             f"attachment; filename*=UTF-8''{quote(download_name)}")
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _dumps(value: Any) -> bytes:
+    return json.dumps(_json_safe(value), ensure_ascii=False, allow_nan=False,
+                      default=_json_default).encode('utf-8')
+
+
+def make_server(service: ReportService, host: str = DEFAULT_HOST,
+                port: int = DEFAULT_PORT) -> ThreadingHTTPServer:
+    """Servisi sunan (henüz başlatılmamış) çok iş parçacıklı HTTP sunucusu."""
+    handler = type('BoundReportRequestHandler', (ReportRequestHandler,), {'service': service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    arg_parser = argparse.ArgumentParser(
+        description="PPD raporlarını yerel ağda HTTP üzerinden sunar.")
+    arg_parser.add_argument('--root', default='.',
+                            help="PPD dosyalarının bulunduğu klasör (varsayılan: çalışma dizini)")
+    arg_parser.add_argument('--host', default=DEFAULT_HOST,
+                            help=f"Dinlenecek adres (varsayılan: {DEFAULT_HOST}; "
+                                 "ofis ağı için 0.0.0.0)")
+    arg_parser.add_argument('--port', type=int, default=DEFAULT_PORT,
+                            help=f"Port (varsayılan: {DEFAULT_PORT})")
+    arg_parser.add_argument('--pattern', default=DEFAULT_PATTERN,
+                            help=f"Listelenecek dosya deseni (varsayılan: {DEFAULT_PATTERN})")
+    arg_parser.add_argument('--cache-mb', type=int, default=DEFAULT_CACHE_MB,
+                            help=f"Önbellek bütçesi, MB (varsayılan: {DEFAULT_CACHE_MB})")
+    arg_parser.add_argument('--db', default=None,
+                            help="Dosyasız aralık raporları için geçmiş veri deposu (SQLite)")
+    arg_parser.add_argument('--numara', default=None,
+                            help="Eski-yeni numara eşleşmesi için Ekim formatındaki CSV")
+    arg_parser.add_argument('-v', '--verbose', action='store_true',
+                            help="Parser çıktısını da göster")
+    args = arg_parser.parse_args(argv)
+
+    root = Path(args.root)
+    if not root.is_dir():
+        print(f"⚠ Klasör bulunamadı: {root}")
+        return 1
+    quiet = not args.verbose
+    parser = PPDRawParser(quiet=quiet)
+    if args.numara and not parser.load_numara_mapping(args.numara):
+        print(f"⚠ Numara eşleşmesi yüklenemedi: {args.numara}")
+        return 1
+
+    service = ReportService(root, parser, Path(args.db) if args.db else None,
+                            args.pattern, args.cache_mb * 1024 * 1024)
+    server = make_server(service, args.host, args.port)
+    print(f"🌐 Rapor servisi: http://{args.host}:{server.server_address[1]}/files "
+          f"({service.root})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nServis durduruldu")
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Klima Aylık Tüketim Raporu - Geçmiş Veri Deposu (SQLite)
+Folkart Blu Çeşme Yönetimi İçin
+
+Parse edilen PPD dosyalarının saatlik okumalarını yerel bir SQLite
+veritabanında saklar; böylece herhangi bir tarih aralığının raporu eski
+CSV dosyaları bulunup tekrar okunmadan, doğrudan veritabanından alınır.
+
+Şema:
+    daire        (id, name, daire_no, type)       DAIRE 1, LOBI ...
+    unit         (id, name, daire_id)             PPD sütunu: DAIRE 1A ...
+    reading      (unit_id, ts, wh, src_ts)        saatlik okuma, anahtar (birim, zaman)
+    reading_day  (unit_id, day, wh, frac)         günlük toplamlar (aralık sorguları için)
+    source_file  (path, size, mtime, ...)         eklenen dosyalar
+
+Çakışan dönemleri içeren bir dosya tekrar eklendiğinde aynı (birim, zaman)
+okumaları çoğaltılmaz; `merge_hourly`'deki gibi son okuması en geç olan
+dosyanın değeri geçerli olur (eşitlikte sonra eklenen). Her okumanın
+`src_ts`'i geldiği dosyanın son okuma zamanıdır; eski bir arşiv sonradan
+eklense de daha yeni dışa aktarımın değerlerinin üzerine yazmaz.
+Aralık raporlarında tam günler `reading_day`'den, aralığın başındaki ve
+sonundaki yarım günler `reading`'den toplanır; böylece bir yıllık rapor
+bile birkaç on bin satır okuyarak milisaniyeler içinde hazırlanır.
+
+Kullanım:
+    python klima_store.py ingest arsiv/PPD_*.csv --db klima_gecmis.sqlite
+    python klima_store.py report --start 2025-01-01 --end 2025-01-08 -o raporlar
+"""
+
+import argparse
+import glob
+import itertools
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from klima_final import PPDHourly, PPDRawParser
+
+DEFAULT_DB = "klima_gecmis.sqlite"
+
+# Tarih aralığı sınırı: metin ('2025-01-01'), datetime veya Timestamp
+DateLike = Union[str, datetime, pd.Timestamp, None]
+
+_DAY = 86400
+# Açık aralık sınırları (epoch saniye)
+_MIN_TS = -(2 ** 62)
+_MAX_TS = 2 ** 62
+
+# `reading`'e (birim, zaman) anahtarıyla erişim: zaman dizini olmadan aralık taraması.
+# Ayrı bir `reading(ts)` dizinini sorgu planı hiç kullanmıyor (birincil anahtar
+# aralığı seçiliyor), eklemeyi ise ~1,8 kat yavaşlatıyor (8760 saat × 192 birim).
+_ALL_UNITS = "unit_id IN (SELECT id FROM unit)"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS daire (
+    id        INTEGER PRIMARY KEY,
+    name      TEXT NOT NULL UNIQUE,
+    daire_no  TEXT NOT NULL,
+    type      TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS daire_no ON daire(daire_no);
+CREATE TABLE IF NOT EXISTS unit (
+    id        INTEGER PRIMARY KEY,
+    name      TEXT NOT NULL UNIQUE,
+    daire_id  INTEGER NOT NULL REFERENCES daire(id)
+);
+CREATE INDEX IF NOT EXISTS unit_daire ON unit(daire_id);
+CREATE TABLE IF NOT EXISTS reading (
+    unit_id   INTEGER NOT NULL REFERENCES unit(id),
+    ts        INTEGER NOT NULL,
+    wh        REAL NOT NULL,
+    src_ts    INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (unit_id, ts)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS reading_day (
+    unit_id   INTEGER NOT NULL REFERENCES unit(id),
+    day       INTEGER NOT NULL,
+    wh        REAL NOT NULL,
+    frac      INTEGER NOT NULL,
+    PRIMARY KEY (unit_id, day)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS source_file (
+    id        INTEGER PRIMARY KEY,
+    path      TEXT NOT NULL,
+    size      INTEGER NOT NULL,
+    mtime     REAL NOT NULL,
+    rows      INTEGER NOT NULL,
+    first_ts  INTEGER,
+    last_ts   INTEGER,
+    exact     INTEGER NOT NULL,
+    ingested  TEXT NOT NULL,
+    UNIQUE (path, size, mtime)
+);
+"""
+
+
+def _to_epoch(value: DateLike) -> Optional[int]:
+    """Tarih sınırını saniye cinsinden zamana çevirir (saat dilimi yok sayılır)."""
+    if value is None or value == '':
+        return None
+    return int(pd.Timestamp(value).value // 10**9)
+
+
+class PPDStore:
+    """Saatlik PPD okumalarının SQLite deposu.
+
+    Zaman damgaları dosyadaki yerel saatle, epoch saniyesi olarak
+    saklanır. Okumalar `parse_ppd_hourly`'den kayıpsız gelir (kesirli
+    Wh değerleri float64 olarak okunur) ve REAL sütunda saklanır.
+    """
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_DB,
+                 parser: Optional[PPDRawParser] = None) -> None:
+        self.path = Path(path)
+        self.parser = parser or PPDRawParser()
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(_SCHEMA)
+        self._migrate()
+
+    def _migrate(self) -> None:
+        """`src_ts` sütunu olmayan eski depoları günceller.
+
+        Eski okumaların hangi dosyadan geldiği bilinmediği için her okumaya
+        onu kapsayan dosyaların en geç son okuma zamanı verilir; böylece eski
+        bir arşiv tekrar eklense de mevcut değerlerin üzerine yazılmaz.
+        """
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(reading)")]
+        if 'src_ts' in columns:
+            return
+        with self.conn:
+            self.conn.execute("ALTER TABLE reading ADD COLUMN src_ts INTEGER NOT NULL DEFAULT 0")
+            self.conn.execute(
+                "UPDATE reading SET src_ts = COALESCE((SELECT MAX(last_ts) FROM source_file "
+                "WHERE first_ts <= reading.ts AND last_ts >= reading.ts), 0)")
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "PPDStore":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _print(self, *args: Any, **kwargs: Any) -> None:
+        # ayrıştırıcının `quiet` ayarına uyar (toplu iş, izleyici, sunucu)
+        self.parser._print(*args, **kwargs)
+
+    # -- ekleme -------------------------------------------------------------
+
+    def ingest(self, file_path: Union[str, Path], force: bool = False) -> int:
+        """PPD dosyasını saatlik olarak okuyup depoya ekler.
+
+        Aynı dosya (yol, boyut, değişiklik zamanı) daha önce eklendiyse
+        `force` verilmedikçe atlanır. Yazılan okuma sayısını döndürür.
+        """
+        path = Path(file_path).resolve()
+        stat = path.stat()
+        if not force and self.conn.execute(
+                "SELECT 1 FROM source_file WHERE path = ? AND size = ? AND mtime = ?",
+                (str(path), stat.st_size, stat.st_mtime)).fetchone():
+            self._print(f"✓ Zaten depoda: {path.name}")
+            return 0
+        hourly = self.parser.parse_ppd_hourly(path)
+        return self.ingest_hourly(hourly, path, stat.st_size, stat.st_mtime)
+
+    def ingest_hourly(self, hourly: PPDHourly, source: Union[str, Path] = '',
+                      size: int = 0, mtime: float = 0.0) -> int:
+        """Saatlik matrisi depoya yazar; yazılan okuma sayısını döndürür.
+
+        Aynı (birim, zaman) okuması varsa, yalnızca mevcut okumanın geldiği
+        dosya bu dosyadan daha erken bitiyorsa (veya aynı anda) üzerine
+        yazılır; daha yeni dışa aktarımın okumaları korunur.
+        """
+        if hourly.timestamps is None:
+            raise ValueError("PPD dosyasında zaman damgası bulunamadı, depoya eklenemez")
+        valid = ~np.asarray(hourly.timestamps.isna())
+        if not valid.all():
+            self._print(f"⚠ Zamanı çözülemeyen {int((~valid).sum())} satır atlandı")
+        ts = hourly.timestamps[valid].to_numpy().astype('datetime64[s]').astype(np.int64)
+        values = hourly.values[valid]
+        hours = len(ts)
+        # dosyanın son okuması: çakışmalarda hangi değerin kalacağını belirler
+        src_ts = int(ts.max()) if hours else 0
+
+        start = time.perf_counter()
+        with self.conn:
+            unit_ids = np.asarray(self._unit_ids(hourly), dtype=np.int64)
+            # birincil anahtar (birim, zaman) sırasında yaz: B-ağacına sıralı ekleme
+            rows = zip(np.repeat(unit_ids, hours).tolist(),
+                       np.tile(ts, len(unit_ids)).tolist(),
+                       values.T.astype(np.float64).ravel().tolist(),
+                       itertools.repeat(src_ts))
+            changes = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT INTO reading (unit_id, ts, wh, src_ts) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (unit_id, ts) DO UPDATE SET wh = excluded.wh, src_ts = excluded.src_ts "
+                "WHERE excluded.src_ts >= reading.src_ts", rows)
+            count = self.conn.total_changes - changes
+            if hours:
+                self._refresh_days(int(ts.min()), int(ts.max()))
+            self.conn.execute(
+                "INSERT OR REPLACE INTO source_file "
+                "(path, size, mtime, rows, first_ts, last_ts, exact, ingested) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (str(source), size, mtime, hours,
+                 int(ts.min()) if hours else None, int(ts.max()) if hours else None,
+                 int(hourly.exact), datetime.now().isoformat(timespec='seconds')))
+        kept = hours * len(unit_ids) - count
+        self._print(f"✓ Depoya {count} okuma yazıldı ({time.perf_counter() - start:.2f} sn)"
+                    + (f", daha yeni dosyadan gelen {kept} okuma korundu" if kept else ""))
+        return count
+
+    def _refresh_days(self, first_ts: int, last_ts: int) -> None:
+        """[first_ts, last_ts] aralığına değen günlerin toplamlarını yeniden hesaplar."""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO reading_day (unit_id, day, wh, frac) "
+            f"SELECT unit_id, ts - ts % {_DAY}, SUM(wh), SUM(wh <> ROUND(wh)) FROM reading "
+            f"WHERE {_ALL_UNITS} AND ts >= ? AND ts < ? GROUP BY unit_id, ts - ts % {_DAY}",
+            (first_ts - first_ts % _DAY, last_ts - last_ts % _DAY + _DAY))
+
+    def _unit_ids(self, hourly: PPDHourly) -> List[int]:
+        """Birim ve daire kayıtlarını oluşturur; birimlerin id'lerini sırayla döndürür."""
+        daire_ids: List[int] = []
+        for name, key, typ in zip(hourly.group_names, hourly.group_keys, hourly.group_types):
+            self.conn.execute(
+                "INSERT INTO daire (name, daire_no, type) VALUES (?, ?, ?) "
+                "ON CONFLICT (name) DO NOTHING", (name, str(key), typ))
+            daire_ids.append(self.conn.execute(
+                "SELECT id FROM daire WHERE name = ?", (name,)).fetchone()[0])
+
+        groups = hourly.indicator.argmax(axis=1)
+        unit_ids: List[int] = []
+        for unit, group in zip(hourly.units, groups):
+            self.conn.execute(
+                "INSERT INTO unit (name, daire_id) VALUES (?, ?) "
+                "ON CONFLICT (name) DO UPDATE SET daire_id = excluded.daire_id",
+                (unit, daire_ids[group]))
+            unit_ids.append(self.conn.execute(
+                "SELECT id FROM unit WHERE name = ?", (unit,)).fetchone()[0])
+        return unit_ids
+
+    # -- sorgular -----------------------------------------------------------
+
+    @staticmethod
+    def _bounds(start: DateLike, end: DateLike) -> Tuple[int, int]:
+        """[start, end) sınırları; boş sınırlar açık kalır."""
+        lo, hi = _to_epoch(start), _to_epoch(end)
+        return (_MIN_TS if lo is None else lo), (_MAX_TS if hi is None else hi)
+
+    def unit_totals(self, start: DateLike = None, end: DateLike = None) -> pd.Series:
+        """[start, end) aralığındaki birim bazlı Wh toplamları.
+
+        `parse_ppd_file`'daki gibi tüm okumalar tam sayıysa ve aralığa
+        giren dosyalarda eksik hücre yoksa toplamlar int64 döner.
+        """
+        lo, hi = self._bounds(start, end)
+        hourly_sql = (f"SELECT unit_id, wh, wh <> ROUND(wh) AS frac FROM reading "
+                      f"WHERE {_ALL_UNITS} AND ts >= ? AND ts < ?")
+        # tam günler günlük tablodan, baştaki/sondaki yarım günler saatlik tablodan
+        day_lo = -(-lo // _DAY) * _DAY
+        day_hi = hi // _DAY * _DAY
+        if day_lo < day_hi:
+            parts = [f"SELECT unit_id, wh, frac FROM reading_day "
+                     f"WHERE {_ALL_UNITS} AND day >= ? AND day < ?", hourly_sql, hourly_sql]
+            params = [day_lo, day_hi, lo, day_lo, day_hi, hi]
+        else:
+            parts, params = [hourly_sql], [lo, hi]
+
+        rows = self.conn.execute(
+            "SELECT u.name, SUM(x.wh), SUM(x.frac) "
+            f"FROM ({' UNION ALL '.join(parts)}) x JOIN unit u ON u.id = x.unit_id "
+            "GROUP BY u.id ORDER BY u.id", params).fetchall()
+        if not rows:
+            raise ValueError("Seçilen tarih aralığında depoda okuma yok")
+
+        totals = pd.Series([r[1] for r in rows], index=[r[0] for r in rows], dtype='float64')
+        if any(r[2] for r in rows) or not self._files_exact(lo, hi):
+            return totals
+        return totals.astype('int64')
+
+    def _files_exact(self, lo: int, hi: int) -> bool:
+        """Aralıkla çakışan kaynak dosyaların hepsi eksiksiz mi okundu?"""
+        row = self.conn.execute(
+            "SELECT MIN(exact) FROM source_file WHERE last_ts >= ? AND first_ts < ?",
+            (lo, hi)).fetchone()
+        return row[0] is None or bool(row[0])
+
+    def daire_hourly(self, daire_no: Any, start: DateLike = None,
+                     end: DateLike = None) -> pd.Series:
+        """Bir dairenin (tüm birimlerinin toplamı) saatlik Wh serisi."""
+        lo, hi = self._bounds(start, end)
+        rows = self.conn.execute(
+            "SELECT ts, SUM(wh) FROM reading "
+            "WHERE unit_id IN (SELECT u.id FROM unit u JOIN daire d ON d.id = u.daire_id "
+            "                  WHERE d.daire_no = ?) "
+            "AND ts >= ? AND ts < ? GROUP BY ts ORDER BY ts",
+            (str(daire_no), lo, hi)).fetchall()
+        index = pd.to_datetime([r[0] for r in rows], unit='s')
+        return pd.Series([r[1] for r in rows], index=index, name=str(daire_no), dtype='float64')
+
+    def coverage(self) -> Tuple[Optional[pd.Timestamp], Optional[pd.Timestamp]]:
+        """Depodaki ilk ve son okuma zamanı."""
+        first, last = self.conn.execute(
+            "SELECT MIN(first_ts), MAX(last_ts) FROM source_file").fetchone()
+        if first is None:
+            return None, None
+        return pd.Timestamp(first, unit='s'), pd.Timestamp(last, unit='s')
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    arg_parser = argparse.ArgumentParser(description="PPD geçmiş veri deposu (SQLite).")
+    arg_parser.add_argument('--db', default=DEFAULT_DB,
+                            help=f"Veritabanı dosyası (varsayılan: {DEFAULT_DB})")
+    commands = arg_parser.add_subparsers(dest='command', required=True)
+
+    ingest = commands.add_parser('ingest', help="PPD dosyalarını depoya ekle")
+    ingest.add_argument('inputs', nargs='+', help="PPD dosyaları veya glob deseni")
+    ingest.add_argument('--force', action='store_true',
+                        help="Daha önce eklenmiş dosyaları da tekrar ekle")
+
+    report = commands.add_parser('report', help="Tarih aralığı için rapor oluştur")
+    report.add_argument('--start', default=None, help="Başlangıç (dahil), örn. 2025-01-01")
+    report.add_argument('--end', default=None, help="Bitiş (hariç), örn. 2025-02-01")
+    report.add_argument('-o', '--output', default='.', help="Raporların kaydedileceği dizin")
+    args = arg_parser.parse_args(argv)
+
+    with PPDStore(args.db) as store:
+        if args.command == 'ingest':
+            files = sorted({Path(p) for item in args.inputs for p in glob.glob(item)})
+            if not files:
+                print("⚠ Eklenecek PPD dosyası bulunamadı")
+                return 1
+            for file_path in files:
+                store.ingest(file_path, force=args.force)
+            first, last = store.coverage()
+            print(f"✓ Depo aralığı: {first} → {last}")
+            return 0
+
+        start = time.perf_counter()
+        result = store.parser.frame_from_store(store, args.start, args.end)
+        print(f"✓ Depodan okundu ({(time.perf_counter() - start) * 1000:.0f} ms)")
+        output_dir = Path(args.output)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        label = f"{args.start or 'ilk'}_{args.end or 'son'}"
+        summary = store.parser.create_summary(result)
+        store.parser.export_results(result, summary, label, output_dir=output_dir)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Klima Aylık Tüketim Raporu - Sentetik PPD Üretici
+Folkart Blu Çeşme Yönetimi İçin
+
+Gerçek PPD düzeninde test/benchmark dosyaları üretir: 6 satır ön bilgi,
+7. satırda başlık, `;` ayraç, `Tarih;Saat` zaman sütunları, `DAIRE NNX`
+birim sütunları, ORTAK alanlar ve klimayla ilgisiz bir durum sütunu.
+
+Kullanım:
+    python klima_synth.py PPD_01012026_31012026.csv --hours 730 --units 192
+    python klima_synth.py yillik.csv --hours 8760 --sparsity 0.05 --sayac sayac.xlsx
+"""
+
+import argparse
+import math
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Union
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+
+# Gerçek dosyalardaki ortak alan sütunları
+ORTAK_COLUMNS = ['LOBI', 'YONETIM', 'FITNESS', 'MUTFAK', 'P.O', 'BAYBAYAN']
+
+# Bir seferde yazılan satır sayısı (üretici belleği sabit kalsın)
+_WRITE_BLOCK = 8760
+
+_SUFFIXES = "ABCDEF"
+_MAX_DAIRE = 80
+
+
+def unit_columns(units: int) -> List[str]:
+    """`units` adet `DAIRE NNX` sütun adı üretir (1-80 arası daireler).
+
+    Birimler dairelere eşit dağıtılır; daire başına en fazla 6 birim
+    (A-F) olabilir.
+    """
+    if units < 1:
+        raise ValueError("Birim sayısı en az 1 olmalı")
+    per_daire = math.ceil(units / _MAX_DAIRE)
+    if per_daire > len(_SUFFIXES):
+        raise ValueError(f"En fazla {_MAX_DAIRE * len(_SUFFIXES)} birim üretilebilir")
+    names = [f"DAIRE {num}{suffix}"
+             for num in range(1, _MAX_DAIRE + 1)
+             for suffix in _SUFFIXES[:per_daire]]
+    return names[:units]
+
+
+def generate_ppd(path: Union[str, Path], hours: int = 730, units: int = 192,
+                 sparsity: float = 0.02, start: Optional[datetime] = None,
+                 seed: int = 0, decimals: int = 0) -> Path:
+    """Sentetik bir PPD CSV dosyası yazar ve yolunu döndürür.
+
+    * `hours`: veri satırı sayısı (saatlik)
+    * `units`: daire birimi sütun sayısı (ORTAK sütunlar hariç)
+    * `sparsity`: boş bırakılan hücre oranı (0-1)
+    * `decimals`: Wh değerlerinin ondalık basamağı (0: tam sayı, gerçek
+      dosyalardaki gibi; bazı cihazlar kesirli Wh yazar)
+    """
+    path = Path(path)
+    start = start or datetime(2026, 1, 1)
+    rng = np.random.default_rng(seed)
+    daire_cols = unit_columns(units)
+    # klimayla ilgisi olmayan bir sütunu birimlerin arasına koy (gerçek dosyalardaki gibi)
+    middle = len(daire_cols) // 2
+    value_cols = daire_cols + ORTAK_COLUMNS
+    header = ['Tarih', 'Saat'] + daire_cols[:middle] + ['Durum'] + daire_cols[middle:] + ORTAK_COLUMNS
+    end = start + pd.Timedelta(hours=max(hours - 1, 0))
+
+    # her birimin kendine has ortalama tüketimi (Wh/saat)
+    base_load = rng.uniform(5, 60, size=len(value_cols))
+
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        f.write("intelligent Touch Manager\n")
+        f.write("PPD (Power Proportional Distribution) Data\n")
+        f.write("Site;Folkart Blu Çeşme\n")
+        f.write(f"Period;{start:%d/%m/%Y %H:%M};{end:%d/%m/%Y %H:%M}\n")
+        f.write("Unit;Wh\n")
+        f.write("Interval;60 min\n")
+        f.write(";".join(header) + "\n")
+
+        for block_start in range(0, hours, _WRITE_BLOCK):
+            count = min(_WRITE_BLOCK, hours - block_start)
+            stamps = pd.date_range(start + pd.Timedelta(hours=block_start), periods=count, freq='h')
+            # gündüz/gece döngüsü + rastgele dalgalanma
+            daily = 1.0 + 0.5 * np.sin((stamps.hour.to_numpy() - 6) / 24 * 2 * np.pi)
+            values = rng.poisson(base_load[None, :] * daily[:, None]).astype(np.float64)
+            if decimals > 0:
+                values = np.round(values + rng.random(values.shape), decimals)
+            if sparsity > 0:
+                values[rng.random(values.shape) < sparsity] = np.nan
+
+            block = pd.DataFrame(values, columns=value_cols)
+            block.insert(0, 'Tarih', stamps.strftime('%d/%m/%Y'))
+            block.insert(1, 'Saat', stamps.strftime('%H:%M'))
+            block.insert(2 + middle, 'Durum', 'OK')
+            block.to_csv(f, sep=';', header=False, index=False, float_format=f'%.{decimals}f',
+                         lineterminator='\n')
+    return path
+
+
+def generate_sayac_workbook(path: Union[str, Path], daire_count: int = _MAX_DAIRE,
+                            seed: int = 0) -> Path:
+    """`load_subat_sayac_data` düzeninde sentetik sayaç çalışma kitabı yazar.
+
+    Veriler 10. satırdan başlar: B = eski no, C = yeni no, D = durum,
+    G = tüketim.
+    """
+    path = Path(path)
+    rng = np.random.default_rng(seed)
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Sayaç Okumaları"
+    ws['A1'] = "ŞUBAT KLİMA SAYAÇ OKUMALARI"
+    for idx in range(daire_count):
+        row = 10 + idx
+        ws.cell(row, 2).value = f"E{idx + 1}"
+        ws.cell(row, 3).value = idx + 1
+        ws.cell(row, 4).value = "DOLU"
+        ws.cell(row, 7).value = round(float(rng.uniform(0, 500)), 2)
+    wb.save(path)
+    return path
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    arg_parser = argparse.ArgumentParser(description="Sentetik PPD dosyası üretir.")
+    arg_parser.add_argument('output', help="Yazılacak PPD CSV dosyası")
+    arg_parser.add_argument('--hours', type=int, default=730, help="Saat (satır) sayısı")
+    arg_parser.add_argument('--units', type=int, default=192, help="Daire birimi sütun sayısı")
+    arg_parser.add_argument('--sparsity', type=float, default=0.02, help="Boş hücre oranı (0-1)")
+    arg_parser.add_argument('--seed', type=int, default=0, help="Rastgele sayı tohumu")
+    arg_parser.add_argument('--decimals', type=int, default=0,
+                            help="Wh değerlerinin ondalık basamağı (varsayılan: 0, tam sayı)")
+    arg_parser.add_argument('--sayac', default=None, help="Ayrıca sayaç çalışma kitabı yaz")
+    args = arg_parser.parse_args(argv)
+
+    path = generate_ppd(args.output, args.hours, args.units, args.sparsity, seed=args.seed,
+                        decimals=args.decimals)
+    print(f"✓ {path} ({path.stat().st_size / 1024 / 1024:.1f} MB)")
+    if args.sayac:
+        print(f"✓ {generate_sayac_workbook(args.sayac, seed=args.seed)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
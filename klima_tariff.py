@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Klima Aylık Tüketim Raporu - Zaman Dilimli Tarife (Tutar Hesabı)
+Folkart Blu Çeşme Yönetimi İçin
+
+Gündüz/puant/gece ve mevsimlik fiyatlarla daire bazlı ısıtma/soğutma
+tutarını saatlik tüketimden hesaplar. Tarife `;` ayraçlı bir CSV'dir
+(Excel'de düzenlenebilir); her satır bir fiyat bandıdır:
+
+    BANT;SAATLER;GÜNLER;BAŞLANGIÇ;BİTİŞ;FİYAT
+    Puant;17-22;;;;4,10
+    Gündüz;06-17;Pzt-Cum;;;3,20
+    Gece;;;;;2,10
+
+* SAATLER: `06-17` = 06:00-17:00 (bitiş hariç); `22-06` gece yarısını
+  geçer. Boşsa tüm gün.
+* GÜNLER: `Pzt-Cum`, `Cmt,Paz` gibi; boşsa her gün.
+* BAŞLANGIÇ/BİTİŞ: `01.11.2025` (tek dönem) veya `01.11` (her yıl
+  tekrar eden mevsim, yıl sonunu geçebilir); ikisi de dahil. Boşsa sınır yok.
+* FİYAT: kWh başına TL (`4,10` veya `4.10`).
+
+Her saat, dosyada ilk eşleşen banda girer (sıra önceliktir); hiçbir
+banda girmeyen saat varsa hata verilir. Son satıra koşulsuz bir bant
+konarak geri kalan tüm saatler (zaman damgası çözülemeyenler dahil)
+ona bağlanabilir.
+
+Hesap tek vektörel geçiştir: saatlerin bant maskesi (saat × bant) bir
+kez üretilip önbelleğe alınır; bant × daire kWh matrisi
+`maske.T @ saatlik_matris @ gösterge` çarpımıdır.
+
+Kullanım:
+    python klima_tariff.py tarife.csv PPD_01012026_31012026.csv
+    python klima_tariff.py tarife.csv arsiv/PPD_2025.ppdc -o tutarlar.csv
+"""
+
+import argparse
+import csv
+import hashlib
+import os
+import re
+import sys
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+CURRENCY = "TL"
+
+# Tutar sütunu (rapor tablolarında daire başına toplam)
+COST_COLUMN = 'TUTAR_TL'
+
+_DAY_NAMES = {
+    'PZT': 0, 'SAL': 1, 'CAR': 2, 'PER': 3, 'CUM': 4, 'CMT': 5, 'CTS': 5, 'PAZ': 6,
+}
+_ASCII = str.maketrans('ÇĞİIÖŞÜçğıiöşü', 'CGIIOSUcgiiosu')
+_HOURS_REGEX = re.compile(r'^(\d{1,2})(?::00)?\s*-\s*(\d{1,2})(?::00)?$')
+_HEADER = ['BANT', 'SAATLER', 'GÜNLER', 'BAŞLANGIÇ', 'BİTİŞ', 'FİYAT']
+# başlık karşılaştırması: 'Bitiş'.upper() 'BITIŞ' verir, bu yüzden ASCII'ye indirilir
+_HEADER_KEYS = [h.translate(_ASCII).upper() for h in _HEADER]
+
+# Aynı tarife nesnesinde saklanan en fazla bant maskesi
+_MASK_CACHE_SIZE = 8
+# Excel'deki tarife sayfasına sığan en fazla bant adı (ad başına kWh + TL sütunu)
+MAX_BAND_NAMES = 12
+
+
+def _parse_hours(text: str) -> Optional[np.ndarray]:
+    """'06-17' -> 24 elemanlı saat maskesi; boşsa None (tüm gün)."""
+    text = text.strip()
+    if not text or text == '*':
+        return None
+    match = _HOURS_REGEX.match(text)
+    if not match:
+        raise ValueError(f"Geçersiz saat aralığı: {text!r} (örnek: 06-17)")
+    start, end = int(match.group(1)), int(match.group(2))
+    if not (0 <= start <= 24 and 0 <= end <= 24):
+        raise ValueError(f"Geçersiz saat aralığı: {text!r}")
+    hours = np.arange(24)
+    if start < end:
+        return (hours >= start) & (hours < end)
+    if start == end % 24:
+        return np.ones(24, dtype=bool)
+    return (hours >= start) | (hours < end)
+
+
+def _day_index(name: str) -> int:
+    key = name.strip().translate(_ASCII).upper()[:3]
+    if key not in _DAY_NAMES:
+        raise ValueError(f"Geçersiz gün adı: {name!r} (Pzt, Sal, Çar, Per, Cum, Cmt, Paz)")
+    return _DAY_NAMES[key]
+
+
+def _parse_days(text: str) -> Optional[np.ndarray]:
+    """'Pzt-Cum,Paz' -> 7 elemanlı gün maskesi (Pazartesi = 0); boşsa None."""
+    text = text.strip()
+    if not text or text == '*':
+        return None
+    days = np.zeros(7, dtype=bool)
+    for part in text.split(','):
+        if '-' in part:
+            first, last = (_day_index(p) for p in part.split('-', 1))
+            span = range(first, last + 1) if first <= last else [*range(first, 7), *range(0, last + 1)]
+            days[list(span)] = True
+        else:
+            days[_day_index(part)] = True
+    return days
+
+
+def _parse_date(text: str) -> Tuple[Optional[int], bool]:
+    """'01.11.2025' -> (20251101, False); '01.11' -> (1101, True); boş -> (None, False)."""
+    text = text.strip()
+    if not text:
+        return None, False
+    parts = text.split('.')
+    try:
+        if len(parts) == 3:
+            day, month, year = (int(p) for p in parts)
+            date(year, month, day)  # doğrulama
+            return year * 10000 + month * 100 + day, False
+        if len(parts) == 2:
+            day, month = (int(p) for p in parts)
+            date(2000, month, day)  # doğrulama (29 Şubat dahil)
+            return month * 100 + day, True
+    except ValueError:
+        pass
+    raise ValueError(f"Geçersiz tarih: {text!r} (örnek: 01.11.2025 veya 01.11)")
+
+
+def _parse_price(text: str) -> float:
+    try:
+        return float(text.strip().replace(',', '.'))
+    except ValueError:
+        raise ValueError(f"Geçersiz fiyat: {text!r}") from None
+
+
+class TariffBand:
+    """Tarifenin tek satırı: hangi saatlerde hangi kWh fiyatı geçerli."""
+
+    def __init__(self, name: str, price: float, hours: Optional[np.ndarray] = None,
+                 days: Optional[np.ndarray] = None, start: Optional[int] = None,
+                 end: Optional[int] = None, recurring: bool = False) -> None:
+        self.name = name
+        self.price = price
+        self.hours = hours
+        self.days = days
+        self.start = start
+        self.end = end
+        self.recurring = recurring
+
+    @property
+    def unconditional(self) -> bool:
+        return self.hours is None and self.days is None and self.start is None and self.end is None
+
+    def mask(self, hour: np.ndarray, weekday: np.ndarray, ymd: np.ndarray,
+             valid: np.ndarray) -> np.ndarray:
+        """Bandın kapsadığı saatler (zaman damgası dizileri üzerinde)."""
+        if self.unconditional:
+            return np.ones(len(hour), dtype=bool)
+        selected = valid.copy()
+        if self.hours is not None:
+            selected &= self.hours[hour]
+        if self.days is not None:
+            selected &= self.days[weekday]
+        if self.start is not None or self.end is not None:
+            key = ymd % 10000 if self.recurring else ymd
+            start = self.start if self.start is not None else 0
+            end = self.end if self.end is not None else 99991231
+            if self.recurring and start > end:
+                # yıl sonunu geçen mevsim (ör. 01.11 - 31.03)
+                selected &= (key >= start) | (key <= end)
+            else:
+                selected &= (key >= start) & (key <= end)
+        return selected
+
+
+class Tariff:
+    """Zaman dilimli tarife; `bill` ile saatlik matristen daire tutarlarını hesaplar."""
+
+    def __init__(self, bands: Sequence[TariffBand], name: str = "") -> None:
+        if not bands:
+            raise ValueError("Tarifede bant yok")
+        self.bands = list(bands)
+        self.name = name
+        # bant adları (aynı adlı satırlar raporda tek sütun olur), ilk görülme sırasıyla
+        self.band_names: List[str] = list(dict.fromkeys(b.name for b in self.bands))
+        if len(self.band_names) > MAX_BAND_NAMES:
+            raise ValueError(f"Tarifede en fazla {MAX_BAND_NAMES} farklı bant adı olabilir")
+        self.prices = np.array([b.price for b in self.bands], dtype=np.float64)
+        # satır -> ad gösterge matrisi (ad × satır)
+        self._name_matrix = np.zeros((len(self.band_names), len(self.bands)))
+        for idx, band in enumerate(self.bands):
+            self._name_matrix[self.band_names.index(band.name), idx] = 1.0
+        # zaman damgası özeti -> (saat × satır) bant maskesi
+        self._masks: Dict[str, np.ndarray] = {}
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'Tariff':
+        """Tarife CSV dosyasını okur (`#` ile başlayan satırlar yorumdur)."""
+        path = Path(path)
+        bands: List[TariffBand] = []
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            lines = (line for line in f if line.strip() and not line.lstrip().startswith('#'))
+            reader = csv.reader(lines, delimiter=';')
+            header = [h.strip().translate(_ASCII).upper() for h in next(reader, [])]
+            if header[:len(_HEADER)] != _HEADER_KEYS:
+                raise ValueError(f"Tarife başlığı hatalı: {';'.join(_HEADER)} bekleniyor")
+            for line_no, row in enumerate(reader, start=1):
+                row = [c.strip() for c in row] + [''] * (len(_HEADER) - len(row))
+                name, hours, days, start, end, price = row[:len(_HEADER)]
+                if not name:
+                    continue
+                try:
+                    start_key, start_recurring = _parse_date(start)
+                    end_key, end_recurring = _parse_date(end)
+                    if start_key is not None and end_key is not None and start_recurring != end_recurring:
+                        raise ValueError("BAŞLANGIÇ ve BİTİŞ aynı biçimde olmalı (yıllı veya yılsız)")
+                    bands.append(TariffBand(
+                        name, _parse_price(price), _parse_hours(hours), _parse_days(days),
+                        start_key, end_key, start_recurring or end_recurring))
+                except ValueError as e:
+                    raise ValueError(f"{path.name} {line_no}. bant satırı: {e}") from None
+        return cls(bands, name=path.stem)
+
+    def band_mask(self, timestamps: Optional[pd.DatetimeIndex], hours: int) -> np.ndarray:
+        """(saat × bant satırı) 0/1 maskesi; her saat ilk eşleşen banda girer.
+
+        Aynı zaman damgaları için maske önbellekten döner.
+        """
+        if timestamps is None:
+            stamps = np.full(hours, np.iinfo(np.int64).min, dtype=np.int64)
+        else:
+            stamps = timestamps.to_numpy().astype('datetime64[s]').astype(np.int64)
+        key = hashlib.sha1(stamps.tobytes()).hexdigest()
+        mask = self._masks.get(key)
+        if mask is not None:
+            return mask
+
+        valid = stamps != np.iinfo(np.int64).min
+        index = pd.DatetimeIndex(np.where(valid, stamps, 0).astype('datetime64[s]'))
+        hour = index.hour.to_numpy()
+        weekday = index.weekday.to_numpy()
+        ymd = (index.year * 10000 + index.month * 100 + index.day).to_numpy()
+
+        # sondan başa atanır: önceki bantlar sonrakileri ezer
+        choice = np.full(hours, -1, dtype=np.int64)
+        for idx in range(len(self.bands) - 1, -1, -1):
+            choice[self.bands[idx].mask(hour, weekday, ymd, valid)] = idx
+        uncovered = np.flatnonzero(choice < 0)
+        if len(uncovered):
+            first = uncovered[0]
+            when = (pd.Timestamp(stamps[first], unit='s').strftime('%d.%m.%Y %H:%M')
+                    if valid[first] else f"{first + 1}. saat (zaman damgası yok)")
+            raise ValueError(f"Tarife {len(uncovered)} saati kapsamıyor (ilki: {when}); "
+                             "son satıra koşulsuz bir bant ekleyin")
+
+        mask = np.zeros((hours, len(self.bands)))
+        mask[np.arange(hours), choice] = 1.0
+        if len(self._masks) >= _MASK_CACHE_SIZE:
+            self._masks.pop(next(iter(self._masks)))
+        self._masks[key] = mask
+        return mask
+
+    def bill(self, hourly: Any) -> pd.DataFrame:
+        """`PPDHourly` için daire başına bant kWh'leri ve tutarları.
+
+        Satırlar `hourly.group_names` sırasındadır. Sütunlar: DAİRE_ADI,
+        DAİRE_NO, her bant için `<bant>_KWH` ve `<bant>_TL` (kuruşa
+        yuvarlanmış), `TUTAR_TL`.
+        """
+        mask = self.band_mask(hourly.timestamps, hourly.hours)
+        # (bant satırı × birim) Wh -> (bant satırı × daire) kWh
+        unit_wh = mask.T @ np.asarray(hourly.values, dtype=np.float64)
+        row_kwh = unit_wh @ hourly.indicator.astype(np.float64) / 1000
+        name_kwh = self._name_matrix @ row_kwh
+        # bant tutarları kuruşa yuvarlanır; toplam, yuvarlanmış bant tutarlarının toplamıdır
+        name_cost = np.round(self._name_matrix @ (row_kwh * self.prices[:, None]), 2)
+
+        data: Dict[str, Any] = {'DAİRE_ADI': hourly.group_names, 'DAİRE_NO': hourly.group_keys}
+        for idx, name in enumerate(self.band_names):
+            data[f'{name}_KWH'] = name_kwh[idx]
+            data[f'{name}_{CURRENCY}'] = name_cost[idx]
+        data[COST_COLUMN] = name_cost.sum(axis=0)
+        return pd.DataFrame(data)
+
+    def summary(self, costs: pd.DataFrame) -> Dict[str, Any]:
+        """Rapor özetine eklenecek bant ve genel tutar toplamları."""
+        summary: Dict[str, Any] = {}
+        for name in self.band_names:
+            summary[f'{name} (kWh)'] = float(costs[f'{name}_KWH'].sum())
+            summary[f'{name} ({CURRENCY})'] = float(costs[f'{name}_{CURRENCY}'].sum())
+        summary[f'Genel Toplam Tutar ({CURRENCY})'] = float(costs[COST_COLUMN].sum())
+        return summary
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from klima_final import PPDRawParser
+
+    arg_parser = argparse.ArgumentParser(
+        description="Saatlik PPD verisinden tarifeye göre daire tutarlarını hesaplar.")
+    arg_parser.add_argument('tariff', help="Tarife CSV dosyası")
+    arg_parser.add_argument('file', help="PPD CSV veya kolonsal (.ppdc) dosya")
+    arg_parser.add_argument('-o', '--output', default=None,
+                            help="Tutarların yazılacağı CSV dosyası")
+    args = arg_parser.parse_args(argv)
+
+    try:
+        tariff = Tariff.load(args.tariff)
+    except (OSError, ValueError) as e:
+        print(f"⚠ Tarife okunamadı: {e}")
+        return 1
+    hourly = PPDRawParser().parse_ppd_hourly(args.file)
+    try:
+        costs = tariff.bill(hourly)
+    except ValueError as e:
+        print(f"⚠ {e}")
+        return 1
+
+    print(f"\n💰 TARİFE: {tariff.name}")
+    for key, value in tariff.summary(costs).items():
+        print(f"   • {key}: {value:.2f}")
+    if args.output:
+        costs.to_csv(args.output, sep=';', index=False, encoding='utf-8-sig')
+        print(f"\n✓ Tutarlar kaydedildi: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
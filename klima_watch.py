@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Klima Aylık Tüketim Raporu - Klasör İzleme (Arka Plan Servisi)
+Folkart Blu Çeşme Yönetimi İçin
+
+ITM'nin PPD dosyalarını bıraktığı paylaşılan klasörü izler; yeni veya
+değişmiş her dosya için standart raporu çıkış dizininde yeniden üretir.
+Tek bir süreç sürekli açık kalır: pandas/openpyxl yükleme maliyeti,
+`daire_sirasi.txt` ve numara eşleşmesi yalnızca bir kez ödenir.
+
+* Klasör `--interval` saniyede bir taranır (ağ paylaşımlarında da
+  güvenilir çalışır).
+* Yazılmakta olan dosyalar atlanır: boyutu ve değişiklik zamanı
+  `--settle` saniye boyunca değişmeyen dosya hazır kabul edilir.
+* Parse önbelleği kullanıldığı için sonuna satır eklenen dosyalarda
+  yalnızca yeni satırlar okunur.
+* İşlenen dosyalar çıkış dizinindeki `.klima_watch.json`'a yazılır;
+  servis yeniden başlatıldığında değişmemiş dosyalar tekrar işlenmez.
+
+Kullanım:
+    python klima_watch.py \\\\sunucu\\itm\\ppd -o raporlar
+    python klima_watch.py gelen/ -o raporlar --numara EKIM.csv --interval 10
+    python klima_watch.py gelen/ -o raporlar --once
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from klima_batch import DEFAULT_PATTERN, process_one
+from klima_final import PPDRawParser
+
+# Taramalar arası süre ve dosyanın "yazımı bitti" sayılması için beklenen süre (sn)
+DEFAULT_INTERVAL = 5.0
+DEFAULT_SETTLE = 10.0
+
+_STATE_FILE = ".klima_watch.json"
+
+# Dosya imzası: (boyut, değişiklik zamanı)
+Signature = Tuple[int, float]
+
+
+class PPDWatcher:
+    """Bir klasördeki PPD dosyalarını izleyip raporlarını güncel tutar."""
+
+    def __init__(self, folder: Path, output_root: Path, parser: PPDRawParser,
+                 pattern: str = DEFAULT_PATTERN, settle: float = DEFAULT_SETTLE,
+                 period: Optional[str] = None, quiet: bool = True) -> None:
+        self.folder = folder
+        self.output_root = output_root
+        self.parser = parser
+        self.pattern = pattern
+        self.settle = settle
+        self.period = period
+        self.quiet = quiet
+        self.state_path = output_root / _STATE_FILE
+        # işlenmiş dosyalar: yol -> işlendiği andaki imza
+        self.processed: Dict[str, Signature] = self._load_state()
+        # değişmiş ama henüz durulmamış dosyalar: yol -> (imza, ilk görülme zamanı)
+        self._pending: Dict[str, Tuple[Signature, float]] = {}
+
+    def _load_state(self) -> Dict[str, Signature]:
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return {k: (v[0], v[1]) for k, v in json.load(f).items()}
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self) -> None:
+        tmp = self.state_path.with_name(self.state_path.name + '.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.processed, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, self.state_path)
+
+    def ready_files(self, now: Optional[float] = None) -> List[Path]:
+        """Yeni/değişmiş ve yazımı bitmiş dosyaları döndürür.
+
+        İmzası ilk kez değişen dosya beklemeye alınır; imza `settle`
+        saniye boyunca aynı kalırsa dosya hazır sayılır.
+        """
+        now = time.monotonic() if now is None else now
+        ready: List[Path] = []
+        seen = set()
+        for path in sorted(self.folder.glob(self.pattern)):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue  # tarama sırasında silinmiş/taşınmış
+            if not path.is_file():
+                continue
+            key = str(path)
+            seen.add(key)
+            signature: Signature = (stat.st_size, stat.st_mtime)
+            if self.processed.get(key) == signature:
+                self._pending.pop(key, None)
+                continue
+            pending = self._pending.get(key)
+            if pending is None or pending[0] != signature:
+                self._pending[key] = (signature, now)
+            elif now - pending[1] >= self.settle:
+                ready.append(path)
+        for key in list(self._pending):
+            if key not in seen:
+                del self._pending[key]
+        return ready
+
+    def process(self, path: Path) -> Dict[str, Any]:
+        """Dosyanın raporunu üretir ve işlendi olarak kaydeder."""
+        key = str(path)
+        signature = self._pending.pop(key, ((0, 0.0), 0.0))[0]
+        result = process_one(path, self.output_root, self.period, self.quiet,
+                             use_cache=True, parser=self.parser)
+        if result['error']:
+            print(f"[ERROR] {path.name}: {result['error']}")
+        else:
+            print(f"[OK] {path.name} → {result['month_year']} "
+                  f"({result['records']} kayıt, {result['total_s']:.2f} sn)")
+        # hatalı dosya da kaydedilir: aynı bozuk dosya her turda tekrar denenmez,
+        # dosya değişince yeniden işlenir
+        self.processed[key] = signature
+        self._save_state()
+        return result
+
+    def poll(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Tek tarama turu: hazır dosyaları işler."""
+        return [self.process(path) for path in self.ready_files(now)]
+
+    def run(self, interval: float = DEFAULT_INTERVAL,
+            stop: Optional[threading.Event] = None) -> None:
+        """`stop` işaretlenene (veya Ctrl+C) kadar klasörü izler."""
+        stop = stop or threading.Event()
+        print(f"👀 İzleniyor: {self.folder} ({self.pattern}) → {self.output_root}")
+        try:
+            while not stop.is_set():
+                self.poll()
+                stop.wait(interval)
+        except KeyboardInterrupt:
+            print("\nİzleme durduruldu")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    arg_parser = argparse.ArgumentParser(
+        description="PPD klasörünü izler, yeni dosyaların raporunu üretir.")
+    arg_parser.add_argument('folder', help="İzlenecek klasör")
+    arg_parser.add_argument('-o', '--output', default='.',
+                            help="Raporların kaydedileceği kök dizin (varsayılan: çalışma dizini)")
+    arg_parser.add_argument('--pattern', default=DEFAULT_PATTERN,
+                            help=f"İzlenecek dosya deseni (varsayılan: {DEFAULT_PATTERN})")
+    arg_parser.add_argument('--interval', type=float, default=DEFAULT_INTERVAL,
+                            help=f"Taramalar arası süre, sn (varsayılan: {DEFAULT_INTERVAL:g})")
+    arg_parser.add_argument('--settle', type=float, default=DEFAULT_SETTLE,
+                            help="Dosyanın değişmeden beklemesi gereken süre, sn "
+                                 f"(varsayılan: {DEFAULT_SETTLE:g})")
+    arg_parser.add_argument('--period', default=None,
+                            help="Sabit dönem etiketi; verilmezse dosya adından çıkarılır")
+    arg_parser.add_argument('--numara', default=None,
+                            help="Eski-yeni numara eşleşmesi için Ekim formatındaki CSV")
+    arg_parser.add_argument('--once', action='store_true',
+                            help="Mevcut dosyaları işle ve çık (beklemeden)")
+    arg_parser.add_argument('-v', '--verbose', action='store_true',
+                            help="Parser çıktısını da göster")
+    args = arg_parser.parse_args(argv)
+
+    folder = Path(args.folder).resolve()
+    if not folder.is_dir():
+        print(f"⚠ Klasör bulunamadı: {folder}")
+        return 1
+    output_root = Path(args.output)
+    output_root.mkdir(parents=True, exist_ok=True)
+
+    quiet = not args.verbose
+    parser = PPDRawParser(quiet=quiet)
+    if args.numara and not parser.load_numara_mapping(args.numara):
+        print(f"⚠ Numara eşleşmesi yüklenemedi: {args.numara}")
+        return 1
+
+    if args.once:
+        watcher = PPDWatcher(folder, output_root, parser, args.pattern, settle=0.0,
+                             period=args.period, quiet=quiet)
+        watcher.ready_files()  # ilk tur dosyaları beklemeye alır
+        results = watcher.poll()
+        return 2 if any(r['error'] for r in results) else 0
+
+    watcher = PPDWatcher(folder, output_root, parser, args.pattern, args.settle,
+                         args.period, quiet)
+    watcher.run(args.interval)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
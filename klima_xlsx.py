@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Klima Aylık Tüketim Raporu - Hızlı Excel Yazıcı
+Folkart Blu Çeşme Yönetimi İçin
+
+Raporlar openpyxl'in write-only modunda satır satır diske akıtılır.
+Hücre biçimleri her hücre için yeniden oluşturulmaz; çalışma kitabına
+bir kez kaydedilen adlandırılmış stiller (NamedStyle) paylaşılır. Veri
+satırları DataFrame sütun dizilerinden beslenir (`iterrows` yok).
+"""
+
+from copy import copy
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Union
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.styles.fonts import DEFAULT_FONT
+
+_TITLE_FILL = "1F4E78"
+_HEADER_FILL = "4472C4"
+_COLUMNS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+def _thin_border() -> Border:
+    return Border(
+        left=Side(style='thin'),
+        right=Side(style='thin'),
+        top=Side(style='thin'),
+        bottom=Side(style='thin')
+    )
+
+
+def _default_font() -> Font:
+    # Yazı tipi belirtilmeyen stiller çalışma kitabının varsayılanını (Calibri 11) kullanır
+    return copy(DEFAULT_FONT)
+
+
+def _fill(color: str) -> PatternFill:
+    return PatternFill(start_color=color, end_color=color, fill_type="solid")
+
+
+# Raporlarda kullanılan stiller: ad -> NamedStyle üreten fonksiyon.
+# Her çalışma kitabı kendi kopyasını kaydeder.
+_STYLE_FACTORIES: Dict[str, Callable[[str], NamedStyle]] = {
+    'baslik_14': lambda name: NamedStyle(
+        name=name, font=Font(color="FFFFFF", bold=True, size=14), fill=_fill(_TITLE_FILL),
+        alignment=Alignment(horizontal="center", vertical="center")),
+    'baslik_12': lambda name: NamedStyle(
+        name=name, font=Font(color="FFFFFF", bold=True, size=12), fill=_fill(_TITLE_FILL),
+        alignment=Alignment(horizontal="center", vertical="center")),
+    'baslik_11': lambda name: NamedStyle(
+        name=name, font=Font(color="FFFFFF", bold=True, size=11), fill=_fill(_TITLE_FILL),
+        alignment=Alignment(horizontal="center", vertical="center")),
+    'tablo_baslik_11': lambda name: NamedStyle(
+        name=name, font=Font(color="FFFFFF", bold=True, size=11), fill=_fill(_HEADER_FILL),
+        alignment=Alignment(horizontal="center", vertical="center"), border=_thin_border()),
+    'tablo_baslik_10': lambda name: NamedStyle(
+        name=name, font=Font(color="FFFFFF", bold=True, size=10), fill=_fill(_HEADER_FILL),
+        alignment=Alignment(horizontal="center", vertical="center", wrap_text=True),
+        border=_thin_border()),
+    'bolum_baslik': lambda name: NamedStyle(
+        name=name, font=Font(bold=True, size=11, color="FFFFFF"), fill=_fill(_HEADER_FILL)),
+    'hucre': lambda name: NamedStyle(name=name, font=_default_font(), border=_thin_border()),
+    'hucre_orta': lambda name: NamedStyle(
+        name=name, font=_default_font(), border=_thin_border(),
+        alignment=Alignment(horizontal="center")),
+    'hucre_sag': lambda name: NamedStyle(
+        name=name, font=_default_font(), border=_thin_border(),
+        alignment=Alignment(horizontal="right")),
+    'hucre_tamsayi': lambda name: NamedStyle(
+        name=name, font=_default_font(), border=_thin_border(), number_format='0',
+        alignment=Alignment(horizontal="right")),
+    'hucre_ondalik': lambda name: NamedStyle(
+        name=name, font=_default_font(), border=_thin_border(), number_format='0.00',
+        alignment=Alignment(horizontal="right")),
+    'hucre_kalin': lambda name: NamedStyle(
+        name=name, border=_thin_border(), font=Font(bold=True)),
+}
+
+
+class ReportSheetWriter:
+    """Raporu write-only modunda yazan yardımcı sınıf (ek sayfalar `sheet` ile).
+
+    Satırlar eklendikçe diske yazıldığı için bellek kullanımı satır
+    sayısından bağımsızdır. Sütun genişlikleri ilk satırdan önce
+    ayarlanmalıdır (write-only kısıtı), bu yüzden yapıcıya verilir.
+    """
+
+    def __init__(self, title: str, widths: Sequence[float]) -> None:
+        self.wb = Workbook(write_only=True)
+        self.ws = self.wb.create_sheet(title)
+        # stil adı -> hücreye kopyalanacak hazır stil dizisi (her hücrede arama yapılmaz)
+        self._style_arrays: Dict[str, Any] = {}
+        for name, factory in _STYLE_FACTORIES.items():
+            style = factory(name)
+            self.wb.add_named_style(style)
+            self._style_arrays[name] = style.as_tuple()
+        self._set_widths(widths)
+        self.row = 0
+
+    def _set_widths(self, widths: Sequence[float]) -> None:
+        for idx, width in enumerate(widths):
+            self.ws.column_dimensions[_COLUMNS[idx]].width = width
+
+    def sheet(self, title: str, widths: Sequence[float]) -> None:
+        """Yeni bir sayfa açar; sonraki satırlar bu sayfaya yazılır."""
+        self.ws = self.wb.create_sheet(title)
+        self._set_widths(widths)
+        self.row = 0
+
+    def _cell(self, value: Any, style: Optional[str]) -> Any:
+        if style is None:
+            return value
+        cell = WriteOnlyCell(self.ws, value)
+        cell._style = copy(self._style_arrays[style])
+        return cell
+
+    def append(self, values: Sequence[Any], styles: Sequence[Optional[str]],
+               height: Optional[float] = None) -> None:
+        """Tek satır ekler; `styles[i]` i. hücrenin stil adıdır."""
+        self.row += 1
+        if height is not None:
+            self.ws.row_dimensions[self.row].height = height
+        self.ws.append([self._cell(v, s) for v, s in zip(values, styles)])
+
+    def title(self, text: str, col_count: int, style: str,
+              height: Optional[float] = None) -> None:
+        """A sütunundan `col_count` sütuna kadar birleştirilmiş başlık satırı."""
+        self.append([text], [style], height)
+        self.ws.merged_cells.add(f'A{self.row}:{_COLUMNS[col_count - 1]}{self.row}')
+
+    def blank(self, count: int = 1) -> None:
+        for _ in range(count):
+            self.row += 1
+            self.ws.append([])
+
+    def columns(self, columns: Sequence[Iterable[Any]], styles: Sequence[Optional[str]]) -> int:
+        """Sütun dizilerinden (ör. `df[c].tolist()`) veri satırları yazar.
+
+        Yazılan satır sayısını döndürür.
+        """
+        count = 0
+        for values in zip(*columns):
+            self.append(values, styles)
+            count += 1
+        return count
+
+    def save(self, path: Union[str, Path]) -> None:
+        self.wb.save(path)
+
+
+def summary_styles(value: Any) -> List[str]:
+    """Özet satırı için (anahtar, değer) stilleri; ondalıklar 0.00 biçimlenir."""
+    return ['hucre_kalin', 'hucre_ondalik' if isinstance(value, float) else 'hucre_sag']